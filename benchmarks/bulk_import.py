@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark for bulk CSV import of applications
+
+Writes a synthetic CSV of field-collected applications (a few percent of
+them invalid) and imports it into a scratch database through
+ApplicationImporter, reporting rows per minute.
+
+Usage:
+    python benchmarks/bulk_import.py [--rows N] [--chunk-size N]
+"""
+
+import os
+import sys
+import csv
+import time
+import random
+import shutil
+import argparse
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+NAMES = [
+    'Mohammad', 'Abdul', 'Karim', 'Rahman', 'Hossain', 'Akter', 'Begum', 'Islam', 'Rahim',
+    'Chowdhury', 'Uddin', 'Zakir', 'Hasan', 'Khatun', 'Alam', 'Bhuiyan', 'Sultana', 'Kabir',
+    'Nasrin', 'Siddique', 'Faruk', 'Jahan', 'Mahmud', 'Ferdous', 'Mosammat', 'Sheikh',
+]
+DISTRICTS = [
+    ('Dhaka', 'Dhaka'), ('Gazipur', 'Dhaka'), ('Chattogram', 'Chattogram'), ('Cumilla', 'Chattogram'),
+    ('Rajshahi', 'Rajshahi'), ('Bogura', 'Rajshahi'), ('Khulna', 'Khulna'), ('Jashore', 'Khulna'),
+    ('Sylhet', 'Sylhet'), ('Barishal', 'Barishal'), ('Rangpur', 'Rangpur'), ('Jamalpur', 'Mymensingh'),
+]
+FIELDS = [
+    'full_name', 'father_name', 'mother_name', 'nid_number', 'date_of_birth', 'occupation',
+    'village', 'upazila', 'district', 'division', 'family_members_count', 'monthly_income',
+    'main_earner_occupation', 'email', 'mobile_number', 'category_id',
+]
+
+def name(rng):
+    return ' '.join(rng.sample(NAMES, rng.randint(2, 3)))
+
+def write_csv(path, rows, category_id, seed=5):
+    rng = random.Random(seed)
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, FIELDS)
+        writer.writeheader()
+        for index in range(rows):
+            district, division = rng.choice(DISTRICTS)
+            row = {
+                'full_name': name(rng),
+                'father_name': name(rng),
+                'mother_name': name(rng),
+                'nid_number': f'{1980000000000 + rng.randrange(10 ** 10)}',
+                'date_of_birth': f'{rng.randint(1950, 2000)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+                'occupation': 'Farmer',
+                'village': f'Village {rng.randrange(500)}',
+                'upazila': f'Upazila {rng.randrange(50)}',
+                'district': district,
+                'division': division,
+                'family_members_count': rng.randint(1, 9),
+                'monthly_income': rng.randrange(3000, 30000),
+                'main_earner_occupation': 'Farmer',
+                'email': f'applicant{index}@example.com',
+                'mobile_number': f'01{rng.randint(3, 9)}{rng.randrange(10 ** 8):08d}',
+                'category_id': category_id,
+            }
+            # Some rows fail validation, as paper forms do
+            if rng.random() < 0.02:
+                row[rng.choice(['email', 'date_of_birth', 'monthly_income'])] = rng.choice(['', 'n/a'])
+            writer.writerow(row)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark bulk CSV import')
+    parser.add_argument('--rows', type=int, default=50000, help='Rows in the synthetic CSV')
+    parser.add_argument('--chunk-size', type=int, default=1000, help='Rows per INSERT batch and transaction')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    from src.main import app
+    from src.models import db, Category
+    from src.services import ApplicationImporter
+
+    try:
+        with app.app_context():
+            category = Category(name='Housing Project')
+            db.session.add(category)
+            db.session.commit()
+            category_id = category.id
+
+        csv_path = os.path.join(directory, 'applications.csv')
+        write_csv(csv_path, args.rows, category_id)
+
+        with app.app_context():
+            importer = ApplicationImporter(os.path.join(directory, 'uploads'), chunk_size=args.chunk_size)
+            start = time.perf_counter()
+            with open(csv_path, newline='') as f:
+                report = importer.run(f)
+            elapsed = time.perf_counter() - start
+
+        print(f"Imported {report.imported} of {report.total} rows ({report.failed} invalid) in {elapsed:.1f}s")
+        print(f"  {report.imported / elapsed * 60:,.0f} rows/minute")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark for outbound email delivery
+
+Queues confirmation-sized messages in the outbox of a scratch database and
+delivers them to a local SMTP sink that adds a fixed handshake latency per
+connection, as a remote relay with STARTTLS and AUTH does. Compares one new
+connection per message (the old send_real_email) with OutboxWorker's pool
+of persistent sessions, reporting messages per second.
+
+Usage:
+    python benchmarks/email_delivery.py [--messages N] [--connect-delay SECONDS] [--pool-size N]
+"""
+
+import os
+import sys
+import time
+import shutil
+import smtplib
+import argparse
+import tempfile
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email.mime.application import MIMEApplication
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def build_message(index):
+    msg = MIMEMultipart()
+    msg['From'] = 'State Bangladesh Society <noreply@statebd.org>'
+    msg['To'] = f'applicant{index}@example.com'
+    msg['Subject'] = f'Application Confirmation - SBS2024{index:06d}'
+    msg.attach(MIMEText('<p>Thank you for submitting your application.</p>' * 40, 'html'))
+    attachment = MIMEApplication(os.urandom(30 * 1024), _subtype='pdf')
+    attachment.add_header('Content-Disposition', 'attachment', filename=f'Application_{index}.pdf')
+    msg.attach(attachment)
+    return msg
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark outbound email delivery')
+    parser.add_argument('--messages', type=int, default=2000, help='Messages to deliver')
+    parser.add_argument('--connect-delay', type=float, default=0.05, help='Simulated handshake seconds per connection')
+    parser.add_argument('--pool-size', type=int, default=4, help='Persistent SMTP sessions')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    from src.main import app
+    from src.models import db
+    from src.services import Outbox, OutboxWorker, SMTPConnectionPool
+    from src.services.smtp_sink import SMTPSink
+
+    sink = SMTPSink(port=0, keep=False, connect_delay=args.connect_delay).start()
+    try:
+        messages = [build_message(index) for index in range(args.messages)]
+
+        # Baseline: connect, send and quit for every message
+        baseline = min(args.messages, 200)
+        start = time.perf_counter()
+        for msg in messages[:baseline]:
+            server = smtplib.SMTP('127.0.0.1', sink.port)
+            server.sendmail(msg['From'], [msg['To']], msg.as_bytes())
+            server.quit()
+        per_message_rate = baseline / (time.perf_counter() - start)
+
+        with app.app_context():
+            outbox = Outbox()
+            for msg in messages:
+                outbox.enqueue(msg)
+            db.session.commit()
+
+        sink.count = sink.connections = 0
+        pool = SMTPConnectionPool('127.0.0.1', sink.port, size=args.pool_size)
+        worker = OutboxWorker(app, pool=pool, rate=0, batch_size=200)
+        start = time.perf_counter()
+        sent = worker.run(drain=True)
+        elapsed = time.perf_counter() - start
+
+        print(f"Connection per message: {per_message_rate:,.0f} msgs/sec ({baseline} messages)")
+        print(f"Pooled outbox worker:   {sent / elapsed:,.0f} msgs/sec ({sent} messages over {sink.connections} connections, "
+              f"{args.pool_size} sessions)")
+        print(f"  {sent / elapsed / per_message_rate:.1f}x faster")
+    finally:
+        sink.stop()
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
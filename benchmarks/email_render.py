@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark for building notification emails
+
+Builds and serializes confirmation (with a PDF attachment) and status update
+messages for synthetic applications, as a bulk notification run does, and
+compares EmailService with stock MIMEMultipart/MIMEApplication assembly of
+the same bodies. Every confirmation gets its own PDF, so the attachment
+cache only helps when a PDF is sent again.
+
+Usage:
+    python benchmarks/email_render.py [--messages N] [--pdf-kb N]
+"""
+
+import os
+import sys
+import time
+import argparse
+from datetime import datetime
+from types import SimpleNamespace
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email.mime.application import MIMEApplication
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def applications(count):
+    category = SimpleNamespace(name='Housing Project')
+    for index in range(count):
+        yield SimpleNamespace(
+            full_name=f'Applicant {index}',
+            reference_number=f'SBS2024{index:06d}',
+            email=f'applicant{index}@example.com',
+            category=category,
+            created_at=datetime(2024, 5, 1, 10, 30),
+            status='Pending'
+        )
+
+def stock_message(service, application, body, pdf_bytes=None):
+    """How messages were assembled before: fresh parts, default serialization"""
+    msg = MIMEMultipart()
+    msg['From'] = f"{service.from_name} <{service.from_email}>"
+    msg['To'] = application.email
+    msg['Subject'] = f"Application Confirmation - {application.reference_number}"
+    msg.attach(MIMEText(body, 'html'))
+    if pdf_bytes:
+        attachment = MIMEApplication(pdf_bytes, _subtype='pdf')
+        attachment.add_header('Content-Disposition', 'attachment', filename=f'Application_{application.reference_number}.pdf')
+        msg.attach(attachment)
+    return msg.as_bytes()
+
+def timed(label, count, func):
+    start = time.perf_counter()
+    size = sum(len(func(item)) for item in applications(count))
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<34} {count / elapsed:>9,.0f} msgs/sec  ({size / count / 1024:.0f} KB each)")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark notification email assembly')
+    parser.add_argument('--messages', type=int, default=10000, help='Messages of each kind')
+    parser.add_argument('--pdf-kb', type=int, default=60, help='Size of each attached PDF')
+    args = parser.parse_args()
+
+    from src.services.email_service import EmailService
+    from src.services.email_templates import get_attachment_cache
+
+    service = EmailService(delivery='log')
+    # One distinct PDF per application, derived cheaply from a random block
+    block = os.urandom(args.pdf_kb * 1024)
+    def pdf_for(application):
+        return application.reference_number.encode() + block
+
+    print(f"{args.messages:,} status updates:")
+    timed('stock MIME assembly', args.messages, lambda a: stock_message(
+        service, a, service.create_status_update_email_body(a, 'Pending', 'Approved')))
+    timed('EmailService', args.messages,
+          lambda a: service.build_status_update(a, 'Pending', 'Approved').as_bytes())
+
+    print(f"{args.messages:,} confirmations with a {args.pdf_kb} KB PDF:")
+    timed('stock MIME assembly', args.messages, lambda a: stock_message(
+        service, a, service.create_confirmation_email_body(a), pdf_for(a)))
+    timed('EmailService', args.messages,
+          lambda a: service.build_application_confirmation(a, pdf_for(a)).as_bytes())
+
+    # A resend of recent confirmations finds their encoded PDFs
+    recent = list(applications(args.messages))[-get_attachment_cache().max_entries:]
+    pdfs = [pdf_for(a) for a in recent]
+    start = time.perf_counter()
+    for application, pdf_bytes in zip(recent, pdfs):
+        service.build_application_confirmation(application, pdf_bytes).as_bytes()
+    elapsed = time.perf_counter() - start
+    cache = get_attachment_cache()
+    print(f"  {'resend, attachment cached':<34} {len(recent) / elapsed:>9,.0f} msgs/sec  "
+          f"(attachment cache: {cache.hits} hits, {cache.misses} misses)")
+
+if __name__ == '__main__':
+    main()
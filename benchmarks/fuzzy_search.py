@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark for fuzzy (phonetic-key) applicant name search
+
+Builds a scratch database with a synthetic set of applicants whose names use
+mixed romanizations of common Bangla names, then times indexed fuzzy lookups
+against a Python-side similarity scan over every name.
+
+Usage:
+    python benchmarks/fuzzy_search.py [--rows N] [--queries N] [--skip-scan]
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+from datetime import datetime, date
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Variant spellings of the same name part
+FIRST_PARTS = [
+    ['Mohammad', 'Muhammad', 'Mohammed', 'Muhammed', 'Md.', 'Mohd'],
+    ['Mosammat', 'Mst.', 'Most.'],
+    ['Abdul', 'Abdool'],
+    ['Sheikh', 'Shaikh', 'Sk.'],
+]
+NAME_PARTS = [
+    ['Karim', 'Kareem'], ['Rahman', 'Rohman', 'Rahaman'], ['Hossain', 'Hussain', 'Hosen'],
+    ['Akter', 'Akhter', 'Aktar'], ['Begum', 'Begom'], ['Islam', 'Eslam'], ['Rahim', 'Raheem'],
+    ['Chowdhury', 'Choudhury', 'Chowdhuri'], ['Uddin', 'Uddeen'], ['Zakir', 'Jakir'],
+    ['Hasan', 'Hassan'], ['Khatun', 'Khatoon'], ['Alam', 'Aalam'], ['Bhuiyan', 'Bhuyan', 'Bhuiya'],
+    ['Sultana', 'Sultanah'], ['Kabir', 'Kobir'], ['Nasrin', 'Nasreen'], ['Siddique', 'Siddiqui'],
+    ['Faruk', 'Farooq', 'Faruque'], ['Jahan', 'Jahaan'], ['Mahmud', 'Mahmood'], ['Ferdous', 'Firdous'],
+]
+
+def random_name(rng):
+    parts = []
+    if rng.random() < 0.6:
+        parts.append(rng.choice(rng.choice(FIRST_PARTS)))
+    for variants in rng.sample(NAME_PARTS, rng.randint(1, 3)):
+        parts.append(rng.choice(variants))
+    return ' '.join(parts)
+
+def populate(app, rows, seed=7):
+    from sqlalchemy import insert
+    from src.models import db, Application, Category
+    from src.services.fuzzy_search import index_application_names
+
+    rng = random.Random(seed)
+    with app.app_context():
+        category = Category(name='Housing Project')
+        db.session.add(category)
+        db.session.commit()
+        category_id = category.id
+
+        table = Application.__table__
+        now = datetime.utcnow()
+        batch = 10000
+        for start in range(0, rows, batch):
+            values = [{
+                'reference_number': f'SBSBENCH{index:010d}',
+                'full_name': random_name(rng),
+                'father_name': random_name(rng),
+                'mother_name': random_name(rng),
+                'nid_number': f'{1990000000000 + index}',
+                'date_of_birth': date(1990, 1, 1),
+                'occupation': 'Farmer',
+                'village': 'Amirty',
+                'upazila': 'Melandaha',
+                'district': 'Jamalpur',
+                'division': 'Mymensingh',
+                'family_members_count': 4,
+                'monthly_income': 8000.0,
+                'main_earner_occupation': 'Farmer',
+                'email': 'applicant@example.com',
+                'mobile_number': f'017{index:08d}',
+                'status': 'Pending',
+                'category_id': category_id,
+                'created_at': now,
+                'updated_at': now,
+            } for index in range(start, min(start + batch, rows))]
+
+            result = db.session.execute(insert(table).returning(table.c.id), values)
+            ids = [row[0] for row in result]
+            index_application_names(db.session.connection(), [
+                (application_id, value['full_name'], value['father_name'], value['mother_name'])
+                for application_id, value in zip(ids, values)
+            ])
+            db.session.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark fuzzy name search')
+    parser.add_argument('--rows', type=int, default=1000000, help='Synthetic applicants to generate')
+    parser.add_argument('--queries', type=int, default=50, help='Fuzzy queries to time')
+    parser.add_argument('--skip-scan', action='store_true', help='Skip the Python-side scan baseline')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    from src.main import app
+    from src.models import db, Application
+    from src.services.fuzzy_search import FuzzyNameSearch, similarity
+
+    try:
+        start = time.perf_counter()
+        populate(app, args.rows)
+        print(f"Generated {args.rows} applicants in {time.perf_counter() - start:.1f}s")
+
+        rng = random.Random(11)
+        queries = [random_name(rng) for _ in range(args.queries)]
+        search = FuzzyNameSearch()
+        names = lambda item: (item.full_name, item.father_name, item.mother_name)
+
+        with app.app_context():
+            timings = []
+            found = 0
+            for text_query in queries:
+                begin = time.perf_counter()
+                matches = search.search(Application.query, text_query, names)
+                timings.append(time.perf_counter() - begin)
+                found += bool(matches)
+            timings.sort()
+            print(f"Indexed fuzzy search over {args.queries} queries ({found} with matches):")
+            print(f"  median {timings[len(timings) // 2] * 1000:8.1f} ms   p95 {timings[int(len(timings) * 0.95)] * 1000:8.1f} ms")
+
+            if not args.skip_scan:
+                begin = time.perf_counter()
+                all_names = [name for (name,) in db.session.query(Application.full_name)]
+                best = max(all_names, key=lambda name: similarity(queries[0], name))
+                elapsed = time.perf_counter() - begin
+                print(f"Python-side similarity scan (one query): {elapsed * 1000:8.1f} ms (best: {best})")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark for near-duplicate image lookups in the perceptual-hash index
+
+Fills a scratch database with random 64-bit hashes plus a few perturbed
+copies, then times multi-index lookups against a linear Hamming scan and
+checks that both find the same images.
+
+Usage:
+    python benchmarks/image_hash.py [--images N] [--queries N] [--threshold BITS]
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def perturb(rng, value, bits):
+    for bit in rng.sample(range(64), bits):
+        value ^= 1 << bit
+    return value
+
+def populate(app, images, queries, threshold, seed=3):
+    from sqlalchemy import insert
+    from src.models import db, ImageHash
+    from src.services.image_hash import bands, to_signed
+
+    rng = random.Random(seed)
+    hashes = [rng.getrandbits(64) for _ in range(images)]
+    # Each query image has near-duplicates stored at distances up to the threshold
+    probes = hashes[:queries]
+    hashes += [perturb(rng, value, rng.randint(1, threshold)) for value in probes for _ in range(3)]
+
+    with app.app_context():
+        batch = 10000
+        for start in range(0, len(hashes), batch):
+            rows = []
+            for index, value in enumerate(hashes[start:start + batch], start):
+                row = {'path': f'objects/bench/{index}.jpg', 'hash': to_signed(value)}
+                row.update({f'band_{i}': band for i, band in enumerate(bands(value))})
+                rows.append(row)
+            db.session.execute(insert(ImageHash.__table__), rows)
+            db.session.commit()
+    return probes
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark perceptual-hash lookups')
+    parser.add_argument('--images', type=int, default=500000, help='Stored image hashes')
+    parser.add_argument('--queries', type=int, default=50, help='Lookups to time')
+    parser.add_argument('--threshold', type=int, default=6, help='Hamming distance threshold')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    from src.main import app
+    from src.models import db, ImageHash
+    from src.services import ImageHashIndex
+    from src.services.image_hash import hamming
+
+    try:
+        start = time.perf_counter()
+        probes = populate(app, args.images, args.queries, args.threshold)
+        print(f"Stored {args.images} hashes in {time.perf_counter() - start:.1f}s")
+
+        index = ImageHashIndex()
+        with app.app_context():
+            timings = []
+            found = []
+            for value in probes:
+                begin = time.perf_counter()
+                found.append({path for path, _ in index.lookup(value, args.threshold)})
+                timings.append(time.perf_counter() - begin)
+            timings.sort()
+            print(f"Multi-index lookup (threshold {args.threshold}):")
+            print(f"  median {timings[len(timings) // 2] * 1000:8.1f} ms   p95 {timings[int(len(timings) * 0.95)] * 1000:8.1f} ms")
+
+            begin = time.perf_counter()
+            stored = db.session.query(ImageHash.path, ImageHash.hash).all()
+            scanned = {path for path, value in stored if hamming(probes[0], value) <= args.threshold}
+            elapsed = time.perf_counter() - begin
+            print(f"Linear scan (one query): {elapsed * 1000:8.1f} ms")
+            print(f"Same matches as the scan: {'yes' if scanned == found[0] else 'NO'} ({len(scanned)} image(s))")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark for API response serialization and compression
+
+Fills a scratch database with synthetic applications and measures
+``GET /api/applications?per_page=100`` (full records and ?fields=summary):
+time spent serializing the payload with the stdlib encoder and with orjson,
+whole-request time, and bytes on the wire with and without gzip.
+
+Usage:
+    python benchmarks/json_responses.py [--rows N] [--requests N]
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+from datetime import datetime, date, timedelta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DISTRICTS = [('Dhaka', 'Dhaka'), ('Sylhet', 'Sylhet'), ('Khulna', 'Khulna'), ('Rangpur', 'Rangpur')]
+
+def populate(app, rows, seed=11):
+    from sqlalchemy import insert
+    from src.models import db, Application, Category
+
+    rng = random.Random(seed)
+    with app.app_context():
+        category = Category(name='Housing Project')
+        db.session.add(category)
+        db.session.commit()
+
+        now = datetime.utcnow()
+        batch = []
+        for index in range(rows):
+            district, division = rng.choice(DISTRICTS)
+            batch.append({
+                'reference_number': f'SBS2024{index:08d}',
+                'full_name': f'Applicant {index}', 'father_name': f'Father {index}', 'mother_name': f'Mother {index}',
+                'nid_number': f'{1980000000000 + index}', 'date_of_birth': date(1970, 1, 1) + timedelta(days=index % 9000),
+                'occupation': 'Farmer', 'village': f'Village {index % 300}', 'upazila': f'Upazila {index % 40}',
+                'district': district, 'division': division, 'family_members_count': rng.randint(1, 9),
+                'monthly_income': rng.randrange(3000, 30000), 'main_earner_occupation': 'Farmer',
+                'email': f'applicant{index}@example.com', 'mobile_number': f'017{index:08d}',
+                'photo_path': f'photos/{index:032x}.jpg', 'status': 'Pending', 'category_id': category.id,
+                'created_at': now - timedelta(minutes=index), 'updated_at': now - timedelta(minutes=index),
+            })
+        db.session.execute(insert(Application.__table__), batch)
+        db.session.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark API JSON serialization and compression')
+    parser.add_argument('--rows', type=int, default=5000, help='Applications in the scratch database')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per measurement')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    from src.main import app
+    from sqlalchemy.orm import joinedload
+    from src.models import Application
+    from src.services import json_provider
+
+    try:
+        populate(app, args.rows)
+        client = app.test_client()
+        orjson = json_provider.orjson
+        if orjson is None:
+            print("orjson is not installed; only the stdlib encoder is measured")
+
+        # Serialization alone, on the payload the listing builds for 100 records
+        with app.test_request_context('/api/applications'):
+            items = Application.query.options(joinedload(Application.category)).order_by(Application.id).limit(100).all()
+            payload = {'success': True, 'data': [item.to_dict() for item in items]}
+            for name, module in (('stdlib json', None), ('orjson', orjson)):
+                if name == 'orjson' and module is None:
+                    continue
+                json_provider.orjson = module
+                start = time.perf_counter()
+                for _ in range(args.requests):
+                    app.json.response(payload)
+                elapsed = (time.perf_counter() - start) / args.requests
+                print(f"Serialize 100 full records, {name:<12} {elapsed * 1000:7.2f} ms")
+        json_provider.orjson = orjson
+
+        for label, url in (('full records', '/api/applications?per_page=100'),
+                           ('fields=summary', '/api/applications?per_page=100&fields=summary')):
+            print(f"GET {url} ({label}):")
+            for name, module in (('stdlib json', None), ('orjson', orjson)):
+                if name == 'orjson' and module is None:
+                    continue
+                json_provider.orjson = module
+                start = time.perf_counter()
+                for _ in range(args.requests):
+                    client.get(url)
+                elapsed = (time.perf_counter() - start) / args.requests
+                print(f"  whole request, {name:<19} {elapsed * 1000:7.2f} ms")
+            json_provider.orjson = orjson
+
+            plain = client.get(url)
+            compressed = client.get(url, headers={'Accept-Encoding': 'gzip'})
+            print(f"  on the wire: {len(plain.data):,} bytes plain, {len(compressed.data):,} bytes gzip "
+                  f"({compressed.headers.get('Content-Encoding')}, {len(compressed.data) / len(plain.data):.0%})")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the application lookup cache
+
+Fills a scratch database with synthetic applications and times
+``POST /api/applications/track`` by reference number and by NID, and
+``GET /api/applications/{reference}``, with the lookup cache switched off
+and on. Lookups repeat over a small set of hot applications, as applicants
+polling their status do, with a status change every ``--write-every``
+requests so some lookups miss after an invalidation.
+
+Usage:
+    python benchmarks/lookup_cache.py [--rows N] [--requests N] [--hot N] [--write-every N]
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+from datetime import datetime, date, timedelta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def populate(app, rows, seed=5):
+    from sqlalchemy import insert
+    from src.models import db, Application, Category
+
+    rng = random.Random(seed)
+    with app.app_context():
+        category = Category(name='Housing Project')
+        db.session.add(category)
+        db.session.commit()
+
+        now = datetime.utcnow()
+        batch = []
+        for index in range(rows):
+            batch.append({
+                'reference_number': f'SBS2024{index:08d}',
+                'full_name': f'Applicant {index}', 'father_name': f'Father {index}', 'mother_name': f'Mother {index}',
+                # Two applications per NID, as for applicants who applied twice
+                'nid_number': f'{1980000000000 + index // 2}', 'date_of_birth': date(1970, 1, 1) + timedelta(days=index % 9000),
+                'occupation': 'Farmer', 'village': f'Village {index % 300}', 'upazila': f'Upazila {index % 40}',
+                'district': 'Dhaka', 'division': 'Dhaka', 'family_members_count': rng.randint(1, 9),
+                'monthly_income': rng.randrange(3000, 30000), 'main_earner_occupation': 'Farmer',
+                'email': f'applicant{index}@example.com', 'mobile_number': f'017{index:08d}',
+                'photo_path': f'photos/{index:032x}.jpg', 'status': 'Pending', 'category_id': category.id,
+                'created_at': now, 'updated_at': now,
+            })
+        db.session.execute(insert(Application.__table__), batch)
+        db.session.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark cached application lookups')
+    parser.add_argument('--rows', type=int, default=20000, help='Applications in the scratch database')
+    parser.add_argument('--requests', type=int, default=2000, help='Lookups per measurement')
+    parser.add_argument('--hot', type=int, default=200, help='Distinct applications looked up')
+    parser.add_argument('--write-every', type=int, default=100, help='Requests between status changes; 0 for none')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    from src.main import app
+    from src.services.lookup_cache import get_lookup_cache
+
+    try:
+        populate(app, args.rows)
+        client = app.test_client()
+        rng = random.Random(1)
+        hot = rng.sample(range(args.rows), args.hot)
+        lookups = [rng.choice(hot) for _ in range(args.requests)]
+
+        requests = {
+            'track by reference': lambda index: client.post('/api/applications/track', json={'reference_number': f'SBS2024{index:08d}'}),
+            'track by NID': lambda index: client.post('/api/applications/track', json={'nid_number': f'{1980000000000 + index // 2}'}),
+            'GET by reference': lambda index: client.get(f'/api/applications/SBS2024{index:08d}'),
+        }
+
+        with app.app_context():
+            cache = get_lookup_cache()
+        for label, send in requests.items():
+            print(f"{label} ({args.requests:,} lookups over {args.hot} applications):")
+            for enabled in (False, True):
+                cache.clear()
+                cache.max_entries = app.config['LOOKUP_CACHE_MAX_ENTRIES'] if enabled else 0
+                hits, misses = cache.hits, cache.misses
+                statuses = ('Approved', 'Pending')
+                start = time.perf_counter()
+                for count, index in enumerate(lookups, 1):
+                    send(index)
+                    if args.write_every and count % args.write_every == 0:
+                        client.put(f'/api/applications/{index + 1}/status', json={'status': statuses[count // args.write_every % 2]})
+                elapsed = (time.perf_counter() - start) / args.requests
+                name = 'cache on' if enabled else 'cache off'
+                print(f"  {name:<10} {elapsed * 1000:6.3f} ms/request  "
+                      f"({cache.hits - hits:,} hits, {cache.misses - misses:,} misses)")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
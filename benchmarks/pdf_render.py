@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the application letter renderers
+
+Compares documents per second for the platypus renderer and the canvas
+fast path, rendering into memory buffers.
+
+Usage:
+    python benchmarks/pdf_render.py [--count N] [--photo PATH] [--signature PATH]
+"""
+
+import os
+import sys
+import time
+import argparse
+from io import BytesIO
+from datetime import date
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.pdf_generator import LetterData, PDF_RENDERERS
+
+def sample_letter(index, photo_path=None, signature_path=None):
+    return LetterData(
+        id=index,
+        reference_number=f'SBS20250101{index:08X}',
+        category_name='Housing Project',
+        full_name='Mohammad Abdul Karim',
+        father_name='Abdul Rahman',
+        mother_name='Rahima Begum',
+        nid_number='1990123456789',
+        date_of_birth=date(1990, 1, 15),
+        occupation='Farmer',
+        village='Amirty',
+        upazila='Melandaha',
+        district='Jamalpur',
+        division='Mymensingh',
+        family_members_count=5,
+        monthly_income=8500.0,
+        main_earner_occupation='Farmer',
+        email='karim@example.com',
+        mobile_number='01700000000',
+        photo_path=photo_path,
+        signature_path=signature_path
+    )
+
+def bench(renderer, count, upload_folder, photo_path, signature_path):
+    generator = PDF_RENDERERS[renderer](upload_folder)
+
+    # Warm up the shared template and font metrics
+    generator.render(sample_letter(0, photo_path, signature_path), BytesIO())
+
+    total_bytes = 0
+    start = time.perf_counter()
+    for index in range(count):
+        buffer = BytesIO()
+        generator.render(sample_letter(index, photo_path, signature_path), buffer)
+        total_bytes += buffer.tell()
+    elapsed = time.perf_counter() - start
+
+    return count / elapsed, total_bytes / count
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark PDF letter renderers')
+    parser.add_argument('--count', type=int, default=200, help='Documents per renderer')
+    parser.add_argument('--photo', help='Photo file to embed')
+    parser.add_argument('--signature', help='Signature file to embed')
+    args = parser.parse_args()
+
+    # Absolute image paths resolve regardless of the upload folder
+    upload_folder = os.getcwd()
+    photo_path = os.path.abspath(args.photo) if args.photo else None
+    signature_path = os.path.abspath(args.signature) if args.signature else None
+
+    print(f"Rendering {args.count} documents per renderer")
+    results = {}
+    for renderer in PDF_RENDERERS:
+        docs_per_second, avg_bytes = bench(renderer, args.count, upload_folder, photo_path, signature_path)
+        results[renderer] = docs_per_second
+        print(f"  {renderer:<10} {docs_per_second:8.1f} docs/s   {avg_bytes / 1024:8.1f} KB/doc")
+
+    if 'platypus' in results and 'canvas' in results:
+        print(f"  canvas speedup: {results['canvas'] / results['platypus']:.1f}x")
+
+if __name__ == '__main__':
+    main()
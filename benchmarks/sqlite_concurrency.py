@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Concurrent read/write benchmark for the SQLite engine profile
+
+Runs writer threads (short insert transactions, like submissions) next to
+reader threads (filtered count + page, like the admin dashboard) against a
+scratch database, first with SQLAlchemy's default SQLite settings and then
+with the WAL profile and separate read/write pools used by the app.
+
+Usage:
+    python benchmarks/sqlite_concurrency.py [--seconds N] [--writers N] [--readers N] [--rows N]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import threading
+from datetime import datetime
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.engine import DEFAULT_SQLITE_PRAGMAS, apply_sqlite_pragmas
+
+DISTRICTS = ['Dhaka', 'Jamalpur', 'Sylhet', 'Khulna', 'Rajshahi', 'Barishal', 'Rangpur', 'Cumilla']
+STATUSES = ['Pending', 'Approved', 'Rejected', 'In Progress']
+
+SCHEMA = """
+CREATE TABLE application (
+    id INTEGER PRIMARY KEY,
+    full_name VARCHAR(200) NOT NULL,
+    district VARCHAR(100) NOT NULL,
+    status VARCHAR(50) NOT NULL,
+    created_at DATETIME NOT NULL
+)
+"""
+
+def new_row():
+    return {
+        'full_name': f'Applicant {random.randint(1, 10**9)}',
+        'district': random.choice(DISTRICTS),
+        'status': random.choice(STATUSES),
+        'created_at': datetime.utcnow(),
+    }
+
+def seed(path, rows):
+    engine = create_engine(f'sqlite:///{path}')
+    with engine.begin() as conn:
+        conn.execute(text(SCHEMA))
+        conn.execute(text('CREATE INDEX ix_application_district ON application (district, created_at)'))
+        conn.execute(text(
+            'INSERT INTO application (full_name, district, status, created_at) '
+            'VALUES (:full_name, :district, :status, :created_at)'
+        ), [new_row() for _ in range(rows)])
+    engine.dispose()
+
+def default_engines(path):
+    engine = create_engine(f'sqlite:///{path}')
+    return engine, engine
+
+def profile_engines(path):
+    url = f'sqlite:///{path}'
+    write_engine = create_engine(url, pool_size=1, max_overflow=0, pool_timeout=30)
+    read_engine = create_engine(url, pool_size=8, max_overflow=8, pool_timeout=30)
+    apply_sqlite_pragmas(write_engine, DEFAULT_SQLITE_PRAGMAS)
+    apply_sqlite_pragmas(read_engine, DEFAULT_SQLITE_PRAGMAS, read_only=True)
+
+    # Put the file in WAL mode before readers connect
+    with write_engine.connect():
+        pass
+    return write_engine, read_engine
+
+def run(write_engine, read_engine, seconds, writers, readers):
+    stop = threading.Event()
+    counts = {'writes': 0, 'reads': 0, 'errors': 0}
+    lock = threading.Lock()
+
+    def record(key):
+        with lock:
+            counts[key] += 1
+
+    def writer():
+        while not stop.is_set():
+            try:
+                with write_engine.begin() as conn:
+                    conn.execute(text(
+                        'INSERT INTO application (full_name, district, status, created_at) '
+                        'VALUES (:full_name, :district, :status, :created_at)'
+                    ), new_row())
+                record('writes')
+            except OperationalError:
+                record('errors')
+
+    def reader():
+        while not stop.is_set():
+            district = random.choice(DISTRICTS)
+            try:
+                with read_engine.connect() as conn:
+                    conn.execute(text('SELECT COUNT(*) FROM application WHERE district = :d'), {'d': district}).scalar()
+                    conn.execute(text(
+                        'SELECT * FROM application WHERE district = :d ORDER BY created_at DESC LIMIT 20'
+                    ), {'d': district}).fetchall()
+                record('reads')
+            except OperationalError:
+                record('errors')
+
+    threads = [threading.Thread(target=writer) for _ in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return {key: value / seconds for key, value in counts.items()}
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark concurrent SQLite reads and writes')
+    parser.add_argument('--seconds', type=float, default=5, help='Duration of each run')
+    parser.add_argument('--writers', type=int, default=4, help='Writer threads')
+    parser.add_argument('--readers', type=int, default=8, help='Reader threads')
+    parser.add_argument('--rows', type=int, default=50000, help='Rows seeded before each run')
+    args = parser.parse_args()
+
+    print(f"{args.writers} writers, {args.readers} readers, {args.seconds:g}s per run, {args.rows} seeded rows")
+    for name, make_engines in (('default', default_engines), ('profile', profile_engines)):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'bench.db')
+            seed(path, args.rows)
+            write_engine, read_engine = make_engines(path)
+            result = run(write_engine, read_engine, args.seconds, args.writers, args.readers)
+            write_engine.dispose()
+            read_engine.dispose()
+
+        print(f"  {name:<8} {result['writes']:8.1f} writes/s  {result['reads']:8.1f} reads/s  {result['errors']:6.1f} errors/s")
+
+if __name__ == '__main__':
+    main()
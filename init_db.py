@@ -10,13 +10,14 @@ sys.path.insert(0, os.path.dirname(__file__))
 
 from src.main import app
 from src.models import db, Category, Admin
+from src.models.migrations import upgrade_database
 
 def init_database():
     """Initialize database with default data"""
+    # Create tables and apply schema migrations
+    upgrade_database(app)
+
     with app.app_context():
-        # Create all tables
-        db.create_all()
-        
         # Check if categories already exist
         if Category.query.count() == 0:
             # Create default categories
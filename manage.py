@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Management commands for State Bangladesh Society
+
+Usage:
+    python manage.py worker [--processes N] [--poll-interval SECONDS] [--once]
+    python manage.py build-derivatives
+    python manage.py storage-gc [--grace-period SECONDS]
+    python manage.py migrate [--list]
+    python manage.py check-indexes
+    python manage.py rebuild-stats
+    python manage.py dedupe [--reindex] [--threshold SCORE]
+    python manage.py hash-images
+    python manage.py import-applications CSV [--archive ZIP] [--dry-run] [--chunk-size N]
+    python manage.py mail-worker [--once] [--rate MSGS_PER_SEC] [--batch-size N]
+    python manage.py smtp-sink [--port PORT] [--save-dir DIR]
+    python manage.py build-assets
+"""
+
+import os
+import sys
+import argparse
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.main import app
+
+def run_worker(args):
+    """Run background job workers"""
+    from src.services.job_queue import JobWorker, run_worker_pool
+
+    if args.once:
+        processed = JobWorker(app, poll_interval=args.poll_interval).run(max_jobs=args.max_jobs, drain=True)
+        print(f"✓ Processed {processed} job(s)")
+    elif args.processes <= 1:
+        print("✓ Job worker started (Ctrl+C to stop)")
+        try:
+            JobWorker(app, poll_interval=args.poll_interval).run()
+        except KeyboardInterrupt:
+            pass
+    else:
+        print(f"✓ Starting {args.processes} job worker processes (Ctrl+C to stop)")
+        run_worker_pool(processes=args.processes, poll_interval=args.poll_interval)
+
+def build_derivatives(args):
+    """(Re)build the image derivatives of existing uploads"""
+    from src.models import Application
+    from src.services import ImageProcessor
+
+    with app.app_context():
+        processor = ImageProcessor(app.config['UPLOAD_FOLDER'])
+        processed = 0
+        for application in Application.query.yield_per(500):
+            uploads = (
+                (application.photo_path, 'photos'),
+                (application.signature_path, 'signatures'),
+                (application.nid_image_path, 'nid_images'),
+            )
+            for relative_path, folder in uploads:
+                if relative_path and processor.process(relative_path, folder):
+                    processed += 1
+        print(f"✓ Built derivatives for {processed} upload(s)")
+
+def storage_gc(args):
+    """Remove unreferenced upload objects and stale temp files"""
+    from src.services import UploadStore
+
+    with app.app_context():
+        removed = UploadStore(app.config['UPLOAD_FOLDER']).collect_garbage(grace_period=args.grace_period)
+        print(f"✓ Removed {removed} file(s)")
+
+def migrate(args):
+    """Create missing tables and apply pending schema migrations"""
+    from src.models import db
+    from src.models.migrations import upgrade_database, pending_migrations
+
+    if args.list:
+        with app.app_context(), db.engine.connect() as connection:
+            pending = pending_migrations(connection)
+        for version, name, _ in pending:
+            print(f"  {version:04d} {name}")
+        print(f"✓ {len(pending)} pending migration(s)")
+        return
+
+    applied = upgrade_database(app)
+    for name in applied:
+        print(f"  applied {name}")
+    print(f"✓ Database is up to date ({len(applied)} migration(s) applied)")
+
+def check_indexes(args):
+    """Fail if any hot query plan falls back to a full table scan"""
+    from src.models import db
+    from src.models.migrations import check_query_plans
+
+    with app.app_context(), db.engine.connect() as connection:
+        results = check_query_plans(connection)
+
+    failures = 0
+    for name, plan, full_scan in results:
+        print(f"{'✗' if full_scan else '✓'} {name}")
+        for line in plan:
+            print(f"    {line}")
+        failures += full_scan
+
+    if failures:
+        print(f"✗ {failures} quer{'y' if failures == 1 else 'ies'} scan the whole table; run `python manage.py migrate`")
+        sys.exit(1)
+    print("✓ All hot queries use an index")
+
+def rebuild_stats(args):
+    """Recompute the dashboard statistics rollup from the application table"""
+    from src.services import StatsRollup
+
+    with app.app_context():
+        rows = StatsRollup().rebuild()
+        print(f"✓ Rebuilt statistics rollup ({rows} row(s))")
+
+def dedupe(args):
+    """Score every pair of applications sharing a blocking key"""
+    from src.services import DedupeEngine
+
+    with app.app_context():
+        engine = DedupeEngine(threshold=args.threshold, max_block_size=args.max_block_size)
+        counts = engine.run(reindex=args.reindex)
+        if counts['skipped_blocks']:
+            print(f"  skipped {counts['skipped_blocks']} block(s) over {args.max_block_size} applications")
+        print(f"✓ Compared {counts['pairs']} pair(s) in {counts['blocks']} block(s); "
+              f"{counts['duplicates']} possible duplicate(s) recorded")
+
+def hash_images(args):
+    """Compute perceptual hashes for uploaded images not yet indexed"""
+    from src.models import db, Application
+    from src.services import ImageHashIndex, UploadStore
+    from src.services.image_hash import HASHED_FOLDERS
+    from src.services.image_processing import is_image
+
+    with app.app_context():
+        store = UploadStore(app.config['UPLOAD_FOLDER'])
+        index = ImageHashIndex()
+        hashed = 0
+        columns = [getattr(Application, column) for column in HASHED_FOLDERS.values()]
+        paths = {path for row in db.session.query(*columns).all() for path in row if path and is_image(path)}
+        for relative_path in sorted(paths):
+            if index.add(relative_path, store.resolve(relative_path)) is not None:
+                hashed += 1
+                if hashed % 500 == 0:
+                    db.session.commit()
+        db.session.commit()
+        print(f"✓ Hashed {hashed} image(s)")
+
+def import_applications(args):
+    """Bulk import applications from a CSV (and a ZIP of their scans)"""
+    import json
+    import time
+    import zipfile
+    from src.services import ApplicationImporter
+
+    with app.app_context():
+        importer = ApplicationImporter(app.config['UPLOAD_FOLDER'], chunk_size=args.chunk_size, send_emails=not args.no_email)
+        archive = zipfile.ZipFile(args.archive) if args.archive else None
+        start = time.perf_counter()
+        try:
+            with open(args.csv, newline='', encoding='utf-8-sig') as csv_file:
+                report = importer.run(csv_file, archive=archive, dry_run=args.dry_run)
+        except ValueError as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+        finally:
+            if archive:
+                archive.close()
+        elapsed = time.perf_counter() - start
+
+        for error in report.errors[:20]:
+            print(f"  line {error['row']}: {error['message']}")
+        if report.failed > 20:
+            print(f"  ... and {report.failed - 20} more error(s)")
+        if args.report:
+            with open(args.report, 'w') as f:
+                json.dump(report.to_dict(), f, indent=2)
+
+        verb = 'Validated' if args.dry_run else 'Imported'
+        print(f"✓ {verb} {report.imported} of {report.total} row(s) in {elapsed:.1f}s ({report.failed} failed)")
+
+def mail_worker(args):
+    """Deliver queued emails from the outbox over pooled SMTP connections"""
+    from src.services import OutboxWorker
+
+    worker = OutboxWorker(app, rate=args.rate, batch_size=args.batch_size, poll_interval=args.poll_interval)
+    if args.once:
+        sent = worker.run(drain=True)
+        print(f"✓ Sent {sent} email(s)")
+    else:
+        print(f"✓ Mail worker started for {app.config['SMTP_HOST']}:{app.config['SMTP_PORT']} (Ctrl+C to stop)")
+        try:
+            worker.run()
+        except KeyboardInterrupt:
+            pass
+
+def smtp_sink(args):
+    """Run a local SMTP server that accepts every message"""
+    import time
+    from src.services.smtp_sink import SMTPSink
+
+    sink = SMTPSink(args.host, args.port, save_dir=args.save_dir, keep=False).start()
+    print(f"✓ SMTP sink listening on {args.host}:{sink.port} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sink.stop()
+        print(f"✓ Accepted {sink.count} message(s) over {sink.connections} connection(s)")
+
+def build_assets(args):
+    """Minify, fingerprint and precompress the frontend files"""
+    from src.services.static_assets import build_static_assets
+
+    output_folder = app.config['STATIC_BUILD_FOLDER']
+    if not output_folder:
+        print("✗ STATIC_BUILD_FOLDER is not set")
+        sys.exit(1)
+
+    manifest = build_static_assets(app.static_folder, output_folder)
+    for name, entry in sorted(manifest['assets'].items()):
+        sizes = ', '.join(f"{encoding} {size:,}" for encoding, size in sorted(entry['encodings'].items()))
+        print(f"  {name} -> {entry['path']} ({entry['size']:,} bytes{'; ' + sizes if sizes else ''})")
+    print(f"✓ Built {len(manifest['assets'])} asset(s) into {output_folder}; restart the server to serve them")
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='State Bangladesh Society management commands')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    worker = subparsers.add_parser('worker', help='Run background job workers')
+    worker.add_argument('--processes', type=int, default=2, help='Number of worker processes')
+    worker.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to wait when the queue is empty')
+    worker.add_argument('--once', action='store_true', help='Drain the queue and exit')
+    worker.add_argument('--max-jobs', type=int, default=None, help='Stop after this many jobs (with --once)')
+    worker.set_defaults(func=run_worker)
+
+    derivatives = subparsers.add_parser('build-derivatives', help='Build image derivatives for existing uploads')
+    derivatives.set_defaults(func=build_derivatives)
+
+    gc = subparsers.add_parser('storage-gc', help='Remove unreferenced upload objects')
+    gc.add_argument('--grace-period', type=int, default=3600, help='Keep files younger than this many seconds')
+    gc.set_defaults(func=storage_gc)
+
+    migrate_parser = subparsers.add_parser('migrate', help='Apply pending schema migrations')
+    migrate_parser.add_argument('--list', action='store_true', help='Only list pending migrations')
+    migrate_parser.set_defaults(func=migrate)
+
+    indexes = subparsers.add_parser('check-indexes', help='Check hot query plans for full table scans')
+    indexes.set_defaults(func=check_indexes)
+
+    stats = subparsers.add_parser('rebuild-stats', help='Rebuild the dashboard statistics rollup')
+    stats.set_defaults(func=rebuild_stats)
+
+    dedupe_parser = subparsers.add_parser('dedupe', help='Find possible duplicate applications')
+    dedupe_parser.add_argument('--reindex', action='store_true', help='Rebuild the blocking keys first')
+    dedupe_parser.add_argument('--threshold', type=float, default=0.4, help='Minimum score to record a pair')
+    dedupe_parser.add_argument('--max-block-size', type=int, default=100, help='Skip blocking keys shared by more applications')
+    dedupe_parser.set_defaults(func=dedupe)
+
+    images = subparsers.add_parser('hash-images', help='Index perceptual hashes of existing uploads')
+    images.set_defaults(func=hash_images)
+
+    importer = subparsers.add_parser('import-applications', help='Bulk import applications from a CSV')
+    importer.add_argument('csv', help='CSV with one application per row (submission form field names)')
+    importer.add_argument('--archive', help='ZIP holding the files named in the photo/signature/nid_image columns')
+    importer.add_argument('--dry-run', action='store_true', help='Validate only')
+    importer.add_argument('--chunk-size', type=int, default=1000, help='Rows per INSERT batch and transaction')
+    importer.add_argument('--no-email', action='store_true', help="Don't queue confirmation emails")
+    importer.add_argument('--report', help='Write the full JSON report (errors and reference numbers) here')
+    importer.set_defaults(func=import_applications)
+
+    mail = subparsers.add_parser('mail-worker', help='Deliver queued emails from the outbox')
+    mail.add_argument('--once', action='store_true', help='Drain the outbox and exit')
+    mail.add_argument('--rate', type=float, default=None, help='Messages per second (default SMTP_RATE_LIMIT)')
+    mail.add_argument('--batch-size', type=int, default=100, help='Messages claimed per round')
+    mail.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to wait when the outbox is empty')
+    mail.set_defaults(func=mail_worker)
+
+    sink = subparsers.add_parser('smtp-sink', help='Run a local SMTP server for development')
+    sink.add_argument('--host', default='127.0.0.1', help='Address to listen on')
+    sink.add_argument('--port', type=int, default=1025, help='Port to listen on')
+    sink.add_argument('--save-dir', help='Write each message here as an .eml file')
+    sink.set_defaults(func=smtp_sink)
+
+    assets = subparsers.add_parser('build-assets', help='Minify, fingerprint and precompress the frontend files')
+    assets.set_defaults(func=build_assets)
+
+    return parser
+
+if __name__ == '__main__':
+    args = build_parser().parse_args()
+    args.func(args)
@@ -3,24 +3,56 @@ import sys
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from flask import Flask, send_from_directory
+from flask import Flask
 from flask_cors import CORS
 from src.models import db
+from src.models.engine import configure_database
+from src.models.migrations import upgrade_database
 from src.routes.user import user_bp
 from src.routes.category import category_bp
 from src.routes.application import application_bp
 from src.routes.admin import admin_bp
 from src.routes.pdf import pdf_bp
+from src.routes.job import job_bp
+from src.routes.duplicate import duplicate_bp
+from src.routes.outbox import outbox_bp
+from src.services.static_assets import StaticAssets
+from src.services.json_provider import FastJSONProvider, compress_response
 
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+app.json = FastJSONProvider(app)  # orjson when installed
 app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
 
 # Enable CORS for all routes
 CORS(app)
 
+# gzip large API responses for clients that accept it
+app.after_request(compress_response)
+
 # File upload configuration
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 app.config['UPLOAD_FOLDER'] = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'uploads')
+app.config['PDF_CACHE_MAX_BYTES'] = 512 * 1024 * 1024  # Rendered PDFs kept in uploads/pdfs/cache
+app.config['PDF_RENDERER'] = os.environ.get('PDF_RENDERER', 'platypus')  # 'platypus' or 'canvas' fast path
+app.config['BULK_EXPORT_PROCESSES'] = None  # Defaults to the CPU count
+app.config['BULK_EXPORT_MERGED_LIMIT'] = 500  # Max letters in one merged PDF
+app.config['IMPORT_MAX_CONTENT_LENGTH'] = 512 * 1024 * 1024  # CSV plus ZIP of scans for bulk import
+app.config['EMAIL_DELIVERY'] = os.environ.get('EMAIL_DELIVERY', 'log')  # 'log', 'outbox' (sent by `manage.py mail-worker`) or 'smtp'
+app.config['MAIL_FROM'] = os.environ.get('MAIL_FROM', 'noreply@statebd.org')
+app.config['SMTP_HOST'] = os.environ.get('SMTP_HOST', 'localhost')  # `manage.py smtp-sink` listens on localhost:1025
+app.config['SMTP_PORT'] = int(os.environ.get('SMTP_PORT', 1025))
+app.config['SMTP_USERNAME'] = os.environ.get('SMTP_USERNAME')
+app.config['SMTP_PASSWORD'] = os.environ.get('SMTP_PASSWORD')
+app.config['SMTP_STARTTLS'] = os.environ.get('SMTP_STARTTLS', '0') == '1'
+app.config['SMTP_POOL_SIZE'] = 4  # Persistent SMTP sessions (and sender threads) per mail worker
+app.config['SMTP_MESSAGES_PER_CONNECTION'] = 500  # Reconnect after this many messages
+app.config['SMTP_RATE_LIMIT'] = float(os.environ.get('SMTP_RATE_LIMIT', 0))  # Messages/second across the pool; 0 is unlimited
+app.config['STATIC_BUILD_FOLDER'] = os.environ.get('STATIC_BUILD_FOLDER', os.path.join(os.path.dirname(__file__), 'static_build'))  # Output of `manage.py build-assets`; empty serves src/static as is
+app.config['COMPRESS_MIN_BYTES'] = 1024  # gzip JSON responses at least this big
+app.config['COMPRESS_LEVEL'] = 6
+app.config['LOOKUP_CACHE_MAX_ENTRIES'] = 10000  # Serialized reference/NID lookups kept per process
+app.config['LOOKUP_CACHE_TTL'] = 30  # Seconds; bounds staleness from writes that skip the version table
+app.config['CACHE_CHECK_INTERVAL'] = float(os.environ.get('CACHE_CHECK_INTERVAL', 0))  # Seconds between cache_version checks; 0 checks on every request
 
 # Register blueprints
 app.register_blueprint(user_bp, url_prefix='/api')
@@ -28,29 +60,30 @@ app.register_blueprint(category_bp, url_prefix='/api')
 app.register_blueprint(application_bp, url_prefix='/api')
 app.register_blueprint(admin_bp, url_prefix='/api')
 app.register_blueprint(pdf_bp, url_prefix='/api')
+app.register_blueprint(job_bp, url_prefix='/api')
+app.register_blueprint(duplicate_bp, url_prefix='/api')
+app.register_blueprint(outbox_bp, url_prefix='/api')
 
 # uncomment if you need to use database
-app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get(
+    'DATABASE_URL',
+    f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
+)
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db.init_app(app)
-with app.app_context():
-    db.create_all()
+app.config['SQLITE_WRITE_POOL_SIZE'] = 1  # Writers queue in-process instead of on the file lock
+app.config['SQLITE_READ_POOL_SIZE'] = 8  # Query-only connections for GET/HEAD requests
+app.config['AUTO_MIGRATE'] = os.environ.get('AUTO_MIGRATE', '1') == '1'  # Else run `python manage.py migrate`
+configure_database(app, db)
+if app.config['AUTO_MIGRATE']:
+    upgrade_database(app)
+
+# Frontend files, precompressed and fingerprinted by `python manage.py build-assets`
+static_assets = StaticAssets(app.static_folder, app.config['STATIC_BUILD_FOLDER'])
 
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def serve(path):
-    static_folder_path = app.static_folder
-    if static_folder_path is None:
-            return "Static folder not configured", 404
-
-    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
-    else:
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
-        else:
-            return "index.html not found", 404
+    return static_assets.response(path or 'index.html')
 
 
 if __name__ == '__main__':
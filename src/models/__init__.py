@@ -1,14 +1,22 @@
 from flask_sqlalchemy import SQLAlchemy
+from .engine import RoutingSession
 
 # Initialize the database instance
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 # Import all models
 from .user import User
 from .category import Category
 from .application import Application
 from .admin import Admin
+from .job import Job
+from .stored_file import StoredFile
+from .application_stat import ApplicationStat
+from .duplicate import ApplicationBlockKey, DuplicateCandidate
+from .image_hash import ImageHash
+from .outbound_email import OutboundEmail
+from .cache_version import CacheVersion
 
 # Make models available for import
-__all__ = ['db', 'User', 'Category', 'Application', 'Admin']
+__all__ = ['db', 'User', 'Category', 'Application', 'Admin', 'Job', 'StoredFile', 'ApplicationStat', 'ApplicationBlockKey', 'DuplicateCandidate', 'ImageHash', 'OutboundEmail', 'CacheVersion']
 
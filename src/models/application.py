@@ -45,6 +45,21 @@ class Application(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Matched to the admin listing filters and tracking lookups (see migrations.py)
+    __table_args__ = (
+        db.Index('ix_application_created_at', 'created_at'),
+        db.Index('ix_application_status_created_at', 'status', 'created_at'),
+        db.Index('ix_application_district_created_at', 'district', 'created_at'),
+        db.Index('ix_application_division_created_at', 'division', 'created_at'),
+        db.Index('ix_application_category_created_at', 'category_id', 'created_at'),
+        db.Index('ix_application_category_status_created_at', 'category_id', 'status', 'created_at'),
+        db.Index('ix_application_nid_number', 'nid_number'),
+        db.Index('ix_application_mobile_number', 'mobile_number'),
+        db.Index('ix_application_photo_path', 'photo_path'),
+        db.Index('ix_application_signature_path', 'signature_path'),
+        db.Index('ix_application_nid_image_path', 'nid_image_path'),
+    )
+    
     def __init__(self, **kwargs):
         super(Application, self).__init__(**kwargs)
         if not self.reference_number:
@@ -52,9 +67,7 @@ class Application(db.Model):
     
     def generate_reference_number(self):
         """Generate a unique reference number"""
-        timestamp = datetime.now().strftime('%Y%m%d')
-        unique_id = str(uuid.uuid4())[:8].upper()
-        return f"SBS{timestamp}{unique_id}"
+        return new_reference_number()
 
     def __repr__(self):
         return f'<Application {self.reference_number}>'
@@ -89,3 +102,130 @@ class Application(db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+
+def new_reference_number():
+    """SBS<yyyymmdd><8 random hex digits>"""
+    timestamp = datetime.now().strftime('%Y%m%d')
+    unique_id = str(uuid.uuid4())[:8].upper()
+    return f"SBS{timestamp}{unique_id}"
+
+# Statuses an admin can set
+APPLICATION_STATUSES = ('Pending', 'Approved', 'Rejected', 'In Progress')
+
+# Fields every submission must provide
+REQUIRED_FIELDS = (
+    'full_name', 'father_name', 'mother_name', 'nid_number',
+    'date_of_birth', 'occupation', 'village', 'upazila',
+    'district', 'division', 'family_members_count',
+    'monthly_income', 'main_earner_occupation', 'email',
+    'mobile_number', 'category_id'
+)
+
+def clean_application_data(data):
+    """Validate submitted form values and convert them to column values.
+
+    Shared by the submission form and bulk import. Raises ValueError with a
+    message for the applicant; the category is checked by the caller.
+    """
+    for field in REQUIRED_FIELDS:
+        if not data.get(field) or not str(data[field]).strip():
+            raise ValueError(f'Field {field} is required')
+
+    values = {field: str(data[field]).strip() for field in REQUIRED_FIELDS}
+    try:
+        values['date_of_birth'] = datetime.strptime(values['date_of_birth'], '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError('Field date_of_birth must be a date (YYYY-MM-DD)')
+    for field, convert in (('family_members_count', int), ('monthly_income', float), ('category_id', int)):
+        try:
+            values[field] = convert(values[field])
+        except ValueError:
+            raise ValueError(f'Field {field} must be a number')
+    return values
+
+# Columns shown in the admin list tables
+SUMMARY_FIELDS = ('id', 'reference_number', 'full_name', 'category_name', 'district', 'status', 'created_at')
+
+def application_field_columns():
+    """Output field name -> column expression for every field in to_dict()"""
+    from .category import Category
+
+    columns = {column.key: column for column in Application.__table__.columns}
+    columns['category_name'] = Category.name
+    return columns
+
+def parse_fields(value):
+    """Parse a ``fields=`` parameter into a tuple of field names.
+
+    Returns None when absent (full records); ``summary`` selects the admin
+    list columns. Raises ValueError for unknown fields.
+    """
+    if not value:
+        return None
+    if value == 'summary':
+        return SUMMARY_FIELDS
+
+    fields = tuple(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+    unknown = [name for name in fields if name not in application_field_columns()]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+def select_application_fields(fields, extra=()):
+    """Query selecting only the given fields (plus ``extra``) as labelled row tuples.
+
+    The category name comes from an outer join in the same query rather than
+    a lazy load per row.
+    """
+    from .category import Category
+
+    columns = application_field_columns()
+    names = tuple(dict.fromkeys(fields + tuple(extra)))
+    query = db.session.query(*[columns[name].label(name) for name in names]).select_from(Application)
+    if 'category_name' in names:
+        query = query.outerjoin(Category, Application.category_id == Category.id)
+    return query
+
+# Default order of the admin listing, newest first; unique, so keyset
+# cursors can seek on it
+LISTING_ORDER = (Application.created_at, Application.id)
+
+def listing_query(fields=None, extra=()):
+    """Base query of the admin listing: the selected fields, or full records
+    with their category loaded in the same query
+    """
+    from sqlalchemy.orm import joinedload
+
+    if fields:
+        return select_application_fields(fields, extra=extra)
+    return Application.query.options(joinedload(Application.category))
+
+# Query parameters that narrow the admin listing (q is the full-text
+# search, applied by the caller); the bulk status update accepts the same
+LISTING_FILTERS = ('status', 'district', 'division', 'category_id', 'q')
+
+def filter_applications(query, args):
+    """Apply the admin listing filters (status, district, division, category_id)"""
+    status = args.get('status')
+    district = args.get('district')
+    division = args.get('division')
+    category_id = args.get('category_id', type=int)
+    
+    if status:
+        query = query.filter(Application.status == status)
+    if district:
+        query = query.filter(Application.district == district)
+    if division:
+        query = query.filter(Application.division == division)
+    if category_id:
+        query = query.filter(Application.category_id == category_id)
+    return query
+
+def serialize_row(row, fields):
+    """Serialize a row tuple from select_application_fields like to_dict()
+
+    Dates are passed through as they are; the app's JSON provider writes
+    them as ISO 8601, the same strings to_dict() produces.
+    """
+    mapping = row._mapping
+    return {name: mapping[name] for name in fields}
@@ -0,0 +1,26 @@
+from . import db
+from sqlalchemy import text
+
+# Application counts rolled up by (day, category, district, division, status),
+# kept in step with the application table by services/stats.py
+class ApplicationStat(db.Model):
+    day = db.Column(db.Date, primary_key=True)  # date(created_at), UTC
+    category_id = db.Column(db.Integer, primary_key=True)
+    district = db.Column(db.String(100), primary_key=True)
+    division = db.Column(db.String(100), primary_key=True)
+    status = db.Column(db.String(20), primary_key=True)
+    count = db.Column(db.Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f'<ApplicationStat {self.day} {self.category_id} {self.district} {self.status}={self.count}>'
+
+def rebuild_application_stats(connection):
+    """Recompute the rollup from the application table; returns the row count"""
+    connection.execute(text('DELETE FROM application_stat'))
+    result = connection.execute(text(
+        "INSERT INTO application_stat (day, category_id, district, division, status, count) "
+        "SELECT date(created_at), category_id, district, division, COALESCE(status, 'Pending'), COUNT(*) "
+        "FROM application WHERE created_at IS NOT NULL "
+        "GROUP BY date(created_at), category_id, district, division, COALESCE(status, 'Pending')"
+    ))
+    return result.rowcount
@@ -0,0 +1,13 @@
+from . import db
+from datetime import datetime
+
+# A counter per cached collection, bumped in the same transaction as the
+# rows it covers (see services/cache_coherence.py); reading it is one primary key
+# lookup, so clients can revalidate without the collection being queried
+class CacheVersion(db.Model):
+    namespace = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f'<CacheVersion {self.namespace}={self.version}>'
@@ -0,0 +1,80 @@
+from . import db
+from datetime import datetime
+import json
+
+# Blocking keys for duplicate detection: applications sharing a (kind, value)
+# are compared with each other (see services/dedupe.py)
+class ApplicationBlockKey(db.Model):
+    kind = db.Column(db.String(20), primary_key=True)  # nid, mobile, name
+    value = db.Column(db.String(255), primary_key=True)
+    application_id = db.Column(db.Integer, db.ForeignKey('application.id'), primary_key=True)
+
+    __table_args__ = (
+        db.Index('ix_application_block_key_application_id', 'application_id'),
+    )
+
+    def __repr__(self):
+        return f'<ApplicationBlockKey {self.kind}={self.value} #{self.application_id}>'
+
+# A scored pair of possibly duplicate applications awaiting admin review
+class DuplicateCandidate(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    application_id = db.Column(db.Integer, db.ForeignKey('application.id'), nullable=False)  # The newer application
+    duplicate_of_id = db.Column(db.Integer, db.ForeignKey('application.id'), nullable=False)  # The older one
+    score = db.Column(db.Float, nullable=False)
+    reasons = db.Column(db.Text)  # JSON list of matched fields
+    status = db.Column(db.String(20), default='pending', nullable=False)  # pending, confirmed, dismissed
+    reviewed_by = db.Column(db.String(120))
+    reviewed_at = db.Column(db.DateTime)
+
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    application = db.relationship('Application', foreign_keys=[application_id])
+    duplicate_of = db.relationship('Application', foreign_keys=[duplicate_of_id])
+
+    __table_args__ = (
+        db.UniqueConstraint('application_id', 'duplicate_of_id', name='uq_duplicate_candidate_pair'),
+        db.Index('ix_duplicate_candidate_status_score', 'status', 'score'),
+        db.Index('ix_duplicate_candidate_duplicate_of_id', 'duplicate_of_id'),
+    )
+
+    def __repr__(self):
+        return f'<DuplicateCandidate {self.application_id}~{self.duplicate_of_id} {self.score:.2f}>'
+
+    def to_dict(self, include_applications=False):
+        data = {
+            'id': self.id,
+            'application_id': self.application_id,
+            'duplicate_of_id': self.duplicate_of_id,
+            'score': round(self.score, 3),
+            'reasons': json.loads(self.reasons) if self.reasons else [],
+            'status': self.status,
+            'reviewed_by': self.reviewed_by,
+            'reviewed_at': self.reviewed_at.isoformat() if self.reviewed_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+        if include_applications:
+            data['application'] = _review_fields(self.application)
+            data['duplicate_of'] = _review_fields(self.duplicate_of)
+        return data
+
+def _review_fields(application):
+    """The fields an admin compares when reviewing a pair"""
+    if application is None:
+        return None
+    return {
+        'id': application.id,
+        'reference_number': application.reference_number,
+        'full_name': application.full_name,
+        'father_name': application.father_name,
+        'nid_number': application.nid_number,
+        'mobile_number': application.mobile_number,
+        'date_of_birth': application.date_of_birth.isoformat() if application.date_of_birth else None,
+        'village': application.village,
+        'district': application.district,
+        'status': application.status,
+        'created_at': application.created_at.isoformat() if application.created_at else None
+    }
@@ -0,0 +1,93 @@
+from flask import has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+# Applied to every SQLite connection when it is opened
+DEFAULT_SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',          # readers don't block the writer (persists in the file)
+    'synchronous': 'NORMAL',        # fsync at checkpoints only; safe with WAL
+    'busy_timeout': 5000,           # ms to wait for a lock instead of failing
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64000,           # negative = KiB, i.e. 64 MB per connection
+    'temp_store': 'MEMORY',
+}
+
+READ_BIND = 'read'
+READ_METHODS = {'GET', 'HEAD'}
+
+def is_file_sqlite(url):
+    """True for a file-backed SQLite URL (not :memory:)"""
+    url = make_url(url)
+    return url.get_backend_name() == 'sqlite' and url.database not in (None, '', ':memory:')
+
+def apply_sqlite_pragmas(engine, pragmas, read_only=False):
+    """Run the given PRAGMAs on each new connection of an engine"""
+    pragmas = dict(pragmas)
+    if read_only:
+        # Switching journal mode needs a write; the writer has done it already
+        pragmas.pop('journal_mode', None)
+        pragmas['query_only'] = 'ON'
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+
+def configure_database(app, db):
+    """Initialize the database with the engine profile from the app config.
+
+    For file-backed SQLite the default bind becomes a small write pool (one
+    connection by default, so writers queue in-process rather than fighting
+    over the file lock) and a ``read`` bind gets its own pool of query-only
+    connections used by GET/HEAD requests. Other databases are left as-is.
+    """
+    url = app.config['SQLALCHEMY_DATABASE_URI']
+    sqlite = is_file_sqlite(url)
+
+    if sqlite:
+        app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {
+            'pool_size': app.config.get('SQLITE_WRITE_POOL_SIZE', 1),
+            'max_overflow': 0,
+            'pool_timeout': 30,
+        })
+        binds = app.config.setdefault('SQLALCHEMY_BINDS', {})
+        binds.setdefault(READ_BIND, {
+            'url': url,
+            'pool_size': app.config.get('SQLITE_READ_POOL_SIZE', 8),
+            'max_overflow': app.config.get('SQLITE_READ_POOL_SIZE', 8),
+            'pool_timeout': 30,
+        })
+
+    db.init_app(app)
+
+    if sqlite:
+        pragmas = app.config.get('SQLITE_PRAGMAS', DEFAULT_SQLITE_PRAGMAS)
+        with app.app_context():
+            apply_sqlite_pragmas(db.engines[None], pragmas)
+            apply_sqlite_pragmas(db.engines[READ_BIND], pragmas, read_only=True)
+
+class RoutingSession(Session):
+    """Session that sends reads during GET/HEAD requests to the read pool.
+
+    Flushes and any non-SELECT statement still go to the write engine, so a
+    GET handler that does write keeps working.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and self._use_read_bind(clause):
+            engine = self._db.engines.get(READ_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _use_read_bind(self, clause):
+        if not has_request_context() or request.method not in READ_METHODS:
+            return False
+        # Only statements known to be SELECTs; session.connection() and other
+        # clause-less calls may be used to write
+        return clause is not None and getattr(clause, 'is_select', False)
@@ -0,0 +1,20 @@
+from . import db
+from datetime import datetime
+
+# 64-bit perceptual hash of an uploaded image, split into four 16-bit bands
+# that are indexed separately for multi-index Hamming search
+# (see services/image_hash.py)
+class ImageHash(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    path = db.Column(db.String(255), unique=True, nullable=False)  # Relative upload path
+    hash = db.Column(db.BigInteger, nullable=False)  # dHash stored as a signed 64-bit integer
+    band_0 = db.Column(db.Integer, nullable=False, index=True)
+    band_1 = db.Column(db.Integer, nullable=False, index=True)
+    band_2 = db.Column(db.Integer, nullable=False, index=True)
+    band_3 = db.Column(db.Integer, nullable=False, index=True)
+
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ImageHash {self.path} {self.hash & 0xFFFFFFFFFFFFFFFF:016x}>'
@@ -0,0 +1,232 @@
+import re
+from datetime import datetime
+from sqlalchemy import text, select, func, tuple_
+from sqlalchemy.exc import IntegrityError
+from . import db
+
+# Registered migrations as (version, name, function), applied in version order
+MIGRATIONS = []
+
+def migration(version, name):
+    """Register a function as a schema migration.
+
+    Migrations receive a connection inside a transaction. They run after
+    ``create_all`` has created any missing tables, so they must be idempotent
+    (``CREATE INDEX IF NOT EXISTS`` and friends): on a fresh database the
+    objects they add may already exist from the model definitions.
+    """
+    def decorator(func):
+        if any(existing == version for existing, _, _ in MIGRATIONS):
+            raise ValueError(f'Duplicate migration version: {version}')
+        MIGRATIONS.append((version, name, func))
+        MIGRATIONS.sort(key=lambda entry: entry[0])
+        return func
+    return decorator
+
+def _ensure_version_table(connection):
+    connection.execute(text(
+        'CREATE TABLE IF NOT EXISTS schema_version ('
+        'version INTEGER PRIMARY KEY, '
+        'name VARCHAR(200) NOT NULL, '
+        'applied_at DATETIME NOT NULL)'
+    ))
+
+def applied_versions(connection):
+    """Versions already recorded in schema_version"""
+    _ensure_version_table(connection)
+    return {row[0] for row in connection.execute(text('SELECT version FROM schema_version'))}
+
+def pending_migrations(connection):
+    """Registered migrations not yet applied"""
+    applied = applied_versions(connection)
+    return [entry for entry in MIGRATIONS if entry[0] not in applied]
+
+def upgrade_database(app):
+    """Create missing tables and apply pending migrations; returns applied names"""
+    applied = []
+    with app.app_context():
+        db.create_all()
+        engine = db.engine
+
+        with engine.begin() as connection:
+            _ensure_version_table(connection)
+
+        for version, name, func in MIGRATIONS:
+            # One transaction per migration; a concurrent runner that got there
+            # first makes the version insert fail and this one roll back
+            try:
+                with engine.begin() as connection:
+                    if version in applied_versions(connection):
+                        continue
+                    func(connection)
+                    connection.execute(
+                        text('INSERT INTO schema_version (version, name, applied_at) VALUES (:version, :name, :applied_at)'),
+                        {'version': version, 'name': name, 'applied_at': datetime.utcnow()}
+                    )
+            except IntegrityError:
+                continue
+            applied.append(f'{version:04d} {name}')
+    return applied
+
+@migration(1, 'application lookup and listing indexes')
+def add_application_indexes(connection):
+    statements = [
+        'CREATE INDEX IF NOT EXISTS ix_application_created_at ON application (created_at)',
+        'CREATE INDEX IF NOT EXISTS ix_application_status_created_at ON application (status, created_at)',
+        'CREATE INDEX IF NOT EXISTS ix_application_district_created_at ON application (district, created_at)',
+        'CREATE INDEX IF NOT EXISTS ix_application_division_created_at ON application (division, created_at)',
+        'CREATE INDEX IF NOT EXISTS ix_application_category_created_at ON application (category_id, created_at)',
+        'CREATE INDEX IF NOT EXISTS ix_application_category_status_created_at ON application (category_id, status, created_at)',
+        'CREATE INDEX IF NOT EXISTS ix_application_nid_number ON application (nid_number)',
+        'CREATE INDEX IF NOT EXISTS ix_application_mobile_number ON application (mobile_number)',
+    ]
+    for statement in statements:
+        connection.execute(text(statement))
+
+@migration(2, 'backfill application_stat rollup')
+def backfill_application_stats(connection):
+    from .application_stat import rebuild_application_stats
+    rebuild_application_stats(connection)
+
+@migration(3, 'application full-text search index')
+def add_application_fts(connection):
+    # FTS5 is SQLite-only; other databases go without the search index
+    if connection.dialect.name != 'sqlite':
+        return
+
+    columns = 'full_name, father_name, mother_name, village, upazila, reference_number, nid_number, mobile_number'
+    new_values = ', '.join(f'new.{name.strip()}' for name in columns.split(','))
+    old_values = ', '.join(f'old.{name.strip()}' for name in columns.split(','))
+
+    # External content: the index stores tokens only and reads rows from application
+    connection.execute(text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS application_fts USING fts5("
+        f"{columns}, content='application', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    ))
+    connection.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS application_fts_insert AFTER INSERT ON application BEGIN "
+        f"INSERT INTO application_fts(rowid, {columns}) VALUES (new.id, {new_values}); END"
+    ))
+    connection.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS application_fts_delete AFTER DELETE ON application BEGIN "
+        f"INSERT INTO application_fts(application_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"
+    ))
+    connection.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS application_fts_update AFTER UPDATE OF {columns} ON application BEGIN "
+        f"INSERT INTO application_fts(application_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO application_fts(rowid, {columns}) VALUES (new.id, {new_values}); END"
+    ))
+    connection.execute(text("INSERT INTO application_fts(application_fts) VALUES ('rebuild')"))
+
+@migration(4, 'phonetic name index for fuzzy search')
+def add_application_name_index(connection):
+    if connection.dialect.name != 'sqlite':
+        return
+    from src.services.fuzzy_search import index_application_names
+
+    # Phonetic keys are computed in Python, so rows are indexed by the ORM
+    # events in fuzzy_search rather than SQL triggers
+    connection.execute(text(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS application_name_fts USING fts5("
+        "full_name, father_name, mother_name, tokenize='unicode61')"
+    ))
+    connection.execute(text('DELETE FROM application_name_fts'))
+
+    last_id = 0
+    while True:
+        rows = connection.execute(text(
+            'SELECT id, full_name, father_name, mother_name FROM application '
+            'WHERE id > :last_id ORDER BY id LIMIT 1000'
+        ), {'last_id': last_id}).fetchall()
+        if not rows:
+            break
+        index_application_names(connection, rows)
+        last_id = rows[-1][0]
+
+@migration(5, 'blocking keys for duplicate detection')
+def add_application_block_keys(connection):
+    from src.services.dedupe import DEDUPE_COLUMNS, index_block_keys
+
+    # Only the key index is backfilled; scoring existing pairs is left to
+    # `python manage.py dedupe`, which can take a while on a large table
+    connection.execute(text('DELETE FROM application_block_key'))
+    columns = ', '.join(DEDUPE_COLUMNS)
+    last_id = 0
+    while True:
+        rows = connection.execute(text(
+            f'SELECT {columns} FROM application WHERE id > :last_id ORDER BY id LIMIT 1000'
+        ), {'last_id': last_id}).fetchall()
+        if not rows:
+            break
+        index_block_keys(connection, rows)
+        last_id = rows[-1].id
+
+@migration(6, 'upload path indexes for image matching')
+def add_upload_path_indexes(connection):
+    # Image hashes are computed from the files, so existing uploads are
+    # hashed by `python manage.py hash-images` rather than here
+    statements = [
+        'CREATE INDEX IF NOT EXISTS ix_application_photo_path ON application (photo_path)',
+        'CREATE INDEX IF NOT EXISTS ix_application_signature_path ON application (signature_path)',
+        'CREATE INDEX IF NOT EXISTS ix_application_nid_image_path ON application (nid_image_path)',
+    ]
+    for statement in statements:
+        connection.execute(text(statement))
+
+def hot_queries():
+    """The queries behind the admin listing, stats and tracking endpoints.
+
+    Listings are built like ``GET /applications`` builds them (same filters,
+    category eager load and keyset order), so the plans checked are the
+    plans served.
+    """
+    from werkzeug.datastructures import MultiDict
+    from .application import Application, LISTING_ORDER, listing_query, filter_applications
+
+    def listing(after=None, **filters):
+        query = filter_applications(listing_query(), MultiDict(filters))
+        if after:
+            query = query.filter(tuple_(*LISTING_ORDER) < tuple_(*after))
+        return query.order_by(*[column.desc() for column in LISTING_ORDER]).limit(10).statement
+
+    def count(**filters):
+        # What cached_count runs: Query.count() leaves out the eager load
+        query = filter_applications(listing_query(), MultiDict(filters)).enable_eagerloads(False)
+        return select(func.count()).select_from(query.subquery())
+
+    cursor = (datetime(2025, 1, 1), 1000)
+    return [
+        ('list newest', listing()),
+        ('list after cursor', listing(after=cursor)),
+        ('list by status after cursor', listing(after=cursor, status='Pending')),
+        ('list by status', listing(status='Pending')),
+        ('list by district', listing(district='Dhaka')),
+        ('list by division', listing(division='Dhaka')),
+        ('list by category', listing(category_id='1')),
+        ('list by category and status', listing(category_id='1', status='Pending')),
+        ('list by status and district', listing(status='Pending', district='Dhaka')),
+        ('count by status', count(status='Pending')),
+        ('count by district', count(district='Dhaka')),
+        ('count by category', count(category_id='1')),
+        ('track by reference', select(Application).where(Application.reference_number == 'SBS20250101ABCDEF12')),
+        ('track by NID', select(Application).where(Application.nid_number == '1990123456789')),
+        ('lookup by mobile', select(Application).where(Application.mobile_number == '01700000000')),
+        ('lookup by photo', select(Application).where(Application.photo_path == 'objects/ab/cd/abcd.jpg')),
+    ]
+
+# "SCAN application" without "USING ... INDEX" means reading every row
+_FULL_SCAN = re.compile(r'^SCAN \w+(?: AS \w+)?$')
+
+def check_query_plans(connection, queries=None):
+    """Run EXPLAIN QUERY PLAN on each hot query.
+
+    Returns a list of (name, plan lines, is_full_scan).
+    """
+    results = []
+    for name, statement in queries or hot_queries():
+        sql = str(statement.compile(dialect=connection.dialect, compile_kwargs={'literal_binds': True}))
+        plan = [row[-1] for row in connection.execute(text(f'EXPLAIN QUERY PLAN {sql}'))]
+        full_scan = any(_FULL_SCAN.match(line) for line in plan)
+        results.append((name, plan, full_scan))
+    return results
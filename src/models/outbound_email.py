@@ -0,0 +1,47 @@
+from . import db
+from datetime import datetime
+
+# Durable outbox: one row per message waiting for (or done with) SMTP delivery
+# (see services/mail_delivery.py)
+class OutboundEmail(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    sender = db.Column(db.String(120), nullable=False)
+    recipient = db.Column(db.String(120), nullable=False)
+    subject = db.Column(db.String(255))
+    message = db.Column(db.LargeBinary, nullable=False)  # The complete RFC 5322 message
+
+    # Delivery State
+    status = db.Column(db.String(20), default='queued', nullable=False)  # queued, sending, sent, dead
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    max_attempts = db.Column(db.Integer, default=8, nullable=False)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    locked_by = db.Column(db.String(100))
+    locked_at = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index('ix_outbound_email_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+
+    def __repr__(self):
+        return f'<OutboundEmail {self.id} {self.recipient} {self.status}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'sender': self.sender,
+            'recipient': self.recipient,
+            'subject': self.subject,
+            'size': len(self.message) if self.message else 0,
+            'status': self.status,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'next_attempt_at': self.next_attempt_at.isoformat() if self.next_attempt_at else None,
+            'last_error': self.last_error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'sent_at': self.sent_at.isoformat() if self.sent_at else None
+        }
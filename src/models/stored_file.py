@@ -0,0 +1,27 @@
+from . import db
+from datetime import datetime
+
+class StoredFile(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    path = db.Column(db.String(255), unique=True, nullable=False)  # objects/ab/cd/<sha256>.<ext>
+    sha256 = db.Column(db.String(64), nullable=False, index=True)
+    size = db.Column(db.Integer, nullable=False)
+    refcount = db.Column(db.Integer, default=0, nullable=False)
+
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<StoredFile {self.path} refs={self.refcount}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'path': self.path,
+            'sha256': self.sha256,
+            'size': self.size,
+            'refcount': self.refcount,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
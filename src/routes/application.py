@@ -1,34 +1,36 @@
-from flask import Blueprint, request, jsonify, current_app
-from werkzeug.utils import secure_filename
+from flask import Blueprint, request, jsonify, current_app, send_file, Response, stream_with_context
 from datetime import datetime
 import os
+import io
 import json
+import zipfile
+from sqlalchemy.orm import joinedload
+from werkzeug.datastructures import MultiDict
 from src.models import db, Application, Category
-from src.services import PDFGenerator, EmailService
+from src.models.application import (
+    parse_fields, select_application_fields, serialize_row, application_field_columns, clean_application_data,
+    listing_query, filter_applications, APPLICATION_STATUSES, LISTING_FILTERS, LISTING_ORDER
+)
+from src.services import (
+    JobQueue, StatsRollup, FuzzyNameSearch, DedupeEngine, ImageHashIndex, ApplicationImporter, BulkStatusUpdate,
+    get_pdf_cache
+)
+from src.services.fuzzy_search import NAME_FIELDS
+from src.services.image_processing import resolve_image
+from src.services.uploads import process_upload, register_uploads
+from src.services.storage import resolve_upload
+from src.services.pagination import keyset_paginate, cached_count
+from src.services.search import ranked_matches
+from src.services.data_export import stream_csv, stream_ndjson
+from src.services.http_cache import get_version, make_etag, not_modified, with_validators
+from src.services.lookup_cache import CachedResponse, get_lookup_cache
+from src.services.cache_coherence import coherence
 
 application_bp = Blueprint('application', __name__)
 
-ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'pdf', 'doc', 'docx'}
-
-def allowed_file(filename):
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
-
 def save_uploaded_file(file, folder):
-    """Save uploaded file and return the file path"""
-    if file and allowed_file(file.filename):
-        filename = secure_filename(file.filename)
-        # Add timestamp to avoid filename conflicts
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_')
-        filename = timestamp + filename
-        
-        upload_path = os.path.join(current_app.config['UPLOAD_FOLDER'], folder)
-        os.makedirs(upload_path, exist_ok=True)
-        
-        file_path = os.path.join(upload_path, filename)
-        file.save(file_path)
-        return os.path.join(folder, filename)
-    return None
+    """Store an uploaded file on disk; returns a ProcessedUpload or None"""
+    return process_upload(current_app.config['UPLOAD_FOLDER'], file, folder)
 
 @application_bp.route('/applications', methods=['POST'])
 def submit_application():
@@ -37,105 +39,77 @@ def submit_application():
         # Get form data
         data = request.form.to_dict()
         
-        # Validate required fields
-        required_fields = [
-            'full_name', 'father_name', 'mother_name', 'nid_number',
-            'date_of_birth', 'occupation', 'village', 'upazila',
-            'district', 'division', 'family_members_count',
-            'monthly_income', 'main_earner_occupation', 'email',
-            'mobile_number', 'category_id'
-        ]
-        
-        for field in required_fields:
-            if not data.get(field):
-                return jsonify({
-                    'success': False,
-                    'message': f'Field {field} is required'
-                }), 400
+        # Validate required fields and value formats
+        try:
+            values = clean_application_data(data)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
         
         # Validate category exists
-        category = Category.query.get(data['category_id'])
+        category = Category.query.get(values['category_id'])
         if not category or not category.is_active:
             return jsonify({
                 'success': False,
                 'message': 'Invalid category selected'
             }), 400
         
-        # Handle file uploads
-        photo_path = None
-        signature_path = None
-        nid_image_path = None
+        # Handle file uploads. Every file is processed before the first
+        # write so the database lock is only held for the inserts below
+        uploads = {}
         other_documents = []
         
-        if 'photo' in request.files:
-            photo_path = save_uploaded_file(request.files['photo'], 'photos')
-        
-        if 'signature' in request.files:
-            signature_path = save_uploaded_file(request.files['signature'], 'signatures')
-        
-        if 'nid_image' in request.files:
-            nid_image_path = save_uploaded_file(request.files['nid_image'], 'nid_images')
+        for field, folder in (('photo', 'photos'), ('signature', 'signatures'), ('nid_image', 'nid_images')):
+            if field in request.files:
+                uploads[field] = save_uploaded_file(request.files[field], folder)
         
         # Handle multiple other documents
         if 'other_documents' in request.files:
             files = request.files.getlist('other_documents')
             for file in files:
                 if file and file.filename:
-                    doc_path = save_uploaded_file(file, 'documents')
-                    if doc_path:
-                        other_documents.append({
-                            'filename': file.filename,
-                            'path': doc_path
-                        })
+                    upload = save_uploaded_file(file, 'documents')
+                    if upload:
+                        other_documents.append((file.filename, upload))
+        
+        def upload_path(field):
+            upload = uploads.get(field)
+            return upload.path if upload else None
         
         # Create application
         application = Application(
-            full_name=data['full_name'],
-            father_name=data['father_name'],
-            mother_name=data['mother_name'],
-            nid_number=data['nid_number'],
-            date_of_birth=datetime.strptime(data['date_of_birth'], '%Y-%m-%d').date(),
-            occupation=data['occupation'],
-            village=data['village'],
-            upazila=data['upazila'],
-            district=data['district'],
-            division=data['division'],
-            family_members_count=int(data['family_members_count']),
-            monthly_income=float(data['monthly_income']),
-            main_earner_occupation=data['main_earner_occupation'],
-            email=data['email'],
-            mobile_number=data['mobile_number'],
-            category_id=int(data['category_id']),
-            photo_path=photo_path,
-            signature_path=signature_path,
-            nid_image_path=nid_image_path,
-            other_documents_path=json.dumps(other_documents) if other_documents else None
+            **values,
+            photo_path=upload_path('photo'),
+            signature_path=upload_path('signature'),
+            nid_image_path=upload_path('nid_image'),
+            other_documents_path=json.dumps([
+                {'filename': filename, 'path': upload.path} for filename, upload in other_documents
+            ]) if other_documents else None
         )
         
+        register_uploads(current_app.config['UPLOAD_FOLDER'], list(uploads.values()) + [upload for _, upload in other_documents])
         db.session.add(application)
-        db.session.commit()
+        db.session.flush()
         
-        # Generate and send PDF email
-        try:
-            pdf_generator = PDFGenerator(current_app.config['UPLOAD_FOLDER'])
-            email_service = EmailService()
-            
-            # Generate PDF bytes
-            pdf_bytes = pdf_generator.generate_pdf_bytes(application)
-            
-            if pdf_bytes:
-                # Send email with PDF attachment
-                email_service.send_application_confirmation(application, pdf_bytes)
-        except Exception as e:
-            print(f"Error sending confirmation email: {str(e)}")
-            # Don't fail the application submission if email fails
+        # Dashboard rollup counts commit together with the row
+        StatsRollup().record_submission(application)
+        
+        # Index the blocking keys and queue likely duplicates for admin review
+        DedupeEngine().check(application)
+        
+        # Render the PDF and send the confirmation email in a background worker
+        job = JobQueue().enqueue('application_confirmation', {'application_id': application.id})
+        db.session.commit()
         
         return jsonify({
             'success': True,
             'message': 'Application submitted successfully',
             'data': {
                 'reference_number': application.reference_number,
-                'application_id': application.id
+                'application_id': application.id,
+                'job_id': job.id
             }
         }), 201
         
@@ -146,22 +120,173 @@ def submit_application():
             'message': f'Error submitting application: {str(e)}'
         }), 500
 
+@application_bp.route('/applications/import', methods=['POST'])
+def import_applications():
+    """Bulk import applications from a CSV and optional ZIP of scans (Admin only)"""
+    try:
+        # Imports carry far more than a single form upload
+        request.max_content_length = current_app.config['IMPORT_MAX_CONTENT_LENGTH']
+        
+        csv_file = request.files.get('file')
+        if not csv_file or not csv_file.filename:
+            return jsonify({
+                'success': False,
+                'message': 'A CSV file is required'
+            }), 400
+        
+        archive = None
+        if request.files.get('archive') and request.files['archive'].filename:
+            try:
+                archive = zipfile.ZipFile(request.files['archive'].stream)
+            except zipfile.BadZipFile:
+                return jsonify({
+                    'success': False,
+                    'message': 'The archive is not a valid ZIP file'
+                }), 400
+        
+        importer = ApplicationImporter(current_app.config['UPLOAD_FOLDER'])
+        report = importer.run(
+            io.TextIOWrapper(csv_file.stream, encoding='utf-8-sig', newline=''),
+            archive=archive,
+            dry_run=request.form.get('dry_run') == '1'
+        )
+        
+        return jsonify({
+            'success': True,
+            'message': f'Imported {report.imported} of {report.total} application(s)',
+            'data': report.to_dict()
+        })
+        
+    except (ValueError, UnicodeDecodeError) as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': f'Error importing applications: {str(e)}'
+        }), 500
+
+@application_bp.route('/applications/<int:application_id>/files/<kind>', methods=['GET'])
+def get_application_file(application_id, kind):
+    """Serve an uploaded file, optionally as an image derivative"""
+    try:
+        columns = {
+            'photo': ('photo_path', 'photos'),
+            'signature': ('signature_path', 'signatures'),
+            'nid_image': ('nid_image_path', 'nid_images'),
+            'document': ('other_documents_path', 'documents')
+        }
+        if kind not in columns:
+            return jsonify({
+                'success': False,
+                'message': 'Invalid file type. Must be one of: photo, signature, nid_image, document'
+            }), 400
+        
+        application = Application.query.get_or_404(application_id)
+        variant = request.args.get('variant', 'original')
+        column, folder = columns[kind]
+        relative_path = getattr(application, column)
+        download_name = None
+        
+        # Other documents are a JSON list; pick one by ?index=
+        if kind == 'document':
+            documents = json.loads(relative_path) if relative_path else []
+            index = request.args.get('index', 0, type=int)
+            if index < 0 or index >= len(documents):
+                return jsonify({
+                    'success': False,
+                    'message': 'File not found'
+                }), 404
+            relative_path = documents[index].get('path')
+            download_name = documents[index].get('filename')
+        
+        upload_folder = current_app.config['UPLOAD_FOLDER']
+        if variant == 'original':
+            file_path = resolve_upload(upload_folder, relative_path)
+        else:
+            file_path = resolve_image(upload_folder, relative_path, folder, variant)
+        
+        if not file_path or not os.path.exists(file_path):
+            return jsonify({
+                'success': False,
+                'message': 'File not found'
+            }), 404
+        
+        return send_file(file_path, max_age=86400, download_name=download_name)
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error fetching file: {str(e)}'
+        }), 500
+
+@application_bp.route('/applications/<int:application_id>/similar-images', methods=['GET'])
+def get_similar_images(application_id):
+    """Find other applications reusing this one's photo, signature or NID scan (Admin only)"""
+    try:
+        application = Application.query.get_or_404(application_id)
+        threshold = request.args.get('threshold', 6, type=int)
+        
+        return jsonify({
+            'success': True,
+            'data': ImageHashIndex().similar_applications(application, threshold=threshold),
+            'threshold': threshold
+        })
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error finding similar images: {str(e)}'
+        }), 500
+
 @application_bp.route('/applications/<reference_number>', methods=['GET'])
 def get_application_by_reference(reference_number):
     """Get application by reference number"""
     try:
-        application = Application.query.filter_by(reference_number=reference_number).first()
-        
-        if not application:
+        # Served from the lookup cache until a write to this application
+        lookups = get_lookup_cache()
+        key = ('application', reference_number)
+        cached = lookups.get(key)
+        if cached:
+            return not_modified(cached.etag, cached.last_modified) or with_validators(
+                current_app.response_class(cached.body, mimetype='application/json'),
+                cached.etag, cached.last_modified
+            )
+        generation = lookups.generation
+        
+        # Validate against updated_at (and the category names it shows)
+        # before loading and serializing the application
+        row = db.session.query(Application.id, Application.updated_at).filter_by(reference_number=reference_number).first()
+        
+        if not row:
             return jsonify({
                 'success': False,
                 'message': 'Application not found'
             }), 404
         
-        return jsonify({
+        categories_version, categories_updated_at = get_version('categories')
+        etag = make_etag('application', row.id, row.updated_at, categories_version)
+        last_modified = max(filter(None, (row.updated_at, categories_updated_at)), default=None)
+        cached = not_modified(etag, last_modified)
+        if cached:
+            return cached
+        
+        application = db.session.get(Application, row.id)
+        response = jsonify({
             'success': True,
             'data': application.to_dict()
         })
+        lookups.put(key, CachedResponse(response.get_data(), etag, last_modified), [row.id], generation=generation)
+        return with_validators(response, etag, last_modified)
         
     except Exception as e:
         return jsonify({
@@ -183,11 +308,30 @@ def track_application():
                 'message': 'Either reference number or NID number is required'
             }), 400
         
-        query = Application.query
+        fields = parse_fields(request.args.get('fields'))
+        
+        # Applicants poll this; repeat lookups are answered with the stored body
+        lookups = get_lookup_cache()
         if reference_number:
-            query = query.filter_by(reference_number=reference_number)
+            key = ('track', 'reference', reference_number, fields)
+        else:
+            key = ('track', 'nid', nid_number, fields)
+        cached = lookups.get(key)
+        if cached:
+            return current_app.response_class(cached.body, mimetype='application/json')
+        generation = lookups.generation
+        
+        if fields:
+            query = select_application_fields(fields, extra=('id',))
+            serialize = lambda row: serialize_row(row, fields)
+        else:
+            query = Application.query.options(joinedload(Application.category))
+            serialize = lambda app: app.to_dict()
+        
+        if reference_number:
+            query = query.filter(Application.reference_number == reference_number)
         elif nid_number:
-            query = query.filter_by(nid_number=nid_number)
+            query = query.filter(Application.nid_number == nid_number)
         
         applications = query.all()
         
@@ -197,11 +341,21 @@ def track_application():
                 'message': 'No applications found'
             }), 404
         
-        return jsonify({
+        response = jsonify({
             'success': True,
-            'data': [app.to_dict() for app in applications]
+            'data': [serialize(app) for app in applications]
         })
+        lookups.put(
+            key, CachedResponse(response.get_data(), None, None), [app.id for app in applications],
+            nid=None if reference_number else nid_number, generation=generation
+        )
+        return response
         
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -214,25 +368,98 @@ def get_applications():
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
-        status = request.args.get('status')
-        district = request.args.get('district')
-        division = request.args.get('division')
-        category_id = request.args.get('category_id', type=int)
         
-        query = Application.query
+        # ?fields= selects only those columns (category name joined in) as
+        # row tuples; without it full records are returned
+        fields = parse_fields(request.args.get('fields'))
+        fuzzy = request.args.get('search') == 'fuzzy'
+        # Fuzzy ranking compares against the names, so select them too
+        extra = ('id', 'created_at') + (NAME_FIELDS if fuzzy else ())
+        query = listing_query(fields, extra=extra)
+        if fields:
+            serialize = lambda row: serialize_row(row, fields)
+        else:
+            serialize = lambda app: app.to_dict()
         
         # Apply filters
-        if status:
-            query = query.filter_by(status=status)
-        if district:
-            query = query.filter_by(district=district)
-        if division:
-            query = query.filter_by(division=division)
-        if category_id:
-            query = query.filter_by(category_id=category_id)
-        
-        # Order by creation date (newest first)
-        query = query.order_by(Application.created_at.desc())
+        query = filter_applications(query, request.args)
+        
+        # ?search=fuzzy&q= matches names by phonetic key and ranks the
+        # candidates by similarity, so it pages by page number only.
+        # ?name_fields= widens it to father_name/mother_name.
+        if fuzzy:
+            name_fields = request.args.get('name_fields', 'full_name').split(',')
+            fuzzy_search = FuzzyNameSearch(fields=name_fields)
+            matches = fuzzy_search.search(
+                query, request.args.get('q', ''),
+                names=lambda item: tuple(getattr(item, name) for name in NAME_FIELDS)
+            )
+            total = len(matches)
+            start = (page - 1) * per_page
+            
+            return jsonify({
+                'success': True,
+                'data': [
+                    dict(serialize(item), similarity=round(score, 3))
+                    for item, score in matches[start:start + per_page]
+                ],
+                'pagination': {
+                    'page': page,
+                    'per_page': per_page,
+                    'total': total,
+                    # Only the best candidates are ranked; more names matched
+                    'total_truncated': fuzzy_search.truncated,
+                    'pages': (total + per_page - 1) // per_page,
+                    'has_next': start + per_page < total,
+                    'has_prev': page > 1
+                }
+            })
+        
+        # ?q= full-text search orders by relevance instead of date
+        ordering = 'newest'
+        order_columns = list(LISTING_ORDER)
+        key = None
+        search = ranked_matches(request.args.get('q', ''))
+        if search is not None:
+            query = query.join(search, search.c.rowid == Application.id).add_columns(search.c.score)
+            ordering = 'relevance'
+            order_columns = [search.c.score, Application.id]
+            if not fields:
+                serialize = lambda row: row.Application.to_dict()
+                key = lambda row: [row.score, row.Application.id]
+        
+        # Keyset mode (?cursor=, empty for the first page): newest (or best
+        # match) first with opaque tokens, constant time at any depth.
+        # Tokens are bound to the ordering and filters they were issued for.
+        if 'cursor' in request.args:
+            filters = tuple(sorted(
+                (name, value) for name, value in request.args.items()
+                if name in LISTING_FILTERS and value
+            ))
+            result = keyset_paginate(
+                query, order_columns,
+                cursor=request.args.get('cursor'), per_page=per_page, key=key,
+                ordering=ordering, filters=filters
+            )
+            
+            pagination = {
+                'per_page': per_page,
+                'next_cursor': result.next_cursor,
+                'prev_cursor': result.prev_cursor,
+                'has_next': result.has_next,
+                'has_prev': result.has_prev
+            }
+            if request.args.get('include_total') == '1':
+                pagination['total'] = cached_count(query, ('applications',) + filters)
+            
+            return jsonify({
+                'success': True,
+                'data': [serialize(item) for item in result.items],
+                'pagination': pagination
+            })
+        
+        # Order by creation date or relevance (best first)
+        query = query.order_by(*[column.desc() for column in order_columns])
         
         # Paginate
         pagination = query.paginate(
@@ -241,7 +468,7 @@ def get_applications():
         
         return jsonify({
             'success': True,
-            'data': [app.to_dict() for app in pagination.items],
+            'data': [serialize(item) for item in pagination.items],
             'pagination': {
                 'page': page,
                 'per_page': per_page,
@@ -252,12 +479,69 @@ def get_applications():
             }
         })
         
+    except ValueError as e:
+        # Bad or mismatched cursor token, or unknown field name
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
             'message': f'Error fetching applications: {str(e)}'
         }), 500
 
+@application_bp.route('/applications/export', methods=['GET'])
+def export_applications():
+    """Stream filtered applications as CSV or NDJSON (Admin only)"""
+    try:
+        export_format = request.args.get('format', 'csv')
+        if export_format not in ('csv', 'ndjson'):
+            return jsonify({
+                'success': False,
+                'message': 'Invalid format. Must be one of: csv, ndjson'
+            }), 400
+        
+        # Every to_dict() field unless ?fields= narrows it
+        fields = parse_fields(request.args.get('fields')) or tuple(application_field_columns())
+        query = filter_applications(select_application_fields(fields, extra=('id',)), request.args)
+        
+        search = ranked_matches(request.args.get('q', ''))
+        if search is not None:
+            query = query.join(search, search.c.rowid == Application.id)
+        
+        # Column tuples fetched in batches from a server-side cursor, so
+        # memory stays flat however many rows match
+        rows = (
+            tuple(getattr(row, name) for name in fields)
+            for row in query.order_by(Application.id).yield_per(1000)
+        )
+        
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        if export_format == 'csv':
+            body = stream_csv(rows, fields)
+            mimetype = 'text/csv'
+        else:
+            body = stream_ndjson(rows, fields)
+            mimetype = 'application/x-ndjson'
+        
+        return Response(
+            stream_with_context(body),
+            mimetype=mimetype,
+            headers={'Content-Disposition': f'attachment; filename=Applications_{timestamp}.{export_format}'}
+        )
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error exporting applications: {str(e)}'
+        }), 500
+
 @application_bp.route('/applications/<int:application_id>/status', methods=['PUT'])
 def update_application_status(application_id):
     """Update application status (Admin only)"""
@@ -266,24 +550,27 @@ def update_application_status(application_id):
         data = request.get_json()
         
         new_status = data.get('status')
-        if new_status not in ['Pending', 'Approved', 'Rejected', 'In Progress']:
+        if new_status not in APPLICATION_STATUSES:
             return jsonify({
                 'success': False,
-                'message': 'Invalid status. Must be one of: Pending, Approved, Rejected, In Progress'
+                'message': f"Invalid status. Must be one of: {', '.join(APPLICATION_STATUSES)}"
             }), 400
         
         old_status = application.status
         application.status = new_status
+        
+        # Queue the status update email and move the rollup count in the same transaction
+        if old_status != new_status:
+            StatsRollup().record_status_change(application, old_status, new_status)
+            JobQueue().enqueue('status_update', {
+                'application_id': application.id,
+                'old_status': old_status,
+                'new_status': new_status
+            })
         db.session.commit()
         
-        # Send status update email
-        try:
-            if old_status != new_status:
-                email_service = EmailService()
-                email_service.send_status_update(application, old_status, new_status)
-        except Exception as e:
-            print(f"Error sending status update email: {str(e)}")
-            # Don't fail the status update if email fails
+        # The letter is keyed on updated_at, so older renders are dead weight
+        get_pdf_cache().invalidate(application.id)
         
         return jsonify({
             'success': True,
@@ -298,52 +585,74 @@ def update_application_status(application_id):
             'message': f'Error updating application status: {str(e)}'
         }), 500
 
+@application_bp.route('/applications/status', methods=['PUT'])
+def bulk_update_application_status():
+    """Move many applications to one status in one transaction (Admin only)"""
+    try:
+        data = request.get_json() or {}
+        
+        # Either explicit ids or the listing filters (status, district,
+        # division, category_id, q) select the applications
+        ids = data.get('ids')
+        filters = data.get('filters')
+        query = None
+        if ids is not None:
+            if not isinstance(ids, list) or not all(isinstance(value, int) and not isinstance(value, bool) for value in ids):
+                raise ValueError('ids must be a list of integers')
+        elif filters is not None:
+            if not isinstance(filters, dict):
+                raise ValueError('filters must be an object')
+            unknown = [name for name in filters if name not in LISTING_FILTERS]
+            if unknown:
+                raise ValueError(f"Unknown filters: {', '.join(unknown)}")
+            filters = MultiDict({
+                name: str(value).strip() for name, value in filters.items() if value is not None and str(value).strip()
+            })
+            search = ranked_matches(filters.get('q', ''))
+            # An empty filter would move every application
+            if search is None and not filters.get('category_id', type=int) and not any(
+                filters.get(name) for name in ('status', 'district', 'division')
+            ):
+                raise ValueError('Give at least one filter to select applications by')
+            query = filter_applications(Application.query, filters)
+            if search is not None:
+                query = query.join(search, search.c.rowid == Application.id)
+        
+        summary = BulkStatusUpdate().apply(data.get('status'), ids=ids, query=query)
+        db.session.commit()
+        
+        # The letters are keyed on updated_at, so older renders are dead weight
+        get_pdf_cache().invalidate_many(
+            [result['id'] for result in summary['results'] if result['result'] == 'updated']
+        )
+        
+        return jsonify({
+            'success': True,
+            'message': f"Updated {summary['updated']} application(s)",
+            'data': summary
+        })
+        
+    except (ValueError, TypeError) as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': f'Error updating application statuses: {str(e)}'
+        }), 500
+
 @application_bp.route('/applications/stats', methods=['GET'])
 def get_application_stats():
     """Get application statistics (Admin only)"""
     try:
-        # Total applications
-        total_applications = Application.query.count()
-        
-        # Applications by status
-        status_stats = db.session.query(
-            Application.status,
-            db.func.count(Application.id)
-        ).group_by(Application.status).all()
-        
-        # Applications by district
-        district_stats = db.session.query(
-            Application.district,
-            db.func.count(Application.id)
-        ).group_by(Application.district).all()
-        
-        # Applications by category
-        category_stats = db.session.query(
-            Category.name,
-            db.func.count(Application.id)
-        ).join(Application).group_by(Category.name).all()
-        
-        # Daily applications (last 30 days)
-        from datetime import date, timedelta
-        thirty_days_ago = date.today() - timedelta(days=30)
-        daily_stats = db.session.query(
-            db.func.date(Application.created_at),
-            db.func.count(Application.id)
-        ).filter(
-            Application.created_at >= thirty_days_ago
-        ).group_by(
-            db.func.date(Application.created_at)
-        ).all()
-        
+        # Read from the rollup table, so cost doesn't grow with the application table
         return jsonify({
             'success': True,
-            'data': {
-                'total_applications': total_applications,
-                'status_distribution': dict(status_stats),
-                'district_distribution': dict(district_stats),
-                'category_distribution': dict(category_stats),
-                'daily_applications': {str(date): count for date, count in daily_stats}
-            }
+            'data': StatsRollup().summary(days=30)
         })
         
     except Exception as e:
@@ -352,3 +661,17 @@ def get_application_stats():
             'message': f'Error fetching statistics: {str(e)}'
         }), 500
 
+@application_bp.route('/applications/lookup-cache', methods=['GET'])
+def get_lookup_cache_stats():
+    """Hit/miss counters of this process's application lookup cache and its cross-worker drops (Admin only)"""
+    try:
+        return jsonify({
+            'success': True,
+            'data': dict(get_lookup_cache().stats(), coherence=coherence.stats())
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error fetching lookup cache stats: {str(e)}'
+        }), 500
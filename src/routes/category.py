@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from src.models import db, Category
+from src.services.http_cache import PUBLIC, get_version, make_etag, not_modified, with_validators
 
 category_bp = Blueprint('category', __name__)
 
@@ -7,11 +8,19 @@ category_bp = Blueprint('category', __name__)
 def get_categories():
     """Get all active categories"""
     try:
+        # Validators come from the version counter, so a revalidation is
+        # answered without querying or serializing the categories
+        version, updated_at = get_version('categories')
+        etag = make_etag('categories', version)
+        cached = not_modified(etag, updated_at, PUBLIC)
+        if cached:
+            return cached
+        
         categories = Category.query.filter_by(is_active=True).all()
-        return jsonify({
+        return with_validators(jsonify({
             'success': True,
             'data': [category.to_dict() for category in categories]
-        })
+        }), etag, updated_at, PUBLIC)
     except Exception as e:
         return jsonify({
             'success': False,
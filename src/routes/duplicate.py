@@ -0,0 +1,88 @@
+from flask import Blueprint, request, jsonify, session
+from sqlalchemy.orm import joinedload
+from src.models import db, DuplicateCandidate
+from src.services import DedupeEngine
+
+duplicate_bp = Blueprint('duplicate', __name__)
+
+@duplicate_bp.route('/duplicates', methods=['GET'])
+def get_duplicates():
+    """List possible duplicate applications for review (Admin only)"""
+    try:
+        page = request.args.get('page', 1, type=int)
+        per_page = request.args.get('per_page', 20, type=int)
+        status = request.args.get('status', 'pending')
+        min_score = request.args.get('min_score', type=float)
+        application_id = request.args.get('application_id', type=int)
+
+        query = DuplicateCandidate.query.options(
+            joinedload(DuplicateCandidate.application),
+            joinedload(DuplicateCandidate.duplicate_of)
+        )
+        if status and status != 'all':
+            query = query.filter(DuplicateCandidate.status == status)
+        if min_score is not None:
+            query = query.filter(DuplicateCandidate.score >= min_score)
+        if application_id:
+            query = query.filter(db.or_(
+                DuplicateCandidate.application_id == application_id,
+                DuplicateCandidate.duplicate_of_id == application_id
+            ))
+
+        # Strongest matches first
+        query = query.order_by(DuplicateCandidate.score.desc(), DuplicateCandidate.id.desc())
+        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+
+        status_counts = db.session.query(
+            DuplicateCandidate.status,
+            db.func.count(DuplicateCandidate.id)
+        ).group_by(DuplicateCandidate.status).all()
+
+        return jsonify({
+            'success': True,
+            'data': [candidate.to_dict(include_applications=True) for candidate in pagination.items],
+            'counts': dict(status_counts),
+            'pagination': {
+                'page': page,
+                'per_page': per_page,
+                'total': pagination.total,
+                'pages': pagination.pages,
+                'has_next': pagination.has_next,
+                'has_prev': pagination.has_prev
+            }
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error fetching duplicates: {str(e)}'
+        }), 500
+
+@duplicate_bp.route('/duplicates/<int:candidate_id>', methods=['PUT'])
+def review_duplicate(candidate_id):
+    """Confirm or dismiss a possible duplicate (Admin only)"""
+    try:
+        candidate = DuplicateCandidate.query.get_or_404(candidate_id)
+        data = request.get_json() or {}
+
+        DedupeEngine().review(candidate, data.get('status'), reviewer=session.get('admin_email'))
+        db.session.commit()
+
+        return jsonify({
+            'success': True,
+            'message': 'Duplicate review saved',
+            'data': candidate.to_dict(include_applications=True)
+        })
+
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': f'Error reviewing duplicate: {str(e)}'
+        }), 500
@@ -0,0 +1,101 @@
+from flask import Blueprint, request, jsonify
+from datetime import datetime
+from src.models import db, Job
+
+job_bp = Blueprint('job', __name__)
+
+@job_bp.route('/jobs/<int:job_id>', methods=['GET'])
+def get_job(job_id):
+    """Get the status of a background job"""
+    try:
+        job = db.session.get(Job, job_id)
+        if not job:
+            return jsonify({
+                'success': False,
+                'message': 'Job not found'
+            }), 404
+
+        return jsonify({
+            'success': True,
+            'data': job.to_dict()
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error fetching job: {str(e)}'
+        }), 500
+
+@job_bp.route('/jobs', methods=['GET'])
+def get_jobs():
+    """List background jobs with filtering (Admin only)"""
+    try:
+        page = request.args.get('page', 1, type=int)
+        per_page = request.args.get('per_page', 20, type=int)
+        status = request.args.get('status')
+        kind = request.args.get('kind')
+
+        query = Job.query
+        if status:
+            query = query.filter_by(status=status)
+        if kind:
+            query = query.filter_by(kind=kind)
+
+        query = query.order_by(Job.id.desc())
+        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+
+        # Queue depth by status for monitoring
+        status_counts = db.session.query(
+            Job.status,
+            db.func.count(Job.id)
+        ).group_by(Job.status).all()
+
+        return jsonify({
+            'success': True,
+            'data': [job.to_dict() for job in pagination.items],
+            'counts': dict(status_counts),
+            'pagination': {
+                'page': page,
+                'per_page': per_page,
+                'total': pagination.total,
+                'pages': pagination.pages,
+                'has_next': pagination.has_next,
+                'has_prev': pagination.has_prev
+            }
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error fetching jobs: {str(e)}'
+        }), 500
+
+@job_bp.route('/jobs/<int:job_id>/retry', methods=['POST'])
+def retry_job(job_id):
+    """Put a failed job back on the queue (Admin only)"""
+    try:
+        job = Job.query.get_or_404(job_id)
+        if job.status != 'failed':
+            return jsonify({
+                'success': False,
+                'message': 'Only failed jobs can be retried'
+            }), 400
+
+        job.status = 'queued'
+        job.attempts = 0
+        job.run_at = datetime.utcnow()
+        job.finished_at = None
+        db.session.commit()
+
+        return jsonify({
+            'success': True,
+            'message': 'Job queued for retry',
+            'data': job.to_dict()
+        })
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': f'Error retrying job: {str(e)}'
+        }), 500
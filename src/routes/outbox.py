@@ -0,0 +1,76 @@
+from flask import Blueprint, request, jsonify
+from src.models import db, OutboundEmail
+from src.services import Outbox
+
+outbox_bp = Blueprint('outbox', __name__)
+
+@outbox_bp.route('/outbox', methods=['GET'])
+def get_outbox():
+    """List outbound emails with filtering (Admin only)"""
+    try:
+        page = request.args.get('page', 1, type=int)
+        per_page = request.args.get('per_page', 20, type=int)
+        status = request.args.get('status')
+        recipient = request.args.get('recipient')
+
+        query = OutboundEmail.query
+        if status:
+            query = query.filter_by(status=status)
+        if recipient:
+            query = query.filter_by(recipient=recipient)
+
+        query = query.order_by(OutboundEmail.id.desc())
+        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+
+        # Outbox depth and dead letters by status for monitoring
+        status_counts = db.session.query(
+            OutboundEmail.status,
+            db.func.count(OutboundEmail.id)
+        ).group_by(OutboundEmail.status).all()
+
+        return jsonify({
+            'success': True,
+            'data': [email.to_dict() for email in pagination.items],
+            'counts': dict(status_counts),
+            'pagination': {
+                'page': page,
+                'per_page': per_page,
+                'total': pagination.total,
+                'pages': pagination.pages,
+                'has_next': pagination.has_next,
+                'has_prev': pagination.has_prev
+            }
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error fetching outbox: {str(e)}'
+        }), 500
+
+@outbox_bp.route('/outbox/retry', methods=['POST'])
+def retry_outbox():
+    """Put dead-lettered emails back on the queue (Admin only)"""
+    try:
+        data = request.get_json(silent=True) or {}
+        ids = data.get('ids')
+        if ids is not None and not isinstance(ids, list):
+            return jsonify({
+                'success': False,
+                'message': 'ids must be a list'
+            }), 400
+
+        requeued = Outbox().retry_dead(ids)
+
+        return jsonify({
+            'success': True,
+            'message': f'{requeued} email(s) queued for retry',
+            'requeued': requeued
+        })
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': f'Error retrying emails: {str(e)}'
+        }), 500
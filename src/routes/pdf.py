@@ -1,11 +1,45 @@
-from flask import Blueprint, request, jsonify, send_file, current_app
-import os
+from flask import Blueprint, request, jsonify, send_file, current_app, Response, stream_with_context
 from datetime import datetime
+from sqlalchemy.orm import joinedload
 from src.models import db, Application
-from src.services import PDFGenerator, EmailService
+from src.services import EmailService, BulkPDFExporter, get_pdf_cache
+from src.services.http_cache import PRIVATE, not_modified
+from src.models.application import filter_applications
 
 pdf_bp = Blueprint('pdf', __name__)
 
+def send_application_pdf(application):
+    """Send an application's PDF, or a 304 if the client already has this version"""
+    pdf_cache = get_pdf_cache()
+    
+    # The cache key hashes everything the PDF is rendered from, so it is the
+    # ETag; a revalidation never touches the PDF itself. No Last-Modified:
+    # updated_at misses template and photo changes
+    key = pdf_cache.cache_key(application)
+    cached = not_modified(key)
+    if cached:
+        return cached
+    
+    # Serve the cached render, generating it only when the application changed
+    pdf_path = pdf_cache.get_or_render(application, key=key)
+    
+    if not pdf_path:
+        return jsonify({
+            'success': False,
+            'message': 'Error generating PDF'
+        }), 500
+    
+    response = send_file(
+        pdf_path,
+        as_attachment=True,
+        download_name=f"Application_{application.reference_number}.pdf",
+        mimetype='application/pdf',
+        etag=key
+    )
+    del response.headers['Last-Modified']
+    response.headers['Cache-Control'] = PRIVATE
+    return response
+
 @pdf_bp.route('/applications/<int:application_id>/pdf', methods=['GET'])
 def generate_and_download_pdf(application_id):
     """Generate and download PDF for an application"""
@@ -13,32 +47,7 @@ def generate_and_download_pdf(application_id):
         # Get application
         application = Application.query.get_or_404(application_id)
         
-        # Create PDF generator
-        pdf_generator = PDFGenerator(current_app.config['UPLOAD_FOLDER'])
-        
-        # Generate PDF filename
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        pdf_filename = f"Application_{application.reference_number}_{timestamp}.pdf"
-        pdf_path = os.path.join(current_app.config['UPLOAD_FOLDER'], 'pdfs', pdf_filename)
-        
-        # Ensure PDF directory exists
-        os.makedirs(os.path.dirname(pdf_path), exist_ok=True)
-        
-        # Generate PDF
-        success = pdf_generator.generate_application_pdf(application, pdf_path)
-        
-        if success and os.path.exists(pdf_path):
-            return send_file(
-                pdf_path,
-                as_attachment=True,
-                download_name=f"Application_{application.reference_number}.pdf",
-                mimetype='application/pdf'
-            )
-        else:
-            return jsonify({
-                'success': False,
-                'message': 'Error generating PDF'
-            }), 500
+        return send_application_pdf(application)
             
     except Exception as e:
         return jsonify({
@@ -59,37 +68,77 @@ def generate_pdf_by_reference(reference_number):
                 'message': 'Application not found'
             }), 404
         
-        # Create PDF generator
-        pdf_generator = PDFGenerator(current_app.config['UPLOAD_FOLDER'])
+        return send_application_pdf(application)
+            
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error generating PDF: {str(e)}'
+        }), 500
+
+@pdf_bp.route('/applications/export/pdf', methods=['GET'])
+def export_application_pdfs():
+    """Stream PDFs of filtered applications as a ZIP or one merged PDF (Admin only)"""
+    try:
+        export_format = request.args.get('format', 'zip')
+        if export_format not in ('zip', 'pdf'):
+            return jsonify({
+                'success': False,
+                'message': 'Invalid format. Must be one of: zip, pdf'
+            }), 400
+        
+        # Same filters as the applications listing
+        query = filter_applications(Application.query, request.args)
         
-        # Generate PDF filename
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        pdf_filename = f"Application_{application.reference_number}_{timestamp}.pdf"
-        pdf_path = os.path.join(current_app.config['UPLOAD_FOLDER'], 'pdfs', pdf_filename)
-        
-        # Ensure PDF directory exists
-        os.makedirs(os.path.dirname(pdf_path), exist_ok=True)
-        
-        # Generate PDF
-        success = pdf_generator.generate_application_pdf(application, pdf_path)
-        
-        if success and os.path.exists(pdf_path):
-            return send_file(
-                pdf_path,
-                as_attachment=True,
-                download_name=f"Application_{application.reference_number}.pdf",
-                mimetype='application/pdf'
-            )
+        if export_format == 'pdf':
+            total = query.order_by(None).count()
+            limit = current_app.config.get('BULK_EXPORT_MERGED_LIMIT', 500)
+            if total > limit:
+                return jsonify({
+                    'success': False,
+                    'message': f'Too many applications for one merged PDF ({total}). Narrow the filters or use format=zip'
+                }), 400
         else:
+            total = 1 if db.session.query(query.exists()).scalar() else 0
+        
+        if not total:
             return jsonify({
                 'success': False,
-                'message': 'Error generating PDF'
-            }), 500
-            
+                'message': 'No applications found'
+            }), 404
+        
+        # Stream rows in batches instead of loading every match
+        applications = query.options(
+            joinedload(Application.category)
+        ).order_by(Application.created_at.desc()).yield_per(100)
+        
+        exporter = BulkPDFExporter(
+            current_app.config['UPLOAD_FOLDER'],
+            renderer=current_app.config.get('PDF_RENDERER', 'platypus'),
+            processes=current_app.config.get('BULK_EXPORT_PROCESSES'),
+            pdf_cache=get_pdf_cache()
+        )
+        
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        if export_format == 'zip':
+            body = exporter.stream_zip(applications)
+            mimetype = 'application/zip'
+            filename = f'Applications_{timestamp}.zip'
+        else:
+            body = exporter.stream_merged_pdf(applications)
+            mimetype = 'application/pdf'
+            filename = f'Applications_{timestamp}.pdf'
+        
+        return Response(
+            stream_with_context(body),
+            mimetype=mimetype,
+            headers={'Content-Disposition': f'attachment; filename={filename}'}
+        )
+        
     except Exception as e:
         return jsonify({
             'success': False,
-            'message': f'Error generating PDF: {str(e)}'
+            'message': f'Error exporting PDFs: {str(e)}'
         }), 500
 
 @pdf_bp.route('/applications/<int:application_id>/send-email', methods=['POST'])
@@ -99,18 +148,18 @@ def send_application_email(application_id):
         # Get application
         application = Application.query.get_or_404(application_id)
         
-        # Create PDF generator and email service
-        pdf_generator = PDFGenerator(current_app.config['UPLOAD_FOLDER'])
         email_service = EmailService()
         
         # Generate PDF bytes
-        pdf_bytes = pdf_generator.generate_pdf_bytes(application)
+        pdf_bytes = get_pdf_cache().get_bytes(application)
         
         if pdf_bytes:
             # Send email with PDF attachment
             success = email_service.send_application_confirmation(application, pdf_bytes)
             
             if success:
+                # Commits the message if it went to the outbox
+                db.session.commit()
                 return jsonify({
                     'success': True,
                     'message': 'Email sent successfully'
@@ -145,18 +194,18 @@ def send_email_by_reference(reference_number):
                 'message': 'Application not found'
             }), 404
         
-        # Create PDF generator and email service
-        pdf_generator = PDFGenerator(current_app.config['UPLOAD_FOLDER'])
         email_service = EmailService()
         
         # Generate PDF bytes
-        pdf_bytes = pdf_generator.generate_pdf_bytes(application)
+        pdf_bytes = get_pdf_cache().get_bytes(application)
         
         if pdf_bytes:
             # Send email with PDF attachment
             success = email_service.send_application_confirmation(application, pdf_bytes)
             
             if success:
+                # Commits the message if it went to the outbox
+                db.session.commit()
                 return jsonify({
                     'success': True,
                     'message': 'Email sent successfully'
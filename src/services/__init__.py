@@ -1,5 +1,18 @@
-from .pdf_generator import PDFGenerator
+from .pdf_generator import PDFGenerator, CanvasPDFGenerator, LetterData, create_pdf_generator
 from .email_service import EmailService
+from .storage import UploadStore
+from .image_processing import ImageProcessor
+from .pdf_cache import PDFCache, get_pdf_cache
+from .bulk_export import BulkPDFExporter
+from .job_queue import JobQueue, JobWorker
+from .stats import StatsRollup
+from .fuzzy_search import FuzzyNameSearch
+from .dedupe import DedupeEngine
+from .image_hash import ImageHashIndex
+from .bulk_import import ApplicationImporter
+from .bulk_status import BulkStatusUpdate
+from .mail_delivery import Outbox, OutboxWorker, SMTPConnectionPool
+from .lookup_cache import LookupCache, get_lookup_cache
+from .cache_coherence import CacheCoherence, sync_caches
 
-__all__ = ['PDFGenerator', 'EmailService']
-
+__all__ = ['PDFGenerator', 'CanvasPDFGenerator', 'LetterData', 'create_pdf_generator', 'EmailService', 'UploadStore', 'ImageProcessor', 'PDFCache', 'get_pdf_cache', 'BulkPDFExporter', 'JobQueue', 'JobWorker', 'StatsRollup', 'FuzzyNameSearch', 'DedupeEngine', 'ImageHashIndex', 'ApplicationImporter', 'BulkStatusUpdate', 'Outbox', 'OutboxWorker', 'SMTPConnectionPool', 'LookupCache', 'get_lookup_cache', 'CacheCoherence', 'sync_caches']
@@ -0,0 +1,140 @@
+import os
+import zipfile
+from io import BytesIO
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+from .pdf_generator import CanvasPDFGenerator, LetterData, create_pdf_generator
+
+STREAM_CHUNK_SIZE = 256 * 1024
+
+# Generators reused by each pool process across letters
+_generators = {}
+
+def render_letter(upload_folder, renderer, letter):
+    """Render one letter in a pool process; returns (filename, pdf bytes, error)"""
+    filename = f'Application_{letter.reference_number}.pdf'
+    try:
+        generator = _generators.get((upload_folder, renderer))
+        if generator is None:
+            generator = create_pdf_generator(upload_folder, renderer)
+            _generators[(upload_folder, renderer)] = generator
+
+        buffer = BytesIO()
+        generator.render(letter, buffer)
+        return filename, buffer.getvalue(), None
+
+    except Exception as e:
+        return filename, None, str(e)
+
+class _StreamBuffer:
+    """Write-only file object that hands written bytes to a generator"""
+
+    def __init__(self):
+        self._chunks = []
+        self._offset = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._offset
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+class BulkPDFExporter:
+    """Streams many application letters as a ZIP archive or one merged PDF"""
+
+    def __init__(self, upload_folder, renderer='platypus', processes=None, pdf_cache=None):
+        self.upload_folder = upload_folder
+        self.renderer = renderer
+        self.processes = processes or os.cpu_count() or 1
+        self.pdf_cache = pdf_cache
+
+    def stream_zip(self, applications):
+        """Yield a ZIP archive, one PDF entry per application as it finishes.
+
+        Rendering fans out over a process pool. At most two letters per
+        process are in flight, so memory stays flat however many rows match.
+        """
+        buffer = _StreamBuffer()
+        errors = []
+        max_in_flight = self.processes * 2
+
+        # Spawned workers don't inherit the web server's threads or DB connections
+        executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+        try:
+            # PDFs are already compressed, so entries are stored as-is
+            with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as archive:
+                pending = set()
+                for application in applications:
+                    # Letters already in the render cache are copied from disk
+                    cached_path = self.pdf_cache.get(application) if self.pdf_cache else None
+                    if cached_path:
+                        archive.write(cached_path, f'Application_{application.reference_number}.pdf')
+                        yield buffer.drain()
+                        continue
+
+                    letter = LetterData.from_application(application)
+                    pending.add(executor.submit(render_letter, self.upload_folder, self.renderer, letter))
+
+                    if len(pending) >= max_in_flight:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        self._write_entries(archive, done, errors)
+                        yield buffer.drain()
+
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    self._write_entries(archive, done, errors)
+                    yield buffer.drain()
+
+                if errors:
+                    archive.writestr('errors.txt', '\n'.join(errors))
+
+            # Central directory
+            yield buffer.drain()
+
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _write_entries(self, archive, futures, errors):
+        for future in futures:
+            filename, pdf_bytes, error = future.result()
+            if error:
+                errors.append(f'{filename}: {error}')
+            else:
+                archive.writestr(filename, pdf_bytes)
+
+    def stream_merged_pdf(self, applications):
+        """Yield one PDF containing every application letter.
+
+        A single PDF document can't be assembled from parallel renders without
+        a merge step, so the letters are drawn sequentially with the canvas
+        fast path. ReportLab holds page objects until the document is saved,
+        so this mode suits batches of letters rather than the whole table;
+        the ZIP mode has no such limit.
+        """
+        generator = CanvasPDFGenerator(self.upload_folder)
+
+        with tempfile.TemporaryFile() as output:
+            pdf = canvas.Canvas(output, pagesize=A4)
+            for application in applications:
+                generator.draw_letter(pdf, LetterData.from_application(application))
+            pdf.save()
+
+            output.seek(0)
+            for chunk in iter(lambda: output.read(STREAM_CHUNK_SIZE), b''):
+                yield chunk
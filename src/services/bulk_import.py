@@ -0,0 +1,209 @@
+import os
+import csv
+from types import SimpleNamespace
+from datetime import datetime
+from werkzeug.datastructures import FileStorage
+from sqlalchemy import select, insert
+from src.models import db, Application, Category
+from src.models.application import REQUIRED_FIELDS, clean_application_data, new_reference_number
+from .uploads import process_upload, register_uploads, allowed_file
+from .stats import StatsRollup
+from .dedupe import DedupeEngine
+from .fuzzy_search import index_application_names
+from .job_queue import JobQueue
+from .lookup_cache import invalidate_on_commit
+
+# CSV columns naming a file in the ZIP archive -> (Application column, upload folder)
+FILE_COLUMNS = {
+    'photo': ('photo_path', 'photos'),
+    'signature': ('signature_path', 'signatures'),
+    'nid_image': ('nid_image_path', 'nid_images'),
+}
+
+# Same per-file limit as a form upload
+MAX_MEMBER_BYTES = 16 * 1024 * 1024
+
+class ImportReport:
+    """Per-row outcome of a bulk import"""
+
+    def __init__(self, dry_run=False, max_errors=1000):
+        self.dry_run = dry_run
+        self.max_errors = max_errors
+        self.total = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors = []
+        self.references = []
+
+    def error(self, row, message):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'row': row, 'message': message})
+
+    def to_dict(self):
+        return {
+            'dry_run': self.dry_run,
+            'total': self.total,
+            'imported': self.imported,
+            'failed': self.failed,
+            'errors': self.errors,
+            'errors_truncated': self.failed > len(self.errors),
+            'references': [{'row': row, 'reference_number': reference} for row, reference in self.references]
+        }
+
+class ApplicationImporter:
+    """Bulk-loads applications from a CSV of form fields.
+
+    Rows are validated with the same rules as the submission form
+    (``clean_application_data`` plus an active category). Valid rows are
+    inserted ``chunk_size`` at a time with one executemany INSERT per chunk,
+    each chunk in its own transaction together with its stats rollup,
+    search index, duplicate checks and confirmation email jobs; a failing
+    chunk is rolled back and reported without stopping the import.
+
+    Optional ``photo``, ``signature`` and ``nid_image`` columns name files
+    inside a ZIP archive, stored exactly like form uploads. Row numbers in
+    the report are CSV line numbers (the header is line 1).
+    """
+
+    def __init__(self, upload_folder, chunk_size=1000, send_emails=True):
+        self.upload_folder = upload_folder
+        self.chunk_size = chunk_size
+        self.send_emails = send_emails
+
+    def run(self, csv_file, archive=None, dry_run=False):
+        """Import from a text-mode CSV file and an optional ``zipfile.ZipFile``"""
+        reader = csv.DictReader(csv_file)
+        missing = [field for field in REQUIRED_FIELDS if field not in (reader.fieldnames or ())]
+        if missing:
+            raise ValueError(f"Missing CSV columns: {', '.join(missing)}")
+
+        categories = dict(db.session.query(Category.id, Category.is_active).all())
+        members = self._archive_members(archive)
+        report = ImportReport(dry_run=dry_run)
+
+        chunk = []
+        for line, row in enumerate(reader, start=2):
+            report.total += 1
+            try:
+                chunk.append((line, row, self.validate(row, categories, members)))
+            except ValueError as e:
+                report.error(line, str(e))
+                continue
+
+            if len(chunk) >= self.chunk_size:
+                self._import_chunk(chunk, archive, members, report)
+                chunk = []
+
+        if chunk:
+            self._import_chunk(chunk, archive, members, report)
+        return report
+
+    def validate(self, row, categories, members):
+        """Column values for a CSV row; raises ValueError"""
+        values = clean_application_data(row)
+        if not categories.get(values['category_id']):
+            raise ValueError('Invalid category selected')
+
+        for column in FILE_COLUMNS:
+            name = (row.get(column) or '').strip()
+            if not name:
+                continue
+            if members is None:
+                raise ValueError(f'Column {column} names a file but no archive was uploaded')
+            member = members.get(name) or members.get(os.path.basename(name))
+            if member is None:
+                raise ValueError(f'File {name} not found in the archive')
+            if not allowed_file(member.filename):
+                raise ValueError(f'File type not allowed: {name}')
+            if member.file_size > MAX_MEMBER_BYTES:
+                raise ValueError(f'File too large: {name}')
+        return values
+
+    def _archive_members(self, archive):
+        """Archive entries by full name and by base name"""
+        if archive is None:
+            return None
+        members = {}
+        for member in archive.infolist():
+            if not member.is_dir():
+                members.setdefault(os.path.basename(member.filename), member)
+                members[member.filename] = member
+        return members
+
+    def _import_chunk(self, chunk, archive, members, report):
+        if report.dry_run:
+            report.imported += len(chunk)
+            return
+
+        try:
+            now = datetime.utcnow()
+            rows = []
+            uploads = []
+            # Files are processed before the first write, so the chunk's
+            # transaction only covers the inserts
+            for (line, row, values), reference in zip(chunk, self._reference_numbers(len(chunk))):
+                files = {}
+                for column, (attribute, folder) in FILE_COLUMNS.items():
+                    name = (row.get(column) or '').strip()
+                    upload = self._store_member(archive, members, name, folder) if name else None
+                    files[attribute] = upload.path if upload else None
+                    uploads.append(upload)
+                rows.append(dict(
+                    values, **files,
+                    reference_number=reference, status='Pending', created_at=now, updated_at=now
+                ))
+
+            register_uploads(self.upload_folder, uploads)
+
+            table = Application.__table__
+            result = db.session.execute(insert(table).returning(table.c.id, sort_by_parameter_order=True), rows)
+            applications = [SimpleNamespace(id=application_id, **row) for (application_id,), row in zip(result, rows)]
+
+            # Core inserts skip the ORM events that index single submissions
+            connection = db.session.connection()
+            if connection.dialect.name == 'sqlite':
+                index_application_names(connection, [
+                    (application.id, application.full_name, application.father_name, application.mother_name)
+                    for application in applications
+                ])
+            invalidate_on_commit(db.session, nids=[application.nid_number for application in applications])
+            StatsRollup().record_submissions(applications)
+            DedupeEngine().check_many(applications)
+            if self.send_emails:
+                JobQueue().enqueue_many('application_confirmation', [
+                    {'application_id': application.id} for application in applications
+                ])
+            db.session.commit()
+
+        except Exception as e:
+            db.session.rollback()
+            for line, _, _ in chunk:
+                report.error(line, f'Import failed: {str(e)}')
+            return
+
+        report.imported += len(applications)
+        report.references.extend(
+            (line, application.reference_number) for (line, _, _), application in zip(chunk, applications)
+        )
+
+    def _reference_numbers(self, count):
+        """``count`` reference numbers unused in the table and in this batch"""
+        references = set()
+        while len(references) < count:
+            candidates = {new_reference_number() for _ in range(count - len(references))} - references
+            taken = set()
+            candidate_list = list(candidates)
+            for start in range(0, len(candidate_list), 500):
+                taken.update(db.session.execute(
+                    select(Application.reference_number).where(
+                        Application.reference_number.in_(candidate_list[start:start + 500])
+                    )
+                ).scalars())
+            references |= candidates - taken
+        return list(references)
+
+    def _store_member(self, archive, members, name, folder):
+        member = members.get(name) or members.get(os.path.basename(name))
+        with archive.open(member) as stream:
+            return process_upload(self.upload_folder, FileStorage(stream=stream, filename=member.filename), folder)
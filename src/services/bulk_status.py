@@ -0,0 +1,103 @@
+from datetime import datetime
+from sqlalchemy import select, update
+from src.models import db, Application
+from src.models.application import APPLICATION_STATUSES
+from .stats import StatsRollup
+from .job_queue import JobQueue
+from .lookup_cache import invalidate_on_commit
+
+# Columns needed to move rollup counts and tell applicants what changed
+_COLUMNS = (
+    Application.id, Application.status, Application.created_at,
+    Application.category_id, Application.district, Application.division
+)
+
+class BulkStatusUpdate:
+    """Moves many applications to one status in a single transaction.
+
+    Targets are read as plain columns, updated with a few set-based UPDATEs,
+    the stats rollup is adjusted once per key, and the status emails are
+    queued as ``status_update_batch`` jobs of ``batch_size`` applications
+    each, so one job sends a whole batch instead of one job per email.
+    Everything goes through the current session; the caller commits.
+    """
+
+    def __init__(self, notify=True, batch_size=200, max_applications=10000):
+        self.notify = notify
+        self.batch_size = batch_size
+        self.max_applications = max_applications
+
+    def apply(self, new_status, ids=None, query=None):
+        """Set ``new_status`` on the given ids, or on every row of an Application query.
+
+        Returns {'results': [{id, result, old_status}], 'updated', 'unchanged',
+        'not_found', 'job_ids'}; result is updated, unchanged or not_found.
+        Raises ValueError for a bad status or too many targets.
+        """
+        if new_status not in APPLICATION_STATUSES:
+            raise ValueError(f"Invalid status. Must be one of: {', '.join(APPLICATION_STATUSES)}")
+        if (ids is None) == (query is None):
+            raise ValueError('Give either ids or a filter')
+
+        if ids is not None:
+            ids = list(dict.fromkeys(int(application_id) for application_id in ids))
+            if len(ids) > self.max_applications:
+                raise ValueError(f'At most {self.max_applications} applications can be updated at once')
+            rows = []
+            for start in range(0, len(ids), 500):
+                rows.extend(db.session.execute(
+                    select(*_COLUMNS).where(Application.id.in_(ids[start:start + 500]))
+                ).all())
+        else:
+            rows = query.with_entities(*_COLUMNS).order_by(Application.id).limit(self.max_applications + 1).all()
+            if len(rows) > self.max_applications:
+                raise ValueError(f'The filter matches more than {self.max_applications} applications; narrow it down')
+            ids = [row.id for row in rows]
+
+        found = {row.id: row for row in rows}
+        changed = [row for row in rows if row.status != new_status]
+
+        now = datetime.utcnow()
+        changed_ids = [row.id for row in changed]
+        for start in range(0, len(changed_ids), 500):
+            db.session.execute(
+                update(Application.__table__)
+                .where(Application.__table__.c.id.in_(changed_ids[start:start + 500]))
+                .values(status=new_status, updated_at=now)
+            )
+
+        StatsRollup().record_status_changes(changed, new_status)
+        # Core updates skip the ORM events that invalidate cached lookups
+        invalidate_on_commit(db.session, ids=changed_ids)
+
+        job_ids = []
+        if self.notify:
+            jobs = []
+            queue = JobQueue()
+            for start in range(0, len(changed), self.batch_size):
+                jobs.append(queue.enqueue('status_update_batch', {
+                    'new_status': new_status,
+                    'changes': [[row.id, row.status] for row in changed[start:start + self.batch_size]]
+                }))
+            db.session.flush()
+            job_ids = [job.id for job in jobs]
+
+        results = []
+        for application_id in ids:
+            row = found.get(application_id)
+            if row is None:
+                results.append({'id': application_id, 'result': 'not_found', 'old_status': None})
+            else:
+                result = 'unchanged' if row.status == new_status else 'updated'
+                results.append({'id': application_id, 'result': result, 'old_status': row.status})
+
+        # Sessions may hold the old values in their identity map
+        db.session.expire_all()
+
+        return {
+            'results': results,
+            'updated': len(changed),
+            'unchanged': len(rows) - len(changed),
+            'not_found': len(ids) - len(rows),
+            'job_ids': job_ids
+        }
@@ -0,0 +1,123 @@
+import time
+import threading
+from datetime import datetime
+from flask import g, current_app, has_request_context
+from sqlalchemy import event, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from src.models import db, CacheVersion
+
+class CacheCoherence:
+    """Drops this process's cached data when another process changes it.
+
+    Writers bump a namespace's row in ``cache_version`` in the same
+    transaction as the write (``bump_on_commit``). Before a request uses an
+    in-process cache, ``sync_caches`` reads the version table, one small
+    query, and runs the handlers of each namespace whose version moved since
+    this process last looked. Versions this process committed itself are
+    recorded as seen when nobody else wrote in between, because its own
+    caches were already invalidated precisely.
+    """
+
+    def __init__(self):
+        self._handlers = {}
+        self._seen = {}
+        self._lock = threading.Lock()
+        self.checked_at = None
+        self.drops = {}
+
+    def register(self, namespace, handler):
+        """Call ``handler()`` when another process writes to ``namespace``"""
+        with self._lock:
+            self._handlers.setdefault(namespace, []).append(handler)
+
+    def check(self):
+        """Read the version table and drop the namespaces that moved"""
+        self.checked_at = time.monotonic()
+        versions = dict(db.session.execute(select(CacheVersion.namespace, CacheVersion.version)).all())
+
+        stale = []
+        with self._lock:
+            for namespace, handlers in self._handlers.items():
+                version = versions.get(namespace, 0)
+                seen = self._seen.get(namespace)
+                if seen == version:
+                    continue
+                self._seen[namespace] = version
+                stale.extend(handlers)
+                if seen is not None:
+                    self.drops[namespace] = self.drops.get(namespace, 0) + 1
+
+        for handler in stale:
+            handler()
+
+    def committed(self, versions):
+        """Note versions this process has just committed"""
+        with self._lock:
+            for namespace, version in versions.items():
+                if self._seen.get(namespace) == version - 1:
+                    self._seen[namespace] = version
+
+    def stats(self):
+        with self._lock:
+            return {'versions': dict(self._seen), 'drops': dict(self.drops)}
+
+def bump_version(connection, namespace):
+    """Advance a namespace's version inside the writer's transaction; returns the new version"""
+    table = CacheVersion.__table__
+    now = datetime.utcnow()
+
+    if connection.dialect.name == 'sqlite':
+        return connection.execute(
+            sqlite_insert(table).values(namespace=namespace, version=1, updated_at=now)
+            .on_conflict_do_update(
+                index_elements=['namespace'],
+                set_={'version': table.c.version + 1, 'updated_at': now}
+            )
+            .returning(table.c.version)
+        ).scalar_one()
+
+    updated = connection.execute(
+        update(table).where(table.c.namespace == namespace)
+        .values(version=table.c.version + 1, updated_at=now)
+    ).rowcount
+    if not updated:
+        connection.execute(table.insert().values(namespace=namespace, version=1, updated_at=now))
+        return 1
+    return connection.execute(select(table.c.version).where(table.c.namespace == namespace)).scalar_one()
+
+coherence = CacheCoherence()
+
+def sync_caches():
+    """Bring the in-process caches up to date with other processes' writes.
+
+    Call before reading from a cache; runs at most once per request, and
+    not again within CACHE_CHECK_INTERVAL seconds when that is set.
+    """
+    if has_request_context():
+        if g.get('cache_versions_checked'):
+            return
+        g.cache_versions_checked = True
+    interval = current_app.config.get('CACHE_CHECK_INTERVAL', 0)
+    if interval and coherence.checked_at is not None and time.monotonic() - coherence.checked_at < interval:
+        return
+    coherence.check()
+
+def bump_on_commit(session, namespace, connection=None):
+    """Bump ``namespace`` once in the session's current transaction"""
+    bumped = session.info.setdefault('cache_versions', {})
+    if namespace not in bumped:
+        bumped[namespace] = bump_version(connection or session.connection(), namespace)
+
+def _record_commit(session):
+    versions = session.info.pop('cache_versions', None)
+    if versions:
+        coherence.committed(versions)
+
+def _discard_bumps(session, transaction):
+    # A rolled back transaction took its bumps with it
+    if transaction.parent is None:
+        session.info.pop('cache_versions', None)
+
+event.listen(Session, 'after_commit', _record_commit)
+event.listen(Session, 'after_transaction_end', _discard_bumps)
@@ -0,0 +1,66 @@
+import io
+import csv
+import json
+
+# Rows are written out in chunks of roughly this many bytes
+CHUNK_BYTES = 64 * 1024
+
+# Leading characters a spreadsheet would evaluate as a formula
+_FORMULA_PREFIXES = ('=', '@', '\t', '\r')
+
+def export_value(value):
+    """Plain value for an exported field (dates as ISO strings)"""
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+def csv_cell(value):
+    if value is None:
+        return ''
+    value = export_value(value)
+    if isinstance(value, str) and value and (
+        value.startswith(_FORMULA_PREFIXES)
+        or (value[0] in '+-' and not value[1:2].isdigit())
+    ):
+        # Keep user input inert when the file is opened in Excel
+        return "'" + value
+    return value
+
+def stream_csv(rows, fields):
+    """Yield CSV text for row tuples in ~64 KB chunks.
+
+    The header goes out on its own first, so the response starts before
+    the first batch of rows has been fetched.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    for row in rows:
+        writer.writerow([csv_cell(value) for value in row])
+        if buffer.tell() >= CHUNK_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def stream_ndjson(rows, fields):
+    """Yield newline-delimited JSON objects for row tuples in ~64 KB chunks.
+
+    The first row goes out on its own, so the response starts right away.
+    """
+    chunk = []
+    size = CHUNK_BYTES
+    for row in rows:
+        line = json.dumps(
+            {name: export_value(value) for name, value in zip(fields, row)},
+            ensure_ascii=False, separators=(',', ':')
+        )
+        chunk.append(line)
+        size += len(line) + 1
+        if size >= CHUNK_BYTES:
+            yield '\n'.join(chunk) + '\n'
+            chunk = []
+            size = 0
+    if chunk:
+        yield '\n'.join(chunk) + '\n'
@@ -0,0 +1,320 @@
+import re
+import json
+from datetime import datetime
+from sqlalchemy import select, delete, update, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from src.models import db, Application, ApplicationBlockKey, DuplicateCandidate
+from src.services.fuzzy_search import normalize_name, phonetic_key, similarity
+
+# Columns read for blocking and scoring
+DEDUPE_COLUMNS = (
+    'id', 'nid_number', 'mobile_number', 'full_name', 'father_name',
+    'date_of_birth', 'village', 'upazila', 'district'
+)
+
+# Score contributions; a pair scoring at least the threshold is recorded
+SCORE_WEIGHTS = {
+    'nid': 0.40,
+    'mobile': 0.20,
+    'full_name': 0.15,
+    'father_name': 0.10,
+    'date_of_birth': 0.10,
+    'address': 0.05,
+}
+
+# Name similarity below this earns no points
+NAME_SIMILARITY_FLOOR = 0.5
+
+_DIGITS = re.compile(r'\D')
+
+def normalize_nid(value):
+    """Digits of an NID number, or None if too short to be one"""
+    digits = _DIGITS.sub('', value or '')
+    return digits if len(digits) >= 10 else None
+
+def normalize_mobile(value):
+    """Last ten digits of a mobile number, so +880, 880 and 0 prefixes agree"""
+    digits = _DIGITS.sub('', value or '')
+    return digits[-10:] if len(digits) >= 10 else None
+
+def name_block_key(full_name, father_name, district):
+    """Phonetic keys of both names plus the district.
+
+    Keys are sorted so reordered name parts ("Karim Md" / "Md Karim") land in
+    the same block.
+    """
+    full = sorted(filter(None, (phonetic_key(token) for token in normalize_name(full_name))))
+    father = sorted(filter(None, (phonetic_key(token) for token in normalize_name(father_name))))
+    if not full or not father or not district:
+        return None
+    return f"{' '.join(full)}|{' '.join(father)}|{district.strip().lower()}"
+
+def name_similarity(a, b):
+    """Trigram similarity, or phonetic-key overlap when that is higher.
+
+    The key overlap catches reordered and differently spelled name parts
+    that share few trigrams (Mohammad Karim / Kareem Md).
+    """
+    keys_a = set(filter(None, (phonetic_key(token) for token in normalize_name(a))))
+    keys_b = set(filter(None, (phonetic_key(token) for token in normalize_name(b))))
+    overlap = len(keys_a & keys_b) / len(keys_a | keys_b) if keys_a and keys_b else 0.0
+    return max(similarity(a, b), overlap)
+
+def block_keys(application):
+    """[(kind, value)] blocking keys for an application or result row"""
+    keys = [
+        ('nid', normalize_nid(application.nid_number)),
+        ('mobile', normalize_mobile(application.mobile_number)),
+        ('name', name_block_key(application.full_name, application.father_name, application.district)),
+    ]
+    return [(kind, value) for kind, value in keys if value]
+
+def index_block_keys(connection, rows):
+    """(Re)index the blocking keys of application rows"""
+    rows = list(rows)
+    if not rows:
+        return
+    table = ApplicationBlockKey.__table__
+    connection.execute(delete(table).where(table.c.application_id.in_([row.id for row in rows])))
+    values = [
+        {'kind': kind, 'value': value, 'application_id': row.id}
+        for row in rows for kind, value in block_keys(row)
+    ]
+    if values:
+        connection.execute(table.insert(), values)
+
+def score_pair(a, b):
+    """(score, reasons) for two application rows"""
+    score = 0.0
+    reasons = []
+
+    def add(reason, weight):
+        nonlocal score
+        score += weight
+        reasons.append(reason)
+
+    nid = normalize_nid(a.nid_number)
+    if nid and nid == normalize_nid(b.nid_number):
+        add('nid', SCORE_WEIGHTS['nid'])
+    mobile = normalize_mobile(a.mobile_number)
+    if mobile and mobile == normalize_mobile(b.mobile_number):
+        add('mobile', SCORE_WEIGHTS['mobile'])
+    for field in ('full_name', 'father_name'):
+        value = name_similarity(getattr(a, field), getattr(b, field))
+        if value >= NAME_SIMILARITY_FLOOR:
+            add(field, SCORE_WEIGHTS[field] * value)
+    if a.date_of_birth and a.date_of_birth == b.date_of_birth:
+        add('date_of_birth', SCORE_WEIGHTS['date_of_birth'])
+    if all((getattr(a, field) or '').strip().lower() == (getattr(b, field) or '').strip().lower()
+           for field in ('village', 'upazila', 'district')):
+        add('address', SCORE_WEIGHTS['address'])
+    return round(score, 4), reasons
+
+class DedupeEngine:
+    """Finds likely duplicate applications without comparing every pair.
+
+    Each application is indexed under a few blocking keys (normalized NID,
+    normalized mobile, phonetic name + father's name + district); only
+    applications sharing a key are scored against each other. Pairs scoring
+    at least ``threshold`` go to the duplicate_candidate table for review.
+    Blocks larger than ``max_block_size`` are skipped in batch runs (a key
+    that common says little) and truncated to the newest members when
+    checking a single application.
+    """
+
+    def __init__(self, threshold=0.4, max_block_size=100):
+        self.threshold = threshold
+        self.max_block_size = max_block_size
+
+    def check(self, application):
+        """Index a new (flushed) application and record its likely duplicates.
+
+        Works in the current session so the keys and candidates commit with
+        the application; returns the recorded [(other_id, score, reasons)].
+        """
+        return [
+            (second if first == application.id else first, score, reasons)
+            for first, second, score, reasons in self.check_many([application])
+        ]
+
+    def check_many(self, applications):
+        """``check`` for a batch of new applications (objects or rows).
+
+        Keys are looked up in one query for the whole batch, and new
+        applications are also compared with each other. Returns the recorded
+        [(application_id, other_id, score, reasons)].
+        """
+        connection = db.session.connection()
+        applications = list(applications)
+        index_block_keys(connection, applications)
+
+        keys = {application.id: block_keys(application) for application in applications}
+        wanted = list({key for application_keys in keys.values() for key in application_keys})
+        if not wanted:
+            return []
+
+        table = ApplicationBlockKey.__table__
+        members = {}
+        for start in range(0, len(wanted), 300):
+            for kind, value, application_id in connection.execute(
+                select(table.c.kind, table.c.value, table.c.application_id).where(
+                    tuple_(table.c.kind, table.c.value).in_(wanted[start:start + 300])
+                )
+            ):
+                members.setdefault((kind, value), []).append(application_id)
+
+        pairs = set()
+        for application in applications:
+            for key in keys[application.id]:
+                # The newest members of an oversized block only
+                others = sorted(members.get(key, ()), reverse=True)
+                others = [other for other in others if other != application.id][:self.max_block_size]
+                # As (newer, older), so pairs inside the batch count once
+                pairs.update((max(application.id, other), min(application.id, other)) for other in others)
+
+        batch = {application.id: application for application in applications}
+        rows = self._load(connection, {id_ for pair in pairs for id_ in pair if id_ not in batch})
+        rows.update(batch)
+
+        matches = []
+        for first, second in pairs:
+            score, reasons = score_pair(rows[first], rows[second])
+            if score >= self.threshold:
+                matches.append((first, second, score, reasons))
+        self._record(connection, matches)
+        return matches
+
+    def run(self, reindex=False, batch_size=1000):
+        """Score every pair that shares a block; returns a dict of counts.
+
+        ``reindex`` rebuilds the blocking keys from the application table
+        first. Blocks are streamed from the key index and the candidates
+        commit in one transaction at the end.
+        """
+        if reindex:
+            self.reindex(batch_size=batch_size)
+        connection = db.session.connection()
+
+        counts = {'blocks': 0, 'skipped_blocks': 0, 'pairs': 0, 'duplicates': 0}
+        seen = set()
+        pending = []
+
+        def flush():
+            rows = self._load(connection, {id_ for pair in pending for id_ in pair})
+            found = []
+            for newer, older in pending:
+                score, reasons = score_pair(rows[newer], rows[older])
+                if score >= self.threshold:
+                    found.append((newer, older, score, reasons))
+            self._record(connection, found)
+            counts['duplicates'] += len(found)
+            pending.clear()
+
+        for block in self._blocks(connection):
+            if len(block) > self.max_block_size:
+                counts['skipped_blocks'] += 1
+                continue
+            counts['blocks'] += 1
+            for i, newer in enumerate(block):
+                for older in block[i + 1:]:
+                    if (newer, older) not in seen:
+                        seen.add((newer, older))
+                        pending.append((newer, older))
+            if len(pending) >= batch_size:
+                counts['pairs'] += len(pending)
+                flush()
+
+        counts['pairs'] += len(pending)
+        if pending:
+            flush()
+        db.session.commit()
+        return counts
+
+    def reindex(self, batch_size=1000):
+        """Rebuild the blocking keys for every application"""
+        connection = db.session.connection()
+        connection.execute(delete(ApplicationBlockKey.__table__))
+        columns = [Application.__table__.c[name] for name in DEDUPE_COLUMNS]
+        last_id = 0
+        while True:
+            rows = connection.execute(
+                select(*columns).where(Application.id > last_id).order_by(Application.id).limit(batch_size)
+            ).fetchall()
+            if not rows:
+                break
+            index_block_keys(connection, rows)
+            last_id = rows[-1].id
+        db.session.commit()
+
+    def review(self, candidate, status, reviewer=None):
+        """Mark a candidate pair confirmed, dismissed or back to pending"""
+        if status not in ('pending', 'confirmed', 'dismissed'):
+            raise ValueError('Invalid status. Must be one of: pending, confirmed, dismissed')
+        candidate.status = status
+        candidate.reviewed_by = reviewer if status != 'pending' else None
+        candidate.reviewed_at = datetime.utcnow() if status != 'pending' else None
+
+    def _blocks(self, connection):
+        """Yield application ids (newest first) sharing each blocking key"""
+        table = ApplicationBlockKey.__table__
+        result = connection.execute(
+            select(table.c.kind, table.c.value, table.c.application_id)
+            .order_by(table.c.kind, table.c.value, table.c.application_id.desc())
+            .execution_options(yield_per=5000)
+        )
+        current, block = None, []
+        for kind, value, application_id in result:
+            if (kind, value) != current:
+                if len(block) > 1:
+                    yield block
+                current, block = (kind, value), []
+            block.append(application_id)
+        if len(block) > 1:
+            yield block
+
+    def _load(self, connection, ids):
+        """{id: row} of the dedupe columns for the given application ids"""
+        columns = [Application.__table__.c[name] for name in DEDUPE_COLUMNS]
+        rows = {}
+        ids = list(ids)
+        for start in range(0, len(ids), 500):
+            for row in connection.execute(select(*columns).where(Application.id.in_(ids[start:start + 500]))):
+                rows[row.id] = row
+        return rows
+
+    def _record(self, connection, matches):
+        """Upsert (application_id, duplicate_of_id, score, reasons) pairs.
+
+        Re-scoring a pair refreshes its score but keeps any review decision.
+        """
+        if not matches:
+            return
+        table = DuplicateCandidate.__table__
+        now = datetime.utcnow()
+        values = [{
+            'application_id': max(first, second),
+            'duplicate_of_id': min(first, second),
+            'score': score,
+            'reasons': json.dumps(reasons),
+            'status': 'pending',
+            'created_at': now,
+            'updated_at': now,
+        } for first, second, score, reasons in matches]
+
+        if connection.dialect.name == 'sqlite':
+            stmt = sqlite_insert(table)
+            connection.execute(stmt.on_conflict_do_update(
+                index_elements=['application_id', 'duplicate_of_id'],
+                set_={'score': stmt.excluded.score, 'reasons': stmt.excluded.reasons, 'updated_at': now}
+            ), values)
+            return
+
+        for value in values:
+            updated = connection.execute(
+                update(table).where(
+                    tuple_(table.c.application_id, table.c.duplicate_of_id)
+                    == tuple_(value['application_id'], value['duplicate_of_id'])
+                ).values(score=value['score'], reasons=value['reasons'], updated_at=now)
+            ).rowcount
+            if not updated:
+                connection.execute(table.insert(), value)
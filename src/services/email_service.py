@@ -1,46 +1,31 @@
-import os
-import smtplib
-from email.mime.multipart import MIMEMultipart
+from flask import current_app, has_app_context
 from email.mime.text import MIMEText
-from email.mime.application import MIMEApplication
 from datetime import datetime
+from .email_templates import EmailMessage, render_email, get_attachment_cache
+
+STATUS_COLORS = {
+    'Pending': '#ffc107',
+    'In Progress': '#17a2b8',
+    'Approved': '#28a745',
+    'Rejected': '#dc3545'
+}
 
 class EmailService:
-    def __init__(self, smtp_server=None, smtp_port=None, username=None, password=None):
-        # For development, we'll use a mock email service
-        # In production, these would be configured with real SMTP settings
-        self.smtp_server = smtp_server or "smtp.gmail.com"
-        self.smtp_port = smtp_port or 587
-        self.username = username or "noreply@statebd.org"
-        self.password = password or "app_password"
-        self.from_email = "noreply@statebd.org"
+    def __init__(self, delivery=None):
+        # EMAIL_DELIVERY picks what happens to a built message:
+        #   'log'    - print it (development default)
+        #   'outbox' - store it in the outbox for `manage.py mail-worker`
+        #   'smtp'   - send it now over the pooled SMTP connections
+        config = current_app.config if has_app_context() else {}
+        self.delivery = delivery or config.get('EMAIL_DELIVERY', 'log')
+        self.from_email = config.get('MAIL_FROM', "noreply@statebd.org")
         self.from_name = "State Bangladesh Society"
     
     def send_application_confirmation(self, application, pdf_bytes=None):
         """Send application confirmation email with PDF attachment"""
         try:
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = f"{self.from_name} <{self.from_email}>"
-            msg['To'] = application.email
-            msg['Subject'] = f"Application Confirmation - {application.reference_number}"
-            
-            # Email body
-            body = self.create_confirmation_email_body(application)
-            msg.attach(MIMEText(body, 'html'))
-            
-            # Attach PDF if provided
-            if pdf_bytes:
-                pdf_attachment = MIMEApplication(pdf_bytes, _subtype='pdf')
-                pdf_attachment.add_header(
-                    'Content-Disposition', 
-                    'attachment', 
-                    filename=f'Application_{application.reference_number}.pdf'
-                )
-                msg.attach(pdf_attachment)
-            
-            # For development, we'll just log the email instead of sending
-            self.log_email(msg, application.email)
+            msg = self.build_application_confirmation(application, pdf_bytes)
+            self.deliver(msg, application.email)
             
             return True
             
@@ -48,99 +33,32 @@ class EmailService:
             print(f"Error sending email: {str(e)}")
             return False
     
+    def build_application_confirmation(self, application, pdf_bytes=None):
+        """Build the confirmation message with the PDF attached"""
+        msg = EmailMessage()
+        msg['From'] = f"{self.from_name} <{self.from_email}>"
+        msg['To'] = application.email
+        msg['Subject'] = f"Application Confirmation - {application.reference_number}"
+        
+        # Email body
+        body = self.create_confirmation_email_body(application)
+        msg.attach(MIMEText(body, 'html'))
+        
+        # Attach PDF if provided; a PDF sent before reuses its encoded part
+        if pdf_bytes:
+            msg.attach(get_attachment_cache().pdf(pdf_bytes, f'Application_{application.reference_number}.pdf'))
+        
+        return msg
+    
     def create_confirmation_email_body(self, application):
         """Create HTML email body for application confirmation"""
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background: #2c5530; color: white; padding: 20px; text-align: center; }}
-                .content {{ padding: 20px; background: #f9f9f9; }}
-                .info-table {{ width: 100%; border-collapse: collapse; margin: 20px 0; }}
-                .info-table th, .info-table td {{ padding: 10px; text-align: left; border-bottom: 1px solid #ddd; }}
-                .info-table th {{ background: #f2f2f2; font-weight: bold; }}
-                .footer {{ background: #2c5530; color: white; padding: 15px; text-align: center; font-size: 12px; }}
-                .status {{ background: #28a745; color: white; padding: 5px 10px; border-radius: 5px; display: inline-block; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>State Bangladesh Society</h1>
-                    <p>Application Confirmation</p>
-                </div>
-                
-                <div class="content">
-                    <h2>Dear {application.full_name},</h2>
-                    
-                    <p>Thank you for submitting your application to State Bangladesh Society. We have successfully received your application and it is currently being processed.</p>
-                    
-                    <h3>Application Details:</h3>
-                    <table class="info-table">
-                        <tr>
-                            <th>Reference Number</th>
-                            <td>{application.reference_number}</td>
-                        </tr>
-                        <tr>
-                            <th>Category</th>
-                            <td>{application.category.name}</td>
-                        </tr>
-                        <tr>
-                            <th>Submission Date</th>
-                            <td>{application.created_at.strftime('%B %d, %Y at %I:%M %p')}</td>
-                        </tr>
-                        <tr>
-                            <th>Current Status</th>
-                            <td><span class="status">{application.status}</span></td>
-                        </tr>
-                    </table>
-                    
-                    <h3>What's Next?</h3>
-                    <ul>
-                        <li>Your application will be reviewed by our team</li>
-                        <li>You will receive updates via email as your application progresses</li>
-                        <li>You can track your application status using your reference number: <strong>{application.reference_number}</strong></li>
-                        <li>If approved, you will be contacted for further steps</li>
-                    </ul>
-                    
-                    <h3>Important Information:</h3>
-                    <ul>
-                        <li>Please save your reference number: <strong>{application.reference_number}</strong></li>
-                        <li>You can track your application status on our website</li>
-                        <li>If you have any questions, please contact us with your reference number</li>
-                        <li>The attached PDF contains your complete application details</li>
-                    </ul>
-                    
-                    <p>Thank you for choosing State Bangladesh Society. We are committed to empowering communities through development projects and social initiatives.</p>
-                </div>
-                
-                <div class="footer">
-                    <p>&copy; 2024 State Bangladesh Society. All rights reserved.</p>
-                    <p>This is an automated email. Please do not reply to this email address.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        return render_email('confirmation.html', 'Application Confirmation', application=application)
     
     def send_status_update(self, application, old_status, new_status):
         """Send status update email to applicant"""
         try:
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = f"{self.from_name} <{self.from_email}>"
-            msg['To'] = application.email
-            msg['Subject'] = f"Application Status Update - {application.reference_number}"
-            
-            # Email body
-            body = self.create_status_update_email_body(application, old_status, new_status)
-            msg.attach(MIMEText(body, 'html'))
-            
-            # For development, we'll just log the email instead of sending
-            self.log_email(msg, application.email)
+            msg = self.build_status_update(application, old_status, new_status)
+            self.deliver(msg, application.email)
             
             return True
             
@@ -148,83 +66,29 @@ class EmailService:
             print(f"Error sending status update email: {str(e)}")
             return False
     
-    def create_status_update_email_body(self, application, old_status, new_status):
-        """Create HTML email body for status update"""
-        status_colors = {
-            'Pending': '#ffc107',
-            'In Progress': '#17a2b8',
-            'Approved': '#28a745',
-            'Rejected': '#dc3545'
-        }
+    def build_status_update(self, application, old_status, new_status):
+        """Build the status update message"""
+        msg = EmailMessage()
+        msg['From'] = f"{self.from_name} <{self.from_email}>"
+        msg['To'] = application.email
+        msg['Subject'] = f"Application Status Update - {application.reference_number}"
         
-        status_color = status_colors.get(new_status, '#6c757d')
+        # Email body
+        body = self.create_status_update_email_body(application, old_status, new_status)
+        msg.attach(MIMEText(body, 'html'))
         
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background: #2c5530; color: white; padding: 20px; text-align: center; }}
-                .content {{ padding: 20px; background: #f9f9f9; }}
-                .status {{ background: {status_color}; color: white; padding: 8px 15px; border-radius: 5px; display: inline-block; font-weight: bold; }}
-                .info-table {{ width: 100%; border-collapse: collapse; margin: 20px 0; }}
-                .info-table th, .info-table td {{ padding: 10px; text-align: left; border-bottom: 1px solid #ddd; }}
-                .info-table th {{ background: #f2f2f2; font-weight: bold; }}
-                .footer {{ background: #2c5530; color: white; padding: 15px; text-align: center; font-size: 12px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>State Bangladesh Society</h1>
-                    <p>Application Status Update</p>
-                </div>
-                
-                <div class="content">
-                    <h2>Dear {application.full_name},</h2>
-                    
-                    <p>We are writing to inform you that the status of your application has been updated.</p>
-                    
-                    <table class="info-table">
-                        <tr>
-                            <th>Reference Number</th>
-                            <td>{application.reference_number}</td>
-                        </tr>
-                        <tr>
-                            <th>Category</th>
-                            <td>{application.category.name}</td>
-                        </tr>
-                        <tr>
-                            <th>Previous Status</th>
-                            <td>{old_status}</td>
-                        </tr>
-                        <tr>
-                            <th>Current Status</th>
-                            <td><span class="status">{new_status}</span></td>
-                        </tr>
-                        <tr>
-                            <th>Updated On</th>
-                            <td>{datetime.now().strftime('%B %d, %Y at %I:%M %p')}</td>
-                        </tr>
-                    </table>
-                    
-                    <p>You can continue to track your application status on our website using your reference number.</p>
-                    
-                    <p>If you have any questions about this update, please contact us with your reference number.</p>
-                    
-                    <p>Thank you for your patience.</p>
-                </div>
-                
-                <div class="footer">
-                    <p>&copy; 2024 State Bangladesh Society. All rights reserved.</p>
-                    <p>This is an automated email. Please do not reply to this email address.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        return msg
+    
+    def create_status_update_email_body(self, application, old_status, new_status):
+        """Create HTML email body for status update"""
+        return render_email(
+            'status_update.html', 'Application Status Update',
+            application=application,
+            old_status=old_status,
+            new_status=new_status,
+            status_color=STATUS_COLORS.get(new_status, '#6c757d'),
+            updated_on=datetime.now()
+        )
     
     def log_email(self, msg, recipient):
         """Log email for development purposes"""
@@ -235,20 +99,25 @@ class EmailService:
         print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("=" * 50)
     
+    def deliver(self, msg, recipient):
+        """Hand a built message to the configured delivery"""
+        if self.delivery == 'outbox':
+            # Commits with the caller's transaction; the mail worker sends it
+            from .mail_delivery import Outbox
+            Outbox().enqueue(msg, recipient, self.from_email)
+        elif self.delivery == 'smtp':
+            if not self.send_real_email(msg):
+                raise RuntimeError('SMTP delivery failed')
+        else:
+            self.log_email(msg, recipient)
+
     def send_real_email(self, msg):
-        """Send real email (for production use)"""
+        """Send real email over the pooled SMTP connections (for production use)"""
+        from .mail_delivery import get_smtp_pool
         try:
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.username, self.password)
-            
-            text = msg.as_string()
-            server.sendmail(self.from_email, msg['To'], text)
-            server.quit()
-            
+            get_smtp_pool().send(self.from_email, msg['To'], msg.as_bytes())
             return True
             
         except Exception as e:
             print(f"Error sending real email: {str(e)}")
             return False
-
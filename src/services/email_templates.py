@@ -0,0 +1,118 @@
+import os
+import secrets
+import binascii
+import threading
+from io import BytesIO
+from collections import OrderedDict
+from functools import lru_cache
+from email.generator import BytesGenerator
+from email.mime.nonmultipart import MIMENonMultipart
+from email.mime.multipart import MIMEMultipart
+from jinja2 import Environment, FileSystemLoader
+from markupsafe import Markup
+
+TEMPLATE_FOLDER = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates', 'email')
+
+# Stands in for the per-message content while the shell is pre-rendered
+_CONTENT_MARKER = '\x00content\x00'
+
+# Templates are compiled on first use and kept for the life of the process
+_environment = Environment(
+    loader=FileSystemLoader(TEMPLATE_FOLDER),
+    autoescape=True,
+    auto_reload=False,
+    cache_size=-1
+)
+
+@lru_cache(maxsize=None)
+def email_shell(subtitle):
+    """The shared page around every email (styles, header, footer), rendered once per subtitle.
+
+    Returns the (head, tail) strings that go either side of the content.
+    """
+    html = _environment.get_template('shell.html').render(subtitle=subtitle, content=Markup(_CONTENT_MARKER))
+    head, tail = html.split(_CONTENT_MARKER)
+    return head, tail
+
+def render_email(template_name, subtitle, **context):
+    """Render an email body template inside the pre-rendered shell"""
+    head, tail = email_shell(subtitle)
+    return head + _environment.get_template(template_name).render(**context) + tail
+
+class _MessageGenerator(BytesGenerator):
+    """Writes attachments encoded by AttachmentCache as a single block.
+
+    The stock generator re-splits a base64 body into lines and writes them
+    one at a time, which costs more than the encoding itself.
+    """
+
+    def _handle_application(self, msg):
+        body = getattr(msg, 'encoded_body', None)
+        if body is None or self._NL != '\n':
+            return super()._handle_text(msg)
+        self._fp.write(body)
+
+class EmailMessage(MIMEMultipart):
+    """multipart/mixed message that serializes cached attachments cheaply"""
+
+    def __init__(self):
+        # A boundary fixed up front spares the generator a search of the
+        # whole message for a collision; '=_' never occurs in base64
+        super().__init__(boundary=f'=_{secrets.token_hex(16)}')
+
+    def as_bytes(self, unixfrom=False, policy=None):
+        fp = BytesIO()
+        _MessageGenerator(fp, mangle_from_=False, policy=policy or self.policy).flatten(self, unixfrom=unixfrom)
+        return fp.getvalue()
+
+    __bytes__ = as_bytes
+
+class AttachmentCache:
+    """Base64-encoded attachment parts, reused for identical bytes.
+
+    MIME parts are only read when a message is serialized, so one encoded
+    part can be attached to any number of messages. Entries are keyed by the
+    attachment bytes themselves (hashed once by Python, then compared), so a
+    PDF resent or retried is never encoded twice.
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.parts = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def pdf(self, data, filename):
+        """An application/pdf part for ``data``"""
+        key = (data, filename)
+        with self.lock:
+            part = self.parts.get(key)
+            if part is not None:
+                self.parts.move_to_end(key)
+                self.hits += 1
+                return part
+
+        # One b2a_base64 call over the whole file, then 76-column lines; the
+        # stdlib encoder calls it once per 57-byte line
+        encoded = binascii.b2a_base64(data, newline=False)
+        body = b''.join([encoded[start:start + 76] + b'\n' for start in range(0, len(encoded), 76)])
+
+        part = MIMENonMultipart('application', 'pdf')
+        part['Content-Transfer-Encoding'] = 'base64'
+        part.add_header('Content-Disposition', 'attachment', filename=filename)
+        part.set_payload(body.decode('ascii'))
+        part.encoded_body = body
+
+        with self.lock:
+            self.misses += 1
+            self.parts[key] = part
+            while len(self.parts) > self.max_entries:
+                self.parts.popitem(last=False)
+        return part
+
+_attachment_cache = AttachmentCache()
+
+def get_attachment_cache():
+    """The process-wide attachment cache"""
+    return _attachment_cache
@@ -0,0 +1,187 @@
+import re
+from sqlalchemy import event, inspect, text, table, column, func, select, Float, literal_column
+from src.models import Application
+
+NAME_FIELDS = ('full_name', 'father_name', 'mother_name')
+
+# Phonetic-key FTS5 index over the name fields (see migration 4)
+application_name_fts = table('application_name_fts', column('rowid'))
+
+# Common abbreviations in romanized Bangla names, expanded before keying
+ABBREVIATIONS = {
+    'md': 'muhammad',
+    'mohd': 'muhammad',
+    'muhd': 'muhammad',
+    'mst': 'mosammat',
+    'most': 'mosammat',
+    'sk': 'sheikh',
+    'shk': 'sheikh',
+}
+
+# Spellings that sound alike in transliteration, applied in order
+_DIGRAPHS = [
+    ('kh', 'k'), ('gh', 'g'), ('ch', 'c'), ('jh', 'j'), ('th', 't'), ('dh', 'd'),
+    ('ph', 'f'), ('bh', 'b'), ('sh', 's'), ('ck', 'k'), ('q', 'k'), ('z', 'j'),
+    ('x', 'ks'), ('v', 'b'),
+]
+_VOWELS = set('aeiouwy')
+_WORD = re.compile(r'[a-z]+')
+
+def normalize_name(name):
+    """Lowercase letter-only tokens with abbreviations expanded"""
+    tokens = _WORD.findall((name or '').lower())
+    return [ABBREVIATIONS.get(token, token) for token in tokens]
+
+def phonetic_key(token):
+    """Consonant skeleton of a romanized name token.
+
+    Vowels (and vowel-like w/y) carry most of the spelling variation, so
+    they are dropped after the first letter; a leading vowel becomes 'a'.
+    Mohammad, Muhammed and Md. all key to 'mhmd'; Akter and Akhter to 'aktr'.
+    """
+    for source, target in _DIGRAPHS:
+        token = token.replace(source, target)
+    if not token:
+        return ''
+
+    key = ['a' if token[0] in _VOWELS else token[0]]
+    for char in token[1:]:
+        if char in _VOWELS or char == key[-1]:
+            continue
+        key.append(char)
+
+    # A trailing h is silent (Shah, Sheikh -> shk -> sk)
+    if len(key) > 1 and key[-1] == 'h':
+        key.pop()
+    return ''.join(key)
+
+def name_keys(name):
+    """Space-separated phonetic keys for a name, as stored in the index"""
+    return ' '.join(key for key in (phonetic_key(token) for token in normalize_name(name)) if key)
+
+def trigrams(value):
+    padded = f'  {value} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def similarity(query, name):
+    """Trigram Jaccard similarity of two normalized names (0..1)"""
+    a = trigrams(' '.join(normalize_name(query)))
+    b = trigrams(' '.join(normalize_name(name)))
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def index_application_names(connection, rows):
+    """(Re)index (id, full_name, father_name, mother_name) rows"""
+    rows = list(rows)
+    if not rows:
+        return
+    connection.execute(
+        text('DELETE FROM application_name_fts WHERE rowid = :id'),
+        [{'id': row[0]} for row in rows]
+    )
+    connection.execute(
+        text('INSERT INTO application_name_fts (rowid, full_name, father_name, mother_name) '
+             'VALUES (:id, :full_name, :father_name, :mother_name)'),
+        [{
+            'id': row[0],
+            'full_name': name_keys(row[1]),
+            'father_name': name_keys(row[2]),
+            'mother_name': name_keys(row[3]),
+        } for row in rows]
+    )
+
+def _index_on_insert(mapper, connection, target):
+    if connection.dialect.name != 'sqlite':
+        return
+    index_application_names(connection, [(target.id, target.full_name, target.father_name, target.mother_name)])
+
+def _index_on_update(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in NAME_FIELDS):
+        _index_on_insert(mapper, connection, target)
+
+def _unindex_on_delete(mapper, connection, target):
+    if connection.dialect.name != 'sqlite':
+        return
+    connection.execute(text('DELETE FROM application_name_fts WHERE rowid = :id'), {'id': target.id})
+
+# Keep the index in step with ORM writes; bulk Core inserts must call
+# index_application_names themselves
+event.listen(Application, 'after_insert', _index_on_insert)
+event.listen(Application, 'after_update', _index_on_update)
+event.listen(Application, 'after_delete', _unindex_on_delete)
+
+class FuzzyNameSearch:
+    """Transliteration-tolerant name search.
+
+    Candidates come from the phonetic-key FTS5 index (every query token's key
+    must match within the searched name fields), best ``candidate_limit`` by
+    bm25, then are re-ranked by trigram similarity to the actual names.
+    Searching only ``full_name`` (the default) keeps the matched set, and so
+    the bm25 ranking work, several times smaller on large tables. After a
+    search, ``truncated`` tells whether more names matched than were ranked.
+    """
+
+    # bm25 weights for full_name, father_name, mother_name
+    WEIGHTS = (10.0, 2.0, 2.0)
+
+    def __init__(self, fields=('full_name',), candidate_limit=200):
+        unknown = [name for name in fields if name not in NAME_FIELDS]
+        if unknown or not fields:
+            raise ValueError(f"Fuzzy search fields must be among: {', '.join(NAME_FIELDS)}")
+        self.fields = tuple(fields)
+        self.candidate_limit = candidate_limit
+        self.truncated = False
+
+    def match_query(self, text_query):
+        keys = [key for key in (phonetic_key(token) for token in normalize_name(text_query)) if key]
+        if not keys:
+            return None
+        terms = ' '.join(f'"{key}"' for key in dict.fromkeys(keys))
+        return f"{{{' '.join(self.fields)}}} : ({terms})"
+
+    def candidates(self, text_query):
+        """Subquery of (rowid, score) for indexed names matching the query"""
+        match = self.match_query(text_query)
+        if match is None:
+            return None
+
+        weights = ', '.join(str(weight) for weight in self.WEIGHTS)
+        score = -func.bm25(literal_column('application_name_fts'), literal_column(weights), type_=Float)
+        return select(
+            application_name_fts.c.rowid.label('rowid'),
+            score.label('score')
+        ).where(
+            literal_column('application_name_fts').op('MATCH')(match)
+        ).subquery('fuzzy')
+
+    def search(self, query, text_query, names):
+        """Return [(item, similarity)] best first for an application query.
+
+        ``query`` may already carry filters; ``names`` maps a result item to
+        its (full_name, father_name, mother_name). At most ``candidate_limit``
+        items are returned.
+        """
+        self.truncated = False
+        candidates = self.candidates(text_query)
+        if candidates is None:
+            return []
+
+        # One extra row tells whether the candidate set was cut off
+        items = query.join(candidates, candidates.c.rowid == Application.id).order_by(
+            candidates.c.score.desc()
+        ).limit(self.candidate_limit + 1).all()
+        self.truncated = len(items) > self.candidate_limit
+        items = items[:self.candidate_limit]
+
+        ranked = []
+        for item in items:
+            # Parents' names count for a little less than the applicant's own
+            score = max(
+                similarity(text_query, name) * (1.0 if field == 'full_name' else 0.8)
+                for field, name in zip(NAME_FIELDS, names(item)) if field in self.fields
+            )
+            ranked.append((item, score))
+        ranked.sort(key=lambda entry: entry[1], reverse=True)
+        return ranked
@@ -0,0 +1,45 @@
+import hashlib
+from flask import request, current_app
+from sqlalchemy import event, select
+from sqlalchemy.orm import object_session
+from werkzeug.http import is_resource_modified
+from src.models import db, Category, CacheVersion
+from .cache_coherence import bump_on_commit
+
+# Browsers may store these but must revalidate before every use, which the
+# validators make cheap; applicant data stays out of shared caches
+PUBLIC = 'public, no-cache'
+PRIVATE = 'private, no-cache'
+
+def get_version(namespace):
+    """(version, updated_at) of a namespace; (0, None) until it is first bumped"""
+    row = db.session.execute(
+        select(CacheVersion.version, CacheVersion.updated_at).where(CacheVersion.namespace == namespace)
+    ).first()
+    return (row.version, row.updated_at) if row else (0, None)
+
+def make_etag(*parts):
+    """Strong entity tag for a representation identified by ``parts``"""
+    return hashlib.sha256('\x1f'.join(str(part) for part in parts).encode('utf-8')).hexdigest()[:32]
+
+def not_modified(etag, last_modified=None, cache_control=PRIVATE):
+    """A 304 response if the client's copy is current (If-None-Match/If-Modified-Since), else None"""
+    if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        return None
+    return with_validators(current_app.response_class(status=304), etag, last_modified, cache_control)
+
+def with_validators(response, etag, last_modified=None, cache_control=PRIVATE):
+    """Set ETag, Last-Modified and Cache-Control on a response"""
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+def _bump_categories(mapper, connection, target):
+    bump_on_commit(object_session(target), 'categories', connection)
+
+# Any ORM write to a category changes what GET /categories returns
+event.listen(Category, 'after_insert', _bump_categories)
+event.listen(Category, 'after_update', _bump_categories)
+event.listen(Category, 'after_delete', _bump_categories)
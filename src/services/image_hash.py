@@ -0,0 +1,173 @@
+import heapq
+from datetime import datetime
+from itertools import combinations
+from PIL import Image, ImageOps
+from sqlalchemy import select, union_all, or_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from src.models import db, Application, ImageHash
+
+# Upload folders whose images are hashed, and the Application column of each
+HASHED_FOLDERS = {
+    'photos': 'photo_path',
+    'signatures': 'signature_path',
+    'nid_images': 'nid_image_path',
+}
+
+HASH_SIZE = 8  # 8x8 comparisons -> 64 bits
+BANDS = 4
+BAND_BITS = 64 // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+# Radius 2 per band is 137 probes each; beyond that a scan is cheaper
+MAX_THRESHOLD = BANDS * 3 - 1
+
+def dhash(image):
+    """64-bit difference hash: is each pixel brighter than its right neighbour?
+
+    Robust to rescaling, recompression and small brightness changes, which
+    is what re-uploads of the same photo or scan go through.
+    """
+    # Let the JPEG decoder downscale while decoding
+    image.draft('L', (HASH_SIZE * 8, HASH_SIZE * 8))
+    pixels = list(image.convert('L').resize((HASH_SIZE + 1, HASH_SIZE), Image.LANCZOS).getdata())
+    value = 0
+    for row in range(HASH_SIZE):
+        offset = row * (HASH_SIZE + 1)
+        for col in range(HASH_SIZE):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+def hash_image_file(path):
+    """dHash of an image file, or None if it can't be read"""
+    try:
+        with Image.open(path) as image:
+            # Originals keep their EXIF orientation; hash them upright
+            image.draft('L', (HASH_SIZE * 8, HASH_SIZE * 8))
+            return dhash(ImageOps.exif_transpose(image))
+    except Exception as e:
+        print(f"Error hashing image {path}: {str(e)}")
+        return None
+
+def hamming(a, b):
+    return ((a ^ b) & 0xFFFFFFFFFFFFFFFF).bit_count()
+
+def to_signed(value):
+    """Fit an unsigned 64-bit hash into a signed INTEGER column"""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+def bands(value):
+    """The hash's 16-bit bands, most significant first"""
+    value &= 0xFFFFFFFFFFFFFFFF
+    return [(value >> (BAND_BITS * (BANDS - 1 - i))) & BAND_MASK for i in range(BANDS)]
+
+def band_neighbours(band, radius):
+    """Every band value within ``radius`` bits of ``band``"""
+    values = [band]
+    for distance in range(1, radius + 1):
+        for bits in combinations(range(BAND_BITS), distance):
+            flipped = band
+            for bit in bits:
+                flipped ^= 1 << bit
+            values.append(flipped)
+    return values
+
+class ImageHashIndex:
+    """Multi-index hashing over the image_hash table.
+
+    Two hashes within Hamming distance ``d`` must agree to within
+    ``d // 4`` bits on at least one of their four 16-bit bands (pigeonhole),
+    so a lookup probes each band's index for those few values and only
+    checks the exact distance on the rows that come back, instead of
+    comparing against every stored hash.
+    """
+
+    def add(self, relative_path, full_path):
+        """Hash an image unless already indexed (the caller commits)"""
+        if self.is_indexed(relative_path):
+            return None
+        value = hash_image_file(full_path)
+        if value is None:
+            return None
+        self.insert(relative_path, value)
+        return value
+
+    def insert(self, relative_path, value):
+        """Index an already computed hash (the caller commits)"""
+        row = {'path': relative_path, 'hash': to_signed(value), 'created_at': datetime.utcnow()}
+        row.update({f'band_{i}': band for i, band in enumerate(bands(value))})
+        table = ImageHash.__table__
+        if db.session.get_bind().dialect.name == 'sqlite':
+            db.session.execute(sqlite_insert(table).values(**row).on_conflict_do_nothing(index_elements=['path']))
+        elif not self.is_indexed(relative_path):
+            # Another submission may have indexed the same object meanwhile
+            db.session.add(ImageHash(**row))
+
+    def is_indexed(self, relative_path):
+        return db.session.query(ImageHash.id).filter_by(path=relative_path).first() is not None
+
+    def lookup(self, value, threshold=6, limit=None):
+        """[(path, distance)] of indexed images within ``threshold`` bits, closest first
+
+        With ``limit``, only that many of the closest images are returned.
+        """
+        if not 0 <= threshold <= MAX_THRESHOLD:
+            raise ValueError(f'Threshold must be between 0 and {MAX_THRESHOLD}')
+
+        radius = threshold // BANDS
+        table = ImageHash.__table__
+        probes = union_all(*[
+            select(table.c.path, table.c.hash).where(table.c[f'band_{i}'].in_(band_neighbours(band, radius)))
+            for i, band in enumerate(bands(value))
+        ])
+
+        matches = {}
+        for path, stored in db.session.execute(probes):
+            distance = hamming(value, stored)
+            if distance <= threshold:
+                matches[path] = distance
+        if limit is not None:
+            return heapq.nsmallest(limit, matches.items(), key=lambda match: match[1])
+        return sorted(matches.items(), key=lambda match: match[1])
+
+    def similar_applications(self, application, threshold=6, limit=50):
+        """Other applications whose images are near-duplicates of this one's.
+
+        Returns one entry per hashed image of the application, with the
+        matching applications and which of their images matched. Only the
+        ``limit`` closest images are looked up, so a hash shared by many
+        uploads cannot grow the query without bound.
+        """
+        results = []
+        for folder, column in HASHED_FOLDERS.items():
+            path = getattr(application, column)
+            stored = db.session.query(ImageHash.hash).filter_by(path=path).scalar() if path else None
+            if stored is None:
+                continue
+
+            distances = dict(self.lookup(stored, threshold, limit=limit))
+            columns = [getattr(Application, name) for name in HASHED_FOLDERS.values()]
+            others = Application.query.filter(
+                Application.id != application.id,
+                or_(*[column_.in_(list(distances)) for column_ in columns])
+            ).order_by(Application.id.desc()).limit(limit).all()
+
+            matches = []
+            for other in others:
+                for other_folder, other_column in HASHED_FOLDERS.items():
+                    other_path = getattr(other, other_column)
+                    if other_path in distances:
+                        matches.append({
+                            'application_id': other.id,
+                            'reference_number': other.reference_number,
+                            'full_name': other.full_name,
+                            'status': other.status,
+                            'image': other_folder,
+                            'distance': distances[other_path]
+                        })
+            matches.sort(key=lambda match: (match['distance'], -match['application_id']))
+            results.append({
+                'image': folder,
+                'hash': f'{stored & 0xFFFFFFFFFFFFFFFF:016x}',
+                'matches': matches
+            })
+        return results
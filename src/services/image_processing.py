@@ -0,0 +1,126 @@
+import os
+from PIL import Image, ImageOps
+from .storage import resolve_upload
+
+IMAGE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
+
+# Derivatives generated per upload folder: variant -> (size, mode)
+# 'fit' crops to the box aspect ratio, 'pad' keeps the whole image on white.
+# PDF sizes are the letter's image boxes at 200 dpi.
+DERIVATIVES = {
+    'photos': {
+        'pdf': ((300, 400), 'fit'),
+        'thumb': ((120, 160), 'fit'),
+    },
+    'signatures': {
+        'pdf': ((400, 200), 'pad'),
+        'thumb': ((160, 80), 'pad'),
+    },
+    'nid_images': {
+        'thumb': ((240, 150), 'pad'),
+    },
+}
+
+JPEG_QUALITY = 85
+
+def is_image(path):
+    """Check whether a path has an image extension"""
+    return '.' in path and path.rsplit('.', 1)[1].lower() in IMAGE_EXTENSIONS
+
+def derivative_path(relative_path, folder, variant):
+    """Path of a derivative next to its original, e.g. a.jpg -> a.photos.pdf.jpg
+
+    The folder is part of the name because identical bytes uploaded as a
+    photo and as a signature share one stored original.
+    """
+    base = relative_path.rsplit('.', 1)[0]
+    return f'{base}.{folder}.{variant}.jpg'
+
+def resolve_image(upload_folder, relative_path, folder, variant):
+    """Absolute path of the derivative if it exists, else of the original"""
+    if not relative_path:
+        return None
+
+    derived = resolve_upload(upload_folder, derivative_path(relative_path, folder, variant))
+    if derived and os.path.exists(derived):
+        return derived
+
+    original = resolve_upload(upload_folder, relative_path)
+    return original if original and os.path.exists(original) else None
+
+class ImageProcessor:
+    """Builds normalized, right-sized derivatives of uploaded images"""
+
+    def __init__(self, upload_folder):
+        self.upload_folder = upload_folder
+
+    def process(self, relative_path, folder):
+        """Write the derivatives of an existing upload; the original is kept as uploaded"""
+        if not is_image(relative_path):
+            return []
+        return self.create_derivatives(relative_path, folder)
+
+    def create_derivatives(self, relative_path, folder, missing_only=False):
+        """Write the derivatives configured for a folder"""
+        variants = DERIVATIVES.get(folder, {})
+        if missing_only:
+            variants = {
+                variant: spec for variant, spec in variants.items()
+                if not os.path.exists(resolve_upload(self.upload_folder, derivative_path(relative_path, folder, variant)))
+            }
+        if not variants:
+            return []
+
+        created = []
+        try:
+            with Image.open(resolve_upload(self.upload_folder, relative_path)) as source:
+                # Let the JPEG decoder downscale while decoding
+                largest = max(size for size, _ in variants.values())
+                source.draft('RGB', (largest[0] * 2, largest[1] * 2))
+                image = self.normalize(source)
+
+            for variant, (size, mode) in variants.items():
+                variant_path = derivative_path(relative_path, folder, variant)
+                self.save_image(self.resize(image, size, mode), resolve_upload(self.upload_folder, variant_path), 'JPEG')
+                created.append(variant_path)
+
+        except Exception as e:
+            print(f"Error creating derivatives for {relative_path}: {str(e)}")
+        return created
+
+    def normalize(self, image):
+        """Apply EXIF orientation and drop metadata by copying pixels only"""
+        image = ImageOps.exif_transpose(image)
+
+        if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+            image = image.convert('RGBA')
+        elif image.mode != 'L':
+            image = image.convert('RGB')
+
+        # A fresh image carries no EXIF, ICC or comment data
+        clean = Image.new(image.mode, image.size)
+        clean.paste(image)
+        return clean
+
+    def resize(self, image, size, mode):
+        """Resize to fit the derivative box"""
+        if mode == 'fit':
+            return ImageOps.fit(image.convert('RGB'), size, Image.LANCZOS)
+
+        # Flatten transparency onto white so signatures stay legible
+        if image.mode == 'RGBA':
+            background = Image.new('RGB', image.size, 'white')
+            background.paste(image, mask=image.getchannel('A'))
+            image = background
+        return ImageOps.pad(image.convert('RGB'), size, Image.LANCZOS, color='white')
+
+    def save_image(self, image, path, image_format):
+        """Save in the given format (JPEG, PNG or GIF)"""
+        if image_format == 'JPEG':
+            if image.mode not in ('RGB', 'L'):
+                image = image.convert('RGB')
+            image.save(path, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+        elif image_format == 'PNG':
+            image.save(path, 'PNG', optimize=True)
+        else:
+            image.save(path, image_format)
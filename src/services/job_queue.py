@@ -0,0 +1,298 @@
+import os
+import random
+import signal
+import socket
+import threading
+import json
+import multiprocessing
+import traceback
+from datetime import datetime, timedelta
+from src.models import db, Job, Application
+from .email_service import EmailService
+from .pdf_cache import get_pdf_cache
+
+# Registered job handlers keyed by job kind
+JOB_HANDLERS = {}
+
+def job_handler(kind):
+    """Register a function as the handler for a job kind"""
+    def decorator(func):
+        JOB_HANDLERS[kind] = func
+        return func
+    return decorator
+
+class JobQueue:
+    """Durable job queue stored in the application database.
+
+    Jobs are added to the current session by ``enqueue`` so they commit in
+    the same transaction as the rows they refer to.
+    """
+
+    def __init__(self, retry_base_delay=30, max_retry_delay=3600):
+        self.retry_base_delay = retry_base_delay
+        self.max_retry_delay = max_retry_delay
+
+    def enqueue(self, kind, payload=None, max_attempts=5, run_at=None):
+        """Add a job to the session (the caller commits)"""
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f'Unknown job kind: {kind}')
+
+        job = Job(
+            kind=kind,
+            payload=json.dumps(payload or {}),
+            max_attempts=max_attempts,
+            run_at=run_at or datetime.utcnow()
+        )
+        db.session.add(job)
+        return job
+
+    def enqueue_many(self, kind, payloads, max_attempts=5):
+        """Insert one job per payload in a single executemany (the caller commits)"""
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f'Unknown job kind: {kind}')
+
+        now = datetime.utcnow()
+        rows = [{
+            'kind': kind,
+            'payload': json.dumps(payload or {}),
+            'status': 'queued',
+            'attempts': 0,
+            'max_attempts': max_attempts,
+            'run_at': now,
+            'created_at': now,
+            'updated_at': now
+        } for payload in payloads]
+        if rows:
+            db.session.execute(Job.__table__.insert(), rows)
+        return len(rows)
+
+    def get(self, job_id):
+        """Get a job by id"""
+        return db.session.get(Job, job_id)
+
+    def claim_next(self, worker_id):
+        """Atomically claim the next due job, or return None"""
+        for _ in range(5):
+            now = datetime.utcnow()
+            job_id = db.session.query(Job.id).filter(
+                Job.status == 'queued',
+                Job.run_at <= now
+            ).order_by(Job.run_at, Job.id).limit(1).scalar()
+
+            if job_id is None:
+                db.session.commit()
+                return None
+
+            # Only one worker can move the row out of the queued state
+            claimed = Job.query.filter_by(id=job_id, status='queued').update({
+                'status': 'running',
+                'attempts': Job.attempts + 1,
+                'locked_by': worker_id,
+                'locked_at': now,
+                'updated_at': now
+            }, synchronize_session=False)
+            db.session.commit()
+
+            if claimed:
+                return db.session.get(Job, job_id)
+        return None
+
+    def mark_done(self, job):
+        """Mark a job as finished"""
+        job.status = 'done'
+        job.finished_at = datetime.utcnow()
+        job.locked_by = None
+        job.locked_at = None
+        job.last_error = None
+        db.session.commit()
+
+    def mark_failed(self, job, error):
+        """Schedule a retry with exponential backoff, or fail permanently"""
+        job.last_error = error
+        job.locked_by = None
+        job.locked_at = None
+
+        if job.attempts >= job.max_attempts:
+            job.status = 'failed'
+            job.finished_at = datetime.utcnow()
+        else:
+            job.status = 'queued'
+            job.run_at = datetime.utcnow() + timedelta(seconds=self.retry_delay(job.attempts))
+        db.session.commit()
+
+    def retry_delay(self, attempts):
+        """Seconds to wait before the next attempt"""
+        delay = min(self.retry_base_delay * (2 ** max(attempts - 1, 0)), self.max_retry_delay)
+        # Jitter keeps a burst of failures from retrying in lockstep
+        return delay * random.uniform(0.8, 1.2)
+
+    def requeue_stale(self, stale_after=600):
+        """Return jobs held by crashed workers to the queue"""
+        cutoff = datetime.utcnow() - timedelta(seconds=stale_after)
+        stale_jobs = Job.query.filter(
+            Job.status == 'running',
+            Job.locked_at < cutoff
+        ).all()
+
+        for job in stale_jobs:
+            if job.attempts < job.max_attempts:
+                job.status = 'queued'
+            else:
+                job.status = 'failed'
+                job.finished_at = datetime.utcnow()
+            job.last_error = f'Worker {job.locked_by} did not finish the job'
+            job.locked_by = None
+            job.locked_at = None
+
+        db.session.commit()
+        return len(stale_jobs)
+
+class JobWorker:
+    """Runs queued jobs inside an application context"""
+
+    def __init__(self, app, worker_id=None, poll_interval=1.0, stale_after=600):
+        self.app = app
+        self.worker_id = worker_id or f'{socket.gethostname()}:{os.getpid()}'
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.queue = JobQueue()
+
+    def run(self, stop_event=None, max_jobs=None, drain=False):
+        """Process jobs until stopped, max_jobs have run, or (with drain) the queue is empty"""
+        stop_event = stop_event or threading.Event()
+        processed = 0
+        with self.app.app_context():
+            self.queue.requeue_stale(self.stale_after)
+
+            while not stop_event.is_set():
+                if max_jobs is not None and processed >= max_jobs:
+                    break
+
+                if self.run_once():
+                    processed += 1
+                elif drain:
+                    break
+                else:
+                    self.queue.requeue_stale(self.stale_after)
+                    stop_event.wait(self.poll_interval)
+
+        return processed
+
+    def run_once(self):
+        """Claim and run a single job. Returns False when the queue is empty."""
+        job = self.queue.claim_next(self.worker_id)
+        if job is None:
+            return False
+
+        try:
+            handler = JOB_HANDLERS.get(job.kind)
+            if handler is None:
+                raise ValueError(f'No handler registered for job kind {job.kind}')
+
+            handler(job.get_payload())
+            self.queue.mark_done(job)
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error running job {job.id} ({job.kind}): {str(e)}")
+            self.queue.mark_failed(job, f'{str(e)}\n{traceback.format_exc()}')
+
+        finally:
+            # Start every job with an empty identity map
+            db.session.remove()
+
+        return True
+
+def _worker_process_main(index, poll_interval, stop_event):
+    """Entry point for pooled worker processes"""
+    # The parent process coordinates shutdown
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    from src.main import app
+
+    # Don't share pooled connections inherited from the parent process
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+    worker_id = f'{socket.gethostname()}:{os.getpid()}:{index}'
+    JobWorker(app, worker_id=worker_id, poll_interval=poll_interval).run(stop_event)
+
+def run_worker_pool(processes=2, poll_interval=1.0):
+    """Run a pool of worker processes until interrupted"""
+    ctx = multiprocessing.get_context()
+    stop_event = ctx.Event()
+
+    workers = [
+        ctx.Process(
+            target=_worker_process_main,
+            args=(index, poll_interval, stop_event),
+            name=f'job-worker-{index}'
+        )
+        for index in range(processes)
+    ]
+
+    def request_stop(signum, frame):
+        stop_event.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+
+    for worker in workers:
+        worker.start()
+
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        stop_event.set()
+        for worker in workers:
+            worker.join()
+
+@job_handler('application_confirmation')
+def send_application_confirmation_job(payload):
+    """Render the application PDF and send the confirmation email"""
+    application = db.session.get(Application, payload['application_id'])
+    if application is None:
+        return
+
+    # Rendering through the cache also warms it for the applicant's download
+    pdf_bytes = get_pdf_cache().get_bytes(application)
+    if not pdf_bytes:
+        raise RuntimeError('Error generating PDF for email')
+
+    email_service = EmailService()
+    if not email_service.send_application_confirmation(application, pdf_bytes):
+        raise RuntimeError('Error sending confirmation email')
+
+@job_handler('status_update')
+def send_status_update_job(payload):
+    """Send the status update email"""
+    application = db.session.get(Application, payload['application_id'])
+    if application is None:
+        return
+
+    email_service = EmailService()
+    if not email_service.send_status_update(application, payload['old_status'], payload['new_status']):
+        raise RuntimeError('Error sending status update email')
+
+@job_handler('status_update_batch')
+def send_status_update_batch_job(payload):
+    """Send the status update emails for a bulk status change"""
+    old_statuses = {application_id: old_status for application_id, old_status in payload['changes']}
+    applications = Application.query.filter(Application.id.in_(list(old_statuses))).all()
+
+    email_service = EmailService()
+    failed = [
+        application for application in applications
+        if not email_service.send_status_update(application, old_statuses[application.id], payload['new_status'])
+    ]
+
+    # Retry only the failures, each with its own backoff, rather than
+    # resending the whole batch; they commit when this job is marked done
+    queue = JobQueue()
+    for application in failed:
+        queue.enqueue('status_update', {
+            'application_id': application.id,
+            'old_status': old_statuses[application.id],
+            'new_status': payload['new_status']
+        })
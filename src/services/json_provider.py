@@ -0,0 +1,101 @@
+import json
+import uuid
+import gzip
+import decimal
+import dataclasses
+from datetime import date, datetime, time
+from flask import request, current_app
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Optional: the stdlib encoder is used without it
+    orjson = None
+
+def _default(value):
+    """Encode what JSON has no type for; dates become ISO 8601 strings"""
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if hasattr(value, '__html__'):
+        return str(value.__html__())
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON for the app through orjson when it is installed.
+
+    orjson writes dates and datetimes as ISO 8601 itself, so row-based
+    serializers can hand them over as they are; the stdlib fallback produces
+    the same output through ``_default``. Responses are built from orjson's bytes without a
+    round trip through str.
+    """
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            kwargs.setdefault('default', _default)
+            kwargs.setdefault('sort_keys', self.sort_keys)
+            kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+            return json.dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self._options()).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if orjson is None:
+            return super().response(obj)
+
+        options = self._options()
+        if self.compact is None and self._app.debug:
+            options |= orjson.OPT_INDENT_2
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=options) + b'\n',
+            mimetype=self.mimetype
+        )
+
+    def _options(self):
+        # Keys may be ints (e.g. counts by id), as the stdlib allows
+        options = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return options
+
+def compress_response(response):
+    """gzip a JSON response when the client accepts it and it is big enough.
+
+    Registered with ``after_request``; sizes and level come from
+    COMPRESS_MIN_BYTES and COMPRESS_LEVEL.
+    """
+    if (
+        response.mimetype != 'application/json'
+        or response.direct_passthrough
+        or response.is_streamed
+        or not 200 <= response.status_code < 300
+        or 'Content-Encoding' in response.headers
+    ):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    if not request.accept_encodings['gzip']:
+        return response
+
+    data = response.get_data()
+    if len(data) < current_app.config.get('COMPRESS_MIN_BYTES', 1024):
+        return response
+
+    # mtime=0 gives the same bytes for the same body
+    response.set_data(gzip.compress(data, compresslevel=current_app.config.get('COMPRESS_LEVEL', 6), mtime=0))
+    response.headers['Content-Encoding'] = 'gzip'
+
+    # The gzip bytes are another representation of the same data: a weak
+    # tag still matches If-None-Match but makes no byte-for-byte claim
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
@@ -0,0 +1,229 @@
+import time
+import threading
+from collections import OrderedDict, namedtuple
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from src.models import Application, Category
+from .cache_coherence import coherence, sync_caches, bump_on_commit
+from .pagination import clear_counts
+
+# What a cached lookup answers with: the JSON body as sent, and the
+# validators that went with it (None for lookups without them)
+CachedResponse = namedtuple('CachedResponse', ['body', 'etag', 'last_modified'])
+
+class _Entry:
+    __slots__ = ('response', 'expires', 'ids', 'nid')
+
+    def __init__(self, response, expires, ids, nid):
+        self.response = response
+        self.expires = expires
+        self.ids = ids
+        self.nid = nid
+
+class LookupCache:
+    """Bounded LRU of serialized application lookups, with a TTL.
+
+    Entries are keyed by what the client asked for (kind, reference or NID,
+    fields) and remember the application ids in the body, plus the NID for
+    NID lookups, so a write drops exactly the entries it makes stale: an
+    update or delete drops every entry showing that application, a new
+    application drops the lookups of its NID. The TTL bounds how long
+    writes made by other processes can go unseen.
+
+    A fill that started before an invalidation is not stored, so a reader
+    racing a writer cannot put the old body back after the commit.
+    """
+
+    def __init__(self, max_entries=10000, ttl=30):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._by_id = {}
+        self._by_nid = {}
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        """The CachedResponse for ``key``, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.response
+
+    def put(self, key, response, ids, nid=None, generation=None):
+        """Store a response showing applications ``ids``.
+
+        ``generation`` is the value of ``self.generation`` read before the
+        data was loaded; the entry is dropped if anything was invalidated
+        since.
+        """
+        if self.max_entries <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(response, time.monotonic() + self.ttl, tuple(ids), nid)
+            for application_id in ids:
+                self._by_id.setdefault(application_id, set()).add(key)
+            if nid is not None:
+                self._by_nid.setdefault(nid, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, ids=(), nids=()):
+        """Drop the entries showing any of ``ids`` and the lookups of ``nids``"""
+        with self._lock:
+            self.generation += 1
+            keys = set()
+            for application_id in ids:
+                keys |= self._by_id.get(application_id, set())
+            for nid in nids:
+                keys |= self._by_nid.get(nid, set())
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._by_id.clear()
+            self._by_nid.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        for application_id in entry.ids:
+            keys = self._by_id.get(application_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_id[application_id]
+        if entry.nid is not None:
+            keys = self._by_nid.get(entry.nid)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_nid[entry.nid]
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_lookup_cache():
+    """Return the process-wide lookup cache, sized from the app config.
+
+    Entries made stale by other processes' writes are dropped first.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LookupCache(
+                max_entries=current_app.config.get('LOOKUP_CACHE_MAX_ENTRIES', 10000),
+                ttl=current_app.config.get('LOOKUP_CACHE_TTL', 30)
+            )
+    sync_caches()
+    return _cache
+
+def invalidate_on_commit(session, ids=(), nids=(), connection=None):
+    """Drop cached lookups for these applications once ``session`` commits.
+
+    Writes that bypass the ORM (Core inserts and updates) must call this
+    themselves; ORM writes are picked up by the mapper events below. The
+    ``applications`` version is bumped in the same transaction so other
+    processes drop their lookups too.
+    """
+    bump_on_commit(session, 'applications', connection)
+    pending = _pending(session)
+    pending['ids'].update(ids)
+    pending['nids'].update(nid for nid in nids if nid)
+
+def _pending(session):
+    return session.info.setdefault('lookup_invalidations', {'ids': set(), 'nids': set(), 'everything': False})
+
+def _apply_invalidations(session):
+    pending = session.info.pop('lookup_invalidations', None)
+    if pending is None:
+        return
+    # Listing totals may have moved too
+    clear_counts()
+    if _cache is None:
+        return
+    if pending['everything']:
+        _cache.clear()
+    else:
+        _cache.invalidate(pending['ids'], pending['nids'])
+
+def _clear_cache():
+    if _cache is not None:
+        _cache.clear()
+
+def _discard_invalidations(session, transaction):
+    # Runs after after_commit, so anything left belongs to a rolled back write
+    if transaction.parent is None:
+        session.info.pop('lookup_invalidations', None)
+
+def _on_application_insert(mapper, connection, target):
+    # A new application joins the lookups of its NID
+    invalidate_on_commit(object_session(target), nids=[target.nid_number], connection=connection)
+
+def _on_application_update(mapper, connection, target):
+    # Entries showing it go; if the NID changed, the new NID's lookups gain it
+    invalidate_on_commit(object_session(target), ids=[target.id], nids=[target.nid_number], connection=connection)
+
+def _on_application_delete(mapper, connection, target):
+    invalidate_on_commit(object_session(target), ids=[target.id], connection=connection)
+
+def _on_category_change(mapper, connection, target):
+    # Every body carries its category's name; the categories version is
+    # bumped by http_cache
+    _pending(object_session(target))['everything'] = True
+
+event.listen(Application, 'after_insert', _on_application_insert)
+event.listen(Application, 'after_update', _on_application_update)
+event.listen(Application, 'after_delete', _on_application_delete)
+event.listen(Category, 'after_update', _on_category_change)
+event.listen(Category, 'after_delete', _on_category_change)
+
+# Invalidate only once the write is visible to other connections, and not
+# at all if it never happens
+event.listen(Session, 'after_commit', _apply_invalidations)
+event.listen(Session, 'after_transaction_end', _discard_invalidations)
+
+# Writes made by other processes (workers, manage.py) are only known by
+# their version bumps, so they drop everything
+coherence.register('applications', _clear_cache)
+coherence.register('applications', clear_counts)
+coherence.register('categories', _clear_cache)
@@ -0,0 +1,378 @@
+import os
+import time
+import uuid
+import queue
+import random
+import socket
+import smtplib
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app, has_app_context
+from sqlalchemy import update
+from src.models import db, OutboundEmail
+
+def smtp_settings(config=None):
+    """SMTP connection settings from the app config"""
+    if config is None:
+        config = current_app.config if has_app_context() else {}
+    return {
+        'host': config.get('SMTP_HOST', 'localhost'),
+        'port': config.get('SMTP_PORT', 1025),
+        'username': config.get('SMTP_USERNAME'),
+        'password': config.get('SMTP_PASSWORD'),
+        'starttls': config.get('SMTP_STARTTLS', False),
+        'size': config.get('SMTP_POOL_SIZE', 4),
+        'max_messages': config.get('SMTP_MESSAGES_PER_CONNECTION', 500),
+    }
+
+def is_permanent_failure(error):
+    """Whether retrying a failed send can't help (5xx replies)"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(500 <= code < 600 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPAuthenticationError):
+        # Bad credentials fail every message; keep them queued until fixed
+        return False
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 500 <= error.smtp_code < 600
+    return False
+
+class RateLimiter:
+    """Token bucket shared by sender threads: ``rate`` messages per second.
+
+    ``burst`` tokens may be spent at once; a rate of 0 or None disables it.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate or 0
+        self.capacity = burst or max(1, int(self.rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if not self.rate:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class _PooledConnection:
+    __slots__ = ('smtp', 'sent', 'last_used')
+
+    def __init__(self, smtp):
+        self.smtp = smtp
+        self.sent = 0
+        self.last_used = time.monotonic()
+
+class SMTPConnectionPool:
+    """A few long-lived SMTP sessions, each reused for many messages.
+
+    The handshake (connect, EHLO, STARTTLS, AUTH) is paid once per session
+    rather than per message. Sessions are recycled after ``max_messages``,
+    checked with NOOP after ``idle_check`` idle seconds, and discarded on
+    any error so the next send reconnects.
+    """
+
+    def __init__(self, host, port, username=None, password=None, starttls=False,
+                 size=4, max_messages=500, timeout=30, idle_check=30):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.size = size
+        self.max_messages = max_messages
+        self.timeout = timeout
+        self.idle_check = idle_check
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self.connects = 0
+
+    @contextmanager
+    def connection(self):
+        """Borrow a live SMTP session"""
+        self._slots.acquire()
+        pooled = None
+        try:
+            pooled = self._checkout()
+            yield pooled.smtp
+            pooled.sent += 1
+            pooled.last_used = time.monotonic()
+        except Exception:
+            if pooled is not None:
+                self._close(pooled)
+                pooled = None
+            raise
+        finally:
+            if pooled is not None:
+                if pooled.sent >= self.max_messages:
+                    self._close(pooled)
+                else:
+                    self._idle.put(pooled)
+            self._slots.release()
+
+    def send(self, sender, recipient, message):
+        """Send one message (bytes or str) over a pooled session"""
+        with self.connection() as smtp:
+            smtp.sendmail(sender, [recipient], message)
+
+    def close(self):
+        """Quit every idle session"""
+        while True:
+            try:
+                self._close(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+    def _checkout(self):
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                return _PooledConnection(self._connect())
+
+            if time.monotonic() - pooled.last_used < self.idle_check:
+                return pooled
+            try:
+                if pooled.smtp.noop()[0] == 250:
+                    return pooled
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close(pooled)
+
+    def _connect(self):
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            smtp.ehlo()
+            if self.starttls:
+                smtp.starttls()
+                smtp.ehlo()
+            if self.username:
+                smtp.login(self.username, self.password)
+        except Exception:
+            smtp.close()
+            raise
+        self.connects += 1
+        return smtp
+
+    def _close(self, pooled):
+        try:
+            pooled.smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            pooled.smtp.close()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_smtp_pool():
+    """The process-wide SMTP pool for the current app's settings"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            settings = smtp_settings()
+            _pool = SMTPConnectionPool(
+                settings['host'], settings['port'],
+                username=settings['username'], password=settings['password'],
+                starttls=settings['starttls'], size=settings['size'],
+                max_messages=settings['max_messages']
+            )
+        return _pool
+
+class Outbox:
+    """Durable outbox of email messages stored in the application database.
+
+    ``enqueue`` adds to the current session so a message commits with the
+    work that produced it (the caller commits). Failed sends are retried
+    with exponential backoff; permanent failures and messages out of
+    attempts are dead-lettered (status ``dead``) for an admin to retry.
+    """
+
+    def __init__(self, retry_base_delay=60, max_retry_delay=6 * 3600):
+        self.retry_base_delay = retry_base_delay
+        self.max_retry_delay = max_retry_delay
+
+    def enqueue(self, msg, recipient=None, sender=None, max_attempts=8):
+        """Add an email.message.Message to the session"""
+        email = OutboundEmail(
+            sender=sender or msg['From'],
+            recipient=recipient or msg['To'],
+            subject=str(msg['Subject'] or '')[:255],
+            message=msg.as_bytes(),
+            max_attempts=max_attempts,
+            next_attempt_at=datetime.utcnow()
+        )
+        db.session.add(email)
+        return email
+
+    def claim(self, worker_id, limit=100):
+        """Atomically claim up to ``limit`` due messages; returns their rows"""
+        now = datetime.utcnow()
+        ids = [row[0] for row in db.session.query(OutboundEmail.id).filter(
+            OutboundEmail.status == 'queued',
+            OutboundEmail.next_attempt_at <= now
+        ).order_by(OutboundEmail.next_attempt_at, OutboundEmail.id).limit(limit)]
+        if not ids:
+            db.session.commit()
+            return []
+
+        # A per-claim token tells this claim's rows from a concurrent one's
+        token = f'{worker_id}:{uuid.uuid4().hex[:8]}'
+        db.session.execute(
+            update(OutboundEmail.__table__)
+            .where(OutboundEmail.__table__.c.id.in_(ids), OutboundEmail.__table__.c.status == 'queued')
+            .values(status='sending', attempts=OutboundEmail.__table__.c.attempts + 1,
+                    locked_by=token, locked_at=now)
+        )
+        db.session.commit()
+        return OutboundEmail.query.filter_by(locked_by=token, status='sending').order_by(OutboundEmail.id).all()
+
+    def mark_sent(self, ids):
+        """Record successful deliveries (commits)"""
+        now = datetime.utcnow()
+        ids = list(ids)
+        for start in range(0, len(ids), 500):
+            db.session.execute(
+                update(OutboundEmail.__table__)
+                .where(OutboundEmail.__table__.c.id.in_(ids[start:start + 500]))
+                .values(status='sent', sent_at=now, locked_by=None, locked_at=None, last_error=None)
+            )
+        db.session.commit()
+
+    def mark_failed(self, email, error, permanent=False):
+        """Schedule a retry with backoff, or dead-letter the message (the caller commits)"""
+        email.last_error = error
+        email.locked_by = None
+        email.locked_at = None
+        if permanent or email.attempts >= email.max_attempts:
+            email.status = 'dead'
+        else:
+            email.status = 'queued'
+            email.next_attempt_at = datetime.utcnow() + timedelta(seconds=self.retry_delay(email.attempts))
+
+    def retry_delay(self, attempts):
+        """Seconds to wait before the next attempt"""
+        delay = min(self.retry_base_delay * (2 ** max(attempts - 1, 0)), self.max_retry_delay)
+        # Jitter keeps a failed batch from retrying in lockstep
+        return delay * random.uniform(0.8, 1.2)
+
+    def requeue_stale(self, stale_after=600):
+        """Return messages held by crashed senders to the queue"""
+        cutoff = datetime.utcnow() - timedelta(seconds=stale_after)
+        requeued = OutboundEmail.query.filter(
+            OutboundEmail.status == 'sending',
+            OutboundEmail.locked_at < cutoff
+        ).update({
+            'status': 'queued',
+            'locked_by': None,
+            'locked_at': None,
+            'last_error': 'Sender did not finish the message'
+        }, synchronize_session=False)
+        db.session.commit()
+        return requeued
+
+    def retry_dead(self, ids=None):
+        """Put dead-lettered messages back on the queue with fresh attempts"""
+        query = OutboundEmail.query.filter(OutboundEmail.status == 'dead')
+        if ids is not None:
+            query = query.filter(OutboundEmail.id.in_(list(ids)))
+        requeued = query.update({
+            'status': 'queued',
+            'attempts': 0,
+            'next_attempt_at': datetime.utcnow()
+        }, synchronize_session=False)
+        db.session.commit()
+        return requeued
+
+class OutboxWorker:
+    """Delivers outbox messages over a pool of persistent SMTP sessions.
+
+    Each round claims up to ``batch_size`` messages and splits them across
+    the pool; every sender thread pushes its share through one SMTP session
+    in turn, under a shared rate limit. Outcomes are written back from the
+    worker's own thread, so the sender threads never touch the database.
+    """
+
+    def __init__(self, app, pool=None, rate=None, batch_size=100, poll_interval=1.0,
+                 stale_after=600, worker_id=None):
+        self.app = app
+        with app.app_context():
+            settings = smtp_settings(app.config)
+            self.pool = pool or SMTPConnectionPool(
+                settings['host'], settings['port'],
+                username=settings['username'], password=settings['password'],
+                starttls=settings['starttls'], size=settings['size'],
+                max_messages=settings['max_messages']
+            )
+        self.limiter = RateLimiter(app.config.get('SMTP_RATE_LIMIT', 0) if rate is None else rate)
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.worker_id = worker_id or f'{socket.gethostname()}:{os.getpid()}'
+        self.outbox = Outbox()
+
+    def run(self, stop_event=None, drain=False, max_messages=None):
+        """Deliver until stopped, ``max_messages`` are done, or (with drain) the outbox is empty.
+
+        Returns the number of messages sent.
+        """
+        stop_event = stop_event or threading.Event()
+        sent = 0
+        with self.app.app_context(), ThreadPoolExecutor(max_workers=self.pool.size) as executor:
+            self.outbox.requeue_stale(self.stale_after)
+            try:
+                while not stop_event.is_set():
+                    if max_messages is not None and sent >= max_messages:
+                        break
+                    delivered, claimed = self.run_once(executor)
+                    sent += delivered
+                    if not claimed:
+                        if drain:
+                            break
+                        self.outbox.requeue_stale(self.stale_after)
+                        stop_event.wait(self.poll_interval)
+            finally:
+                self.pool.close()
+                db.session.remove()
+        return sent
+
+    def run_once(self, executor):
+        """Claim and deliver one batch; returns (sent, claimed)"""
+        emails = self.outbox.claim(self.worker_id, limit=self.batch_size)
+        if not emails:
+            return 0, 0
+
+        # One slice per pooled session
+        envelopes = [(email.id, email.sender, email.recipient, email.message) for email in emails]
+        slices = [envelopes[i::self.pool.size] for i in range(self.pool.size)]
+        errors = {}
+        for result in executor.map(self._send_slice, [part for part in slices if part]):
+            errors.update(result)
+
+        self.outbox.mark_sent(email.id for email in emails if email.id not in errors)
+        for email in emails:
+            if email.id in errors:
+                error = errors[email.id]
+                self.outbox.mark_failed(email, f'{type(error).__name__}: {error}', permanent=is_permanent_failure(error))
+        db.session.commit()
+        db.session.expunge_all()
+        return len(emails) - len(errors), len(emails)
+
+    def _send_slice(self, envelopes):
+        """Send messages in order; returns {id: exception} for failures"""
+        errors = {}
+        for email_id, sender, recipient, message in envelopes:
+            self.limiter.acquire()
+            try:
+                self.pool.send(sender, recipient, message)
+            except (smtplib.SMTPException, OSError) as e:
+                errors[email_id] = e
+        return errors
@@ -0,0 +1,138 @@
+import json
+import time
+import base64
+import hashlib
+import threading
+from datetime import datetime
+from sqlalchemy import tuple_
+from .cache_coherence import sync_caches
+
+# Cached COUNT(*) results keyed by filter, as key -> (expires_at, count)
+_counts = {}
+_counts_lock = threading.Lock()
+_MAX_COUNTS = 1000
+
+def filters_digest(filters):
+    """Short stable hash of a query's (name, value) filter pairs"""
+    raw = json.dumps(sorted(filters), separators=(',', ':')).encode('utf-8')
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+def encode_cursor(values, direction, ordering=None, filters=()):
+    """Opaque token for a position in a keyset ordering.
+
+    The token records the ordering mode and a hash of the filters it was
+    issued for, so it can't be replayed against a different listing.
+    """
+    payload = {
+        'v': [value.isoformat() if isinstance(value, datetime) else value for value in values],
+        'd': direction,
+        'o': ordering,
+        'f': filters_digest(filters),
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(token, columns, ordering=None, filters=()):
+    """Decode a cursor token into (values, direction); raises ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw)
+        values = payload['v']
+        direction = payload['d']
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+    if direction not in ('next', 'prev') or len(values) != len(columns):
+        raise ValueError('Invalid cursor')
+    if payload.get('o') != ordering or payload.get('f') != filters_digest(filters):
+        raise ValueError('Cursor does not match the current ordering and filters')
+
+    decoded = []
+    for column, value in zip(columns, values):
+        if value is not None and column.type.python_type is datetime:
+            value = datetime.fromisoformat(value)
+        decoded.append(value)
+    return decoded, direction
+
+class KeysetPage:
+    """One page of a keyset-paginated query"""
+
+    __slots__ = ('items', 'next_cursor', 'prev_cursor')
+
+    def __init__(self, items, next_cursor, prev_cursor):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+def keyset_paginate(query, columns, cursor=None, per_page=10, key=None, ordering=None, filters=()):
+    """Page through a query in descending order of ``columns``.
+
+    ``columns`` must be unique together (end with the primary key). Each page
+    is a range seek on an index over those columns, so its cost doesn't
+    depend on how deep the page is. ``key`` extracts the column values from a
+    result item (defaults to reading the column attributes). ``ordering``
+    names the ordering mode and ``filters`` are the (name, value) pairs the
+    query was filtered by; cursors only decode for the same pair.
+    """
+    key = key or (lambda item: [getattr(item, column.key) for column in columns])
+    direction = 'next'
+
+    if cursor:
+        values, direction = decode_cursor(cursor, columns, ordering, filters)
+        if direction == 'next':
+            query = query.filter(tuple_(*columns) < tuple_(*values))
+        else:
+            query = query.filter(tuple_(*columns) > tuple_(*values))
+
+    if direction == 'next':
+        query = query.order_by(*[column.desc() for column in columns])
+    else:
+        query = query.order_by(*[column.asc() for column in columns])
+
+    # Fetch one extra row to learn whether there is another page
+    rows = query.limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    if direction == 'prev':
+        rows.reverse()
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, bool(cursor)
+
+    next_cursor = encode_cursor(key(rows[-1]), 'next', ordering, filters) if rows and has_next else None
+    prev_cursor = encode_cursor(key(rows[0]), 'prev', ordering, filters) if rows and has_prev else None
+    return KeysetPage(rows, next_cursor, prev_cursor)
+
+def cached_count(query, cache_key, ttl=30):
+    """COUNT(*) of a query, reused for ``ttl`` seconds per cache key.
+
+    Every total is dropped when applications are written, here or in
+    another process.
+    """
+    sync_caches()
+    now = time.monotonic()
+    with _counts_lock:
+        cached = _counts.get(cache_key)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    count = query.order_by(None).count()
+    with _counts_lock:
+        if len(_counts) >= _MAX_COUNTS:
+            _counts.clear()
+        _counts[cache_key] = (now + ttl, count)
+    return count
+
+def clear_counts():
+    """Forget every cached total"""
+    with _counts_lock:
+        _counts.clear()
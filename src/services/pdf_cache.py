@@ -0,0 +1,233 @@
+import os
+import hashlib
+import tempfile
+import threading
+from datetime import date
+from flask import current_app
+from .pdf_generator import create_pdf_generator, TEMPLATE_VERSION
+from .storage import resolve_upload, object_digest
+
+# Digests of uploaded files keyed by (path, mtime, size)
+_file_digests = {}
+_file_digests_lock = threading.Lock()
+_MAX_FILE_DIGESTS = 10000
+
+# One cache instance per directory so the size index is shared in-process
+_caches = {}
+_caches_lock = threading.Lock()
+
+def file_digest(path):
+    """Return the SHA-256 of a file, memoized on its mtime and size"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    memo_key = (path, stat.st_mtime_ns, stat.st_size)
+    with _file_digests_lock:
+        digest = _file_digests.get(memo_key)
+    if digest:
+        return digest
+
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            sha256.update(chunk)
+    digest = sha256.hexdigest()
+
+    with _file_digests_lock:
+        if len(_file_digests) >= _MAX_FILE_DIGESTS:
+            _file_digests.clear()
+        _file_digests[memo_key] = digest
+    return digest
+
+class PDFCache:
+    """Content-addressed store of rendered application PDFs.
+
+    Each artifact is stored as ``<application id>/<key>.pdf`` where the key hashes
+    everything that shows up in the letter: the row version, the template
+    version and renderer, the photo/signature contents and the date printed
+    on it, which is the day it is rendered. Invalidating an application only
+    touches its own directory. Files are evicted least recently used first
+    once the cache grows past ``max_bytes``.
+    """
+
+    def __init__(self, upload_folder, cache_dir=None, max_bytes=512 * 1024 * 1024, renderer='platypus'):
+        self.upload_folder = upload_folder
+        self.renderer = renderer
+        self.cache_dir = cache_dir or os.path.join(upload_folder, 'pdfs', 'cache')
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._sizes = None  # artifact path -> size, built on first store
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def cache_key(self, application):
+        """Build the cache key for the current version of an application"""
+        parts = [
+            str(application.id),
+            application.updated_at.isoformat() if application.updated_at else '',
+            TEMPLATE_VERSION,
+            self.renderer,
+            application.category.name if application.category else '',
+            # The letter is dated the day it is rendered
+            date.today().isoformat(),
+        ]
+        for relative_path in (application.photo_path, application.signature_path):
+            # Content-addressed paths already name their digest
+            digest = object_digest(relative_path)
+            if relative_path and not digest:
+                full_path = resolve_upload(self.upload_folder, relative_path)
+                digest = file_digest(full_path) if full_path else None
+            parts.append(digest or '')
+
+        return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+    def artifact_path(self, application, key=None):
+        """Path of the cached artifact for an application"""
+        key = key or self.cache_key(application)
+        return os.path.join(self.application_dir(application.id), f'{key}.pdf')
+
+    def application_dir(self, application_id):
+        """Directory holding an application's artifacts"""
+        return os.path.join(self.cache_dir, str(application_id))
+
+    def get(self, application, key=None):
+        """Return the cached artifact path, or None on a miss"""
+        path = self.artifact_path(application, key)
+        try:
+            # Bump mtime so eviction treats this artifact as recently used
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def get_or_render(self, application, pdf_generator=None, key=None):
+        """Return the artifact path, rendering and storing it on a miss"""
+        key = key or self.cache_key(application)
+        path = self.get(application, key)
+        if path:
+            return path
+
+        pdf_generator = pdf_generator or create_pdf_generator(self.upload_folder, self.renderer)
+        path = self.artifact_path(application, key)
+
+        # Render to a temporary file so readers never see a partial PDF
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        os.close(fd)
+        try:
+            if not pdf_generator.generate_application_pdf(application, temp_path):
+                return None
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        # Older versions of this application can never be served again
+        self.invalidate(application.id, keep=path)
+        self._record(path)
+        return path
+
+    def get_bytes(self, application, pdf_generator=None):
+        """Return the PDF bytes for an application, using the cache"""
+        path = self.get_or_render(application, pdf_generator)
+        if not path:
+            return None
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def invalidate(self, application_id, keep=None):
+        """Remove every cached artifact for an application"""
+        directory = self.application_dir(application_id)
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return 0
+
+        removed = 0
+        for name in names:
+            path = os.path.join(directory, name)
+            if name.endswith('.pdf') and path != keep:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+                with self._lock:
+                    if self._sizes is not None:
+                        self._sizes.pop(path, None)
+        return removed
+
+    def invalidate_many(self, application_ids):
+        """``invalidate`` for many applications"""
+        return sum(self.invalidate(application_id) for application_id in application_ids)
+
+    def _record(self, path):
+        """Track a newly stored artifact and evict if over budget"""
+        with self._lock:
+            if self._sizes is None:
+                self._sizes = self._scan()
+            try:
+                self._sizes[path] = os.path.getsize(path)
+            except OSError:
+                return
+            over_budget = sum(self._sizes.values()) > self.max_bytes
+
+        if over_budget:
+            self.evict()
+
+    def _scan(self):
+        return {path: size for _, path, size in self._artifacts()}
+
+    def _artifacts(self):
+        """(mtime, path, size) of every artifact, one directory per application"""
+        artifacts = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_dir():
+                try:
+                    children = list(os.scandir(entry.path))
+                except OSError:
+                    continue
+            else:
+                # Flat <id>_<key>.pdf files from before per-application directories
+                children = [entry]
+            for child in children:
+                if child.name.endswith('.pdf'):
+                    try:
+                        stat = child.stat()
+                    except OSError:
+                        continue
+                    artifacts.append((stat.st_mtime, child.path, stat.st_size))
+        return artifacts
+
+    def evict(self):
+        """Delete least recently used artifacts until under max_bytes"""
+        with self._lock:
+            # Rescan: other processes share the directory
+            entries = self._artifacts()
+            entries.sort()
+            total = sum(size for _, _, size in entries)
+            for _, path, size in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                total -= size
+
+            self._sizes = {path: size for _, path, size in entries if os.path.exists(path)}
+
+def get_pdf_cache():
+    """Return the process-wide PDF cache for the current app"""
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+    max_bytes = current_app.config.get('PDF_CACHE_MAX_BYTES', 512 * 1024 * 1024)
+    renderer = current_app.config.get('PDF_RENDERER', 'platypus')
+
+    with _caches_lock:
+        cache = _caches.get(upload_folder)
+        if cache is None:
+            cache = PDFCache(upload_folder, max_bytes=max_bytes, renderer=renderer)
+            _caches[upload_folder] = cache
+        return cache
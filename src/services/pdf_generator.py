@@ -1,21 +1,109 @@
-import os
+import threading
+from functools import lru_cache
 from datetime import datetime
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
+from reportlab.lib.utils import simpleSplit, ImageReader
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle
 from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from reportlab.pdfgen import canvas
 from io import BytesIO
-import textwrap
+from .image_processing import resolve_image
 
-class PDFGenerator:
-    def __init__(self, upload_folder):
-        self.upload_folder = upload_folder
+# Bump whenever the letter layout changes so cached PDFs are re-rendered
+TEMPLATE_VERSION = '2'
+
+PAGE_MARGIN = 72
+
+INTRO_TEXT = """I am writing to respectfully submit my application for the {category_name}
+        under your esteemed organization. I believe that this project will significantly benefit my family
+        and community, and I am committed to utilizing the assistance effectively."""
+
+CLOSING_TEXT = """I humbly request you to consider my application favorably and approve my request
+        for the above-mentioned project. I assure you that I will utilize the assistance properly and
+        follow all the guidelines provided by your organization. I am ready to provide any additional
+        information or documentation if required."""
+
+class LetterData:
+    """Plain snapshot of the application fields printed on the letter.
+
+    Unlike the ORM instance it can be pickled into worker processes and
+    read without touching the database.
+    """
+
+    __slots__ = (
+        'id', 'reference_number', 'category_name', 'full_name', 'father_name',
+        'mother_name', 'nid_number', 'date_of_birth', 'occupation', 'village',
+        'upazila', 'district', 'division', 'family_members_count',
+        'monthly_income', 'main_earner_occupation', 'email', 'mobile_number',
+        'photo_path', 'signature_path'
+    )
+
+    def __init__(self, **kwargs):
+        for name in self.__slots__:
+            setattr(self, name, kwargs.get(name))
+
+    @classmethod
+    def from_application(cls, application):
+        """Build a snapshot from an Application (or return a snapshot as-is)"""
+        if isinstance(application, cls):
+            return application
+
+        fields = {name: getattr(application, name) for name in cls.__slots__ if name != 'category_name'}
+        fields['category_name'] = application.category.name if application.category else ''
+        return cls(**fields)
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state):
+        for name in self.__slots__:
+            setattr(self, name, state.get(name))
+
+    def section_rows(self):
+        """Label/value rows for each information section"""
+        return [
+            ('Personal Information:', [2*inch, 4*inch], [
+                ['Full Name:', self.full_name],
+                ['Father\'s Name:', self.father_name],
+                ['Mother\'s Name:', self.mother_name],
+                ['National ID Number:', self.nid_number],
+                ['Date of Birth:', self.date_of_birth.strftime('%B %d, %Y')],
+                ['Occupation:', self.occupation],
+            ]),
+            ('Address Information:', [2*inch, 4*inch], [
+                ['Village:', self.village],
+                ['Sub-district (Upazila):', self.upazila],
+                ['District:', self.district],
+                ['Division:', self.division],
+            ]),
+            ('Family Information:', [2.5*inch, 3.5*inch], [
+                ['Number of Family Members:', str(self.family_members_count)],
+                ['Monthly Family Income:', f'BDT {self.monthly_income:,.2f}'],
+                ['Main Earning Member\'s Occupation:', self.main_earner_occupation],
+            ]),
+            ('Contact Information:', [2*inch, 4*inch], [
+                ['Email Address:', self.email],
+                ['Mobile Number:', self.mobile_number],
+            ]),
+        ]
+
+class LetterTemplate:
+    """Styles and static content of the application letter, built once per process"""
+
+    def __init__(self):
         self.styles = getSampleStyleSheet()
         self.setup_custom_styles()
-    
+        self.setup_table_styles()
+        self.static_text = {
+            'title': ("To,<br/>The Chairman,<br/>State Bangladesh Society", self.title_style),
+            'salutation': ("Respected Sir/Madam,", self.body_style),
+            'closing': (CLOSING_TEXT, self.body_style),
+            'thank_you': ("Thank you for your kind consideration.", self.body_style),
+        }
+
     def setup_custom_styles(self):
         """Setup custom styles for the PDF"""
         # Title style
@@ -28,7 +116,7 @@ class PDFGenerator:
             textColor=colors.black,
             fontName='Helvetica-Bold'
         )
-        
+
         # Header style
         self.header_style = ParagraphStyle(
             'CustomHeader',
@@ -39,7 +127,7 @@ class PDFGenerator:
             textColor=colors.black,
             fontName='Helvetica-Bold'
         )
-        
+
         # Body style
         self.body_style = ParagraphStyle(
             'CustomBody',
@@ -50,7 +138,7 @@ class PDFGenerator:
             textColor=colors.black,
             fontName='Helvetica'
         )
-        
+
         # Bold body style
         self.bold_body_style = ParagraphStyle(
             'CustomBoldBody',
@@ -61,239 +149,205 @@ class PDFGenerator:
             textColor=colors.black,
             fontName='Helvetica-Bold'
         )
-    
+
+    def setup_table_styles(self):
+        """Setup the table styles shared by every letter"""
+        self.date_ref_table_style = TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 11),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ])
+
+        self.photo_table_style = TableStyle([
+            ('ALIGN', (1, 1), (1, 1), 'RIGHT'),
+            ('VALIGN', (1, 1), (1, 1), 'TOP'),
+        ])
+
+        # Personal, address, family and contact sections share one style
+        self.section_table_style = TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 11),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 0),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+            ('TOPPADDING', (0, 0), (-1, -1), 3),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
+        ])
+
+        self.signature_table_style = TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 11),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 0),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+            ('TOPPADDING', (0, 0), (-1, -1), 3),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
+        ])
+
+    def paragraph(self, name):
+        """A fresh Paragraph of fixed letter text.
+
+        Flowables keep layout state while a document is built, so only the
+        text and styles are shared; every letter gets its own instances.
+        """
+        text, style = self.static_text[name]
+        return Paragraph(text, style)
+
+@lru_cache(maxsize=256)
+def wrap_text(text, font_name, font_size, width):
+    """Line-break text for canvas drawing, cached across letters"""
+    return tuple(simpleSplit(' '.join(text.split()), font_name, font_size, width))
+
+_template = None
+_template_lock = threading.Lock()
+
+def get_letter_template():
+    """Return the process-wide compiled letter template"""
+    global _template
+    if _template is None:
+        with _template_lock:
+            if _template is None:
+                _template = LetterTemplate()
+    return _template
+
+class PDFGenerator:
+    """Renders application letters with ReportLab platypus flow layout"""
+
+    renderer_name = 'platypus'
+
+    def __init__(self, upload_folder):
+        self.upload_folder = upload_folder
+        self.template = get_letter_template()
+        self.styles = self.template.styles
+
+    def render(self, application, output):
+        """Render the letter to a file path or a writable binary stream"""
+        data = LetterData.from_application(application)
+
+        # Create the PDF document
+        doc = SimpleDocTemplate(
+            output,
+            pagesize=A4,
+            rightMargin=PAGE_MARGIN,
+            leftMargin=PAGE_MARGIN,
+            topMargin=PAGE_MARGIN,
+            bottomMargin=PAGE_MARGIN
+        )
+
+        # Build the story (content)
+        story = []
+        self.add_header(story, data)
+        self.add_photo(story, data)
+        self.add_application_content(story, data)
+        self.add_signature(story, data)
+
+        # Build the PDF
+        doc.build(story)
+
     def generate_application_pdf(self, application, output_path):
         """Generate PDF for application"""
         try:
-            # Create the PDF document
-            doc = SimpleDocTemplate(
-                output_path,
-                pagesize=A4,
-                rightMargin=72,
-                leftMargin=72,
-                topMargin=72,
-                bottomMargin=72
-            )
-            
-            # Build the story (content)
-            story = []
-            
-            # Add header
-            self.add_header(story, application)
-            
-            # Add photo if available
-            self.add_photo(story, application)
-            
-            # Add application content
-            self.add_application_content(story, application)
-            
-            # Add signature
-            self.add_signature(story, application)
-            
-            # Build the PDF
-            doc.build(story)
-            
+            self.render(application, output_path)
             return True
-            
+
         except Exception as e:
             print(f"Error generating PDF: {str(e)}")
             return False
-    
-    def add_header(self, story, application):
+
+    def generate_pdf_bytes(self, application):
+        """Generate PDF as bytes for email attachment"""
+        try:
+            buffer = BytesIO()
+            self.render(application, buffer)
+            return buffer.getvalue()
+
+        except Exception as e:
+            print(f"Error generating PDF bytes: {str(e)}")
+            return None
+
+    def add_header(self, story, data):
         """Add header to the PDF"""
         # Title
-        title = Paragraph("To,<br/>The Chairman,<br/>State Bangladesh Society", self.title_style)
-        story.append(title)
+        story.append(self.template.paragraph('title'))
         story.append(Spacer(1, 20))
-        
+
         # Subject
-        subject = Paragraph(f"<b>Subject:</b> Application for {application.category.name}", self.header_style)
+        subject = Paragraph(f"<b>Subject:</b> Application for {data.category_name}", self.template.header_style)
         story.append(subject)
         story.append(Spacer(1, 20))
-        
+
         # Date and Reference
         date_ref_data = [
             ['Date:', datetime.now().strftime('%B %d, %Y')],
-            ['Reference No:', application.reference_number]
+            ['Reference No:', data.reference_number]
         ]
-        
+
         date_ref_table = Table(date_ref_data, colWidths=[1.5*inch, 3*inch])
-        date_ref_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ]))
-        
+        date_ref_table.setStyle(self.template.date_ref_table_style)
+
         story.append(date_ref_table)
         story.append(Spacer(1, 20))
-    
-    def add_photo(self, story, application):
+
+    def add_photo(self, story, data):
         """Add photo to the PDF if available"""
-        if application.photo_path:
+        if data.photo_path:
             try:
-                photo_full_path = os.path.join(self.upload_folder, application.photo_path)
-                if os.path.exists(photo_full_path):
+                # Prefer the right-sized derivative over the original upload
+                photo_full_path = resolve_image(self.upload_folder, data.photo_path, 'photos', 'pdf')
+                if photo_full_path:
                     # Create a table to position the photo on the right
                     photo_data = [
                         ['', ''],  # Empty row for spacing
                     ]
-                    
+
                     # Add photo
                     img = Image(photo_full_path, width=1.5*inch, height=2*inch)
                     photo_data.append(['', img])
-                    
+
                     photo_table = Table(photo_data, colWidths=[4.5*inch, 2*inch])
-                    photo_table.setStyle(TableStyle([
-                        ('ALIGN', (1, 1), (1, 1), 'RIGHT'),
-                        ('VALIGN', (1, 1), (1, 1), 'TOP'),
-                    ]))
-                    
+                    photo_table.setStyle(self.template.photo_table_style)
+
                     story.append(photo_table)
                     story.append(Spacer(1, 10))
             except Exception as e:
                 print(f"Error adding photo: {str(e)}")
-    
-    def add_application_content(self, story, application):
+
+    def add_application_content(self, story, data):
         """Add main application content"""
         # Salutation
-        salutation = Paragraph("Respected Sir/Madam,", self.body_style)
-        story.append(salutation)
+        story.append(self.template.paragraph('salutation'))
         story.append(Spacer(1, 12))
-        
+
         # Introduction paragraph
-        intro_text = f"""I am writing to respectfully submit my application for the {application.category.name} 
-        under your esteemed organization. I believe that this project will significantly benefit my family 
-        and community, and I am committed to utilizing the assistance effectively."""
-        
-        intro = Paragraph(intro_text, self.body_style)
+        intro = Paragraph(INTRO_TEXT.format(category_name=data.category_name), self.template.body_style)
         story.append(intro)
         story.append(Spacer(1, 15))
-        
-        # Personal Information Section
-        personal_info_title = Paragraph("<b>Personal Information:</b>", self.bold_body_style)
-        story.append(personal_info_title)
-        
-        personal_data = [
-            ['Full Name:', application.full_name],
-            ['Father\'s Name:', application.father_name],
-            ['Mother\'s Name:', application.mother_name],
-            ['National ID Number:', application.nid_number],
-            ['Date of Birth:', application.date_of_birth.strftime('%B %d, %Y')],
-            ['Occupation:', application.occupation],
-        ]
-        
-        personal_table = Table(personal_data, colWidths=[2*inch, 4*inch])
-        personal_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 0),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-            ('TOPPADDING', (0, 0), (-1, -1), 3),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
-        ]))
-        
-        story.append(personal_table)
-        story.append(Spacer(1, 15))
-        
-        # Address Information Section
-        address_info_title = Paragraph("<b>Address Information:</b>", self.bold_body_style)
-        story.append(address_info_title)
-        
-        address_data = [
-            ['Village:', application.village],
-            ['Sub-district (Upazila):', application.upazila],
-            ['District:', application.district],
-            ['Division:', application.division],
-        ]
-        
-        address_table = Table(address_data, colWidths=[2*inch, 4*inch])
-        address_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 0),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-            ('TOPPADDING', (0, 0), (-1, -1), 3),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
-        ]))
-        
-        story.append(address_table)
-        story.append(Spacer(1, 15))
-        
-        # Family Information Section
-        family_info_title = Paragraph("<b>Family Information:</b>", self.bold_body_style)
-        story.append(family_info_title)
-        
-        family_data = [
-            ['Number of Family Members:', str(application.family_members_count)],
-            ['Monthly Family Income:', f'BDT {application.monthly_income:,.2f}'],
-            ['Main Earning Member\'s Occupation:', application.main_earner_occupation],
-        ]
-        
-        family_table = Table(family_data, colWidths=[2.5*inch, 3.5*inch])
-        family_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 0),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-            ('TOPPADDING', (0, 0), (-1, -1), 3),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
-        ]))
-        
-        story.append(family_table)
-        story.append(Spacer(1, 15))
-        
-        # Contact Information Section
-        contact_info_title = Paragraph("<b>Contact Information:</b>", self.bold_body_style)
-        story.append(contact_info_title)
-        
-        contact_data = [
-            ['Email Address:', application.email],
-            ['Mobile Number:', application.mobile_number],
-        ]
-        
-        contact_table = Table(contact_data, colWidths=[2*inch, 4*inch])
-        contact_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 0),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-            ('TOPPADDING', (0, 0), (-1, -1), 3),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
-        ]))
-        
-        story.append(contact_table)
-        story.append(Spacer(1, 20))
-        
+
+        # Personal, address, family and contact sections
+        sections = data.section_rows()
+        for index, (title, col_widths, rows) in enumerate(sections):
+            story.append(Paragraph(f"<b>{title}</b>", self.template.bold_body_style))
+
+            table = Table(rows, colWidths=col_widths)
+            table.setStyle(self.template.section_table_style)
+
+            story.append(table)
+            story.append(Spacer(1, 20 if index == len(sections) - 1 else 15))
+
         # Closing paragraph
-        closing_text = """I humbly request you to consider my application favorably and approve my request 
-        for the above-mentioned project. I assure you that I will utilize the assistance properly and 
-        follow all the guidelines provided by your organization. I am ready to provide any additional 
-        information or documentation if required."""
-        
-        closing = Paragraph(closing_text, self.body_style)
-        story.append(closing)
+        story.append(self.template.paragraph('closing'))
         story.append(Spacer(1, 15))
-        
+
         # Thank you
-        thank_you = Paragraph("Thank you for your kind consideration.", self.body_style)
-        story.append(thank_you)
+        story.append(self.template.paragraph('thank_you'))
         story.append(Spacer(1, 30))
-    
-    def add_signature(self, story, application):
+
+    def add_signature(self, story, data):
         """Add signature section"""
         # Signature section
         signature_data = [
@@ -301,73 +355,167 @@ class PDFGenerator:
             ['', ''],
             ['', ''],
         ]
-        
+
         # Add signature image if available
-        if application.signature_path:
+        if data.signature_path:
             try:
-                signature_full_path = os.path.join(self.upload_folder, application.signature_path)
-                if os.path.exists(signature_full_path):
+                signature_full_path = resolve_image(self.upload_folder, data.signature_path, 'signatures', 'pdf')
+                if signature_full_path:
                     sig_img = Image(signature_full_path, width=2*inch, height=1*inch)
                     signature_data[1] = [sig_img, '']
             except Exception as e:
                 print(f"Error adding signature: {str(e)}")
-        
+
         # Add name
-        signature_data.append([application.full_name, ''])
-        signature_data.append([f'Reference: {application.reference_number}', ''])
-        
+        signature_data.append([data.full_name, ''])
+        signature_data.append([f'Reference: {data.reference_number}', ''])
+
         signature_table = Table(signature_data, colWidths=[3*inch, 3*inch])
-        signature_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 0),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-            ('TOPPADDING', (0, 0), (-1, -1), 3),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
-        ]))
-        
+        signature_table.setStyle(self.template.signature_table_style)
+
         story.append(signature_table)
-    
-    def generate_pdf_bytes(self, application):
-        """Generate PDF as bytes for email attachment"""
+
+class CanvasPDFGenerator(PDFGenerator):
+    """Fast-path renderer that draws the fixed letter layout straight onto a canvas.
+
+    It skips platypus flowable wrapping and table layout entirely; only the
+    free-text paragraphs are line-broken. An instance draws one letter at a
+    time, so don't share it between threads.
+    """
+
+    renderer_name = 'canvas'
+
+    FONT = 'Helvetica'
+    BOLD_FONT = 'Helvetica-Bold'
+    FONT_SIZE = 11
+    LEADING = 14
+
+    def __init__(self, upload_folder):
+        super().__init__(upload_folder)
+        self.page_width, self.page_height = A4
+        self.content_width = self.page_width - 2 * PAGE_MARGIN
+
+    def render(self, application, output):
+        """Render the letter to a file path or a writable binary stream"""
+        pdf = canvas.Canvas(output, pagesize=A4)
+        self.draw_letter(pdf, LetterData.from_application(application))
+        pdf.save()
+
+    def draw_letter(self, pdf, data):
+        """Draw one letter onto an open canvas, ending with a page break"""
+        self._pdf = pdf
+        self._y = self.page_height - PAGE_MARGIN
+        left = PAGE_MARGIN
+        right = self.page_width - PAGE_MARGIN
+
+        # Title
+        pdf.setFont(self.BOLD_FONT, 16)
+        for line in ('To,', 'The Chairman,', 'State Bangladesh Society'):
+            self._y -= 19
+            pdf.drawCentredString(self.page_width / 2, self._y, line)
+        self._y -= 30
+
+        # Subject
+        pdf.setFont(self.BOLD_FONT, 14)
+        for line in wrap_text(f'Subject: Application for {data.category_name}', self.BOLD_FONT, 14, self.content_width):
+            self._y -= 17
+            pdf.drawCentredString(self.page_width / 2, self._y, line)
+        self._y -= 20
+
+        # Date and Reference
+        pdf.setFont(self.FONT, self.FONT_SIZE)
+        for label, value in (('Date:', datetime.now().strftime('%B %d, %Y')), ('Reference No:', data.reference_number)):
+            self._y -= self.LEADING
+            pdf.drawString(left, self._y, label)
+            pdf.drawString(left + 1.5*inch, self._y, value)
+        self._y -= 16
+
+        # Photo on the right
+        photo = self._image_path(data.photo_path, 'photos')
+        if photo:
+            self._y -= 2*inch
+            self._draw_image(photo, right - 1.5*inch, self._y, 1.5*inch, 2*inch)
+            self._y -= 10
+
+        # Salutation and introduction
+        self._paragraph(['Respected Sir/Madam,'])
+        self._y -= 12
+        self._paragraph(wrap_text(INTRO_TEXT.format(category_name=data.category_name), self.FONT, self.FONT_SIZE, self.content_width))
+        self._y -= 15
+
+        # Information sections
+        for title, col_widths, rows in data.section_rows():
+            self._ensure_space(self.LEADING * 2)
+            pdf.setFont(self.BOLD_FONT, self.FONT_SIZE)
+            self._y -= self.LEADING
+            pdf.drawString(left, self._y, title)
+            self._y -= 6
+            pdf.setFont(self.FONT, self.FONT_SIZE)
+            for label, value in rows:
+                value_lines = simpleSplit(str(value), self.FONT, self.FONT_SIZE, col_widths[1] - 6) or ['']
+                self._ensure_space(self.LEADING * len(value_lines))
+                self._y -= self.LEADING
+                pdf.drawString(left, self._y, label)
+                for index, line in enumerate(value_lines):
+                    if index:
+                        self._y -= self.LEADING
+                    pdf.drawString(left + col_widths[0], self._y, line)
+            self._y -= 15
+
+        # Closing
+        self._paragraph(wrap_text(CLOSING_TEXT, self.FONT, self.FONT_SIZE, self.content_width))
+        self._y -= 15
+        self._paragraph(['Thank you for your kind consideration.'])
+        self._y -= 30
+
+        # Signature block
+        signature = self._image_path(data.signature_path, 'signatures')
+        self._ensure_space(self.LEADING * 3 + (1*inch if signature else 0))
+        pdf.setFont(self.FONT, self.FONT_SIZE)
+        self._y -= self.LEADING
+        pdf.drawString(left, self._y, 'Yours sincerely,')
+        if signature:
+            self._y -= 1*inch + 4
+            self._draw_image(signature, left, self._y, 2*inch, 1*inch)
+        else:
+            self._y -= self.LEADING * 2
+        self._y -= self.LEADING
+        pdf.drawString(left, self._y, data.full_name)
+        self._y -= self.LEADING
+        pdf.drawString(left, self._y, f'Reference: {data.reference_number}')
+
+        pdf.showPage()
+
+    def _paragraph(self, lines):
+        self._pdf.setFont(self.FONT, self.FONT_SIZE)
+        for line in lines:
+            self._ensure_space(self.LEADING)
+            self._y -= self.LEADING
+            self._pdf.drawString(PAGE_MARGIN, self._y, line)
+
+    def _ensure_space(self, height):
+        if self._y - height < PAGE_MARGIN:
+            self._pdf.showPage()
+            self._pdf.setFont(self.FONT, self.FONT_SIZE)
+            self._y = self.page_height - PAGE_MARGIN
+
+    def _image_path(self, relative_path, folder):
+        return resolve_image(self.upload_folder, relative_path, folder, 'pdf')
+
+    def _draw_image(self, path, x, y, width, height):
         try:
-            buffer = BytesIO()
-            doc = SimpleDocTemplate(
-                buffer,
-                pagesize=A4,
-                rightMargin=72,
-                leftMargin=72,
-                topMargin=72,
-                bottomMargin=72
-            )
-            
-            # Build the story (content)
-            story = []
-            
-            # Add header
-            self.add_header(story, application)
-            
-            # Add photo if available
-            self.add_photo(story, application)
-            
-            # Add application content
-            self.add_application_content(story, application)
-            
-            # Add signature
-            self.add_signature(story, application)
-            
-            # Build the PDF
-            doc.build(story)
-            
-            # Get the PDF bytes
-            pdf_bytes = buffer.getvalue()
-            buffer.close()
-            
-            return pdf_bytes
-            
+            self._pdf.drawImage(ImageReader(path), x, y, width=width, height=height)
         except Exception as e:
-            print(f"Error generating PDF bytes: {str(e)}")
-            return None
+            print(f"Error adding image: {str(e)}")
+
+PDF_RENDERERS = {
+    PDFGenerator.renderer_name: PDFGenerator,
+    CanvasPDFGenerator.renderer_name: CanvasPDFGenerator,
+}
 
+def create_pdf_generator(upload_folder, renderer='platypus'):
+    """Create a PDF generator for the named renderer"""
+    try:
+        return PDF_RENDERERS[renderer](upload_folder)
+    except KeyError:
+        raise ValueError(f'Unknown PDF renderer: {renderer}')
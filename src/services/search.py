@@ -0,0 +1,38 @@
+from sqlalchemy import table, column, func, select, Float, literal_column
+
+# External-content FTS5 index over application (see migration 3)
+application_fts = table('application_fts', column('rowid'))
+
+# bm25 weights in the index's column order: full_name, father_name,
+# mother_name, village, upazila, reference_number, nid_number, mobile_number
+FTS_WEIGHTS = (10.0, 2.0, 2.0, 1.0, 1.0, 8.0, 8.0, 8.0)
+
+def build_match_query(text):
+    """Turn free text into an FTS5 query: every term must match as a prefix.
+
+    Each term is quoted so FTS operators and punctuation in user input are
+    treated as plain text. Returns None if nothing searchable is left.
+    """
+    terms = [term for term in text.split() if any(ch.isalnum() for ch in term)]
+    if not terms:
+        return None
+    return ' '.join('"' + term.replace('"', '""') + '"*' for term in terms)
+
+def ranked_matches(text):
+    """Subquery of (rowid, score) for applications matching ``text``.
+
+    ``score`` is the negated bm25 rank, so higher is better. Returns None
+    when the text has no searchable terms.
+    """
+    match = build_match_query(text)
+    if match is None:
+        return None
+
+    weights = ', '.join(str(weight) for weight in FTS_WEIGHTS)
+    score = -func.bm25(literal_column('application_fts'), literal_column(weights), type_=Float)
+    return select(
+        application_fts.c.rowid.label('rowid'),
+        score.label('score')
+    ).where(
+        literal_column('application_fts').op('MATCH')(match)
+    ).subquery('search')
@@ -0,0 +1,117 @@
+import os
+import time
+import threading
+import socketserver
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough of RFC 5321 to accept mail from smtplib"""
+
+    def handle(self):
+        server = self.server
+        if server.connect_delay:
+            # Stands in for the TCP/TLS handshake and login of a real relay
+            time.sleep(server.connect_delay)
+        with server.lock:
+            server.connections += 1
+        self.reply('220 localhost SMTP sink ready')
+
+        sender, recipients = None, []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('utf-8', 'replace').strip()
+            verb = command[:4].upper()
+
+            if verb in ('EHLO', 'HELO'):
+                self.reply('250-localhost\r\n250-PIPELINING\r\n250-8BITMIME\r\n250 SIZE 52428800' if verb == 'EHLO' else '250 localhost')
+            elif verb == 'MAIL':
+                sender, recipients = command[10:].strip(' <>'), []
+                self.reply('250 OK')
+            elif verb == 'RCPT':
+                recipient = command[8:].strip(' <>')
+                if server.reject_domain and recipient.endswith('@' + server.reject_domain):
+                    self.reply('550 No such user')
+                else:
+                    recipients.append(recipient)
+                    self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                data = self.read_data()
+                if server.message_delay:
+                    time.sleep(server.message_delay)
+                server.store(sender, recipients, data)
+                self.reply('250 OK queued')
+            elif verb == 'RSET':
+                sender, recipients = None, []
+                self.reply('250 OK')
+            elif verb == 'NOOP':
+                self.reply('250 OK')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+    def read_data(self):
+        lines = []
+        while True:
+            line = self.rfile.readline()
+            if not line or line in (b'.\r\n', b'.\n'):
+                break
+            # Undo dot-stuffing
+            lines.append(line[1:] if line.startswith(b'..') else line)
+        return b''.join(lines)
+
+    def reply(self, text):
+        self.wfile.write(text.encode('utf-8') + b'\r\n')
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    """Local SMTP server that accepts and counts every message.
+
+    For development and tests: point SMTP_HOST/SMTP_PORT at it. Messages are
+    kept in memory (``messages``) or written to ``save_dir`` as .eml files.
+    ``connect_delay`` and ``message_delay`` simulate a remote relay's
+    latency; recipients at ``reject_domain`` get a permanent 550.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host='127.0.0.1', port=1025, save_dir=None, keep=True,
+                 connect_delay=0.0, message_delay=0.0, reject_domain=None):
+        super().__init__((host, port), _SMTPHandler)
+        self.save_dir = save_dir
+        self.keep = keep
+        self.connect_delay = connect_delay
+        self.message_delay = message_delay
+        self.reject_domain = reject_domain
+        self.lock = threading.Lock()
+        self.messages = []
+        self.count = 0
+        self.connections = 0
+        if save_dir:
+            os.makedirs(save_dir, exist_ok=True)
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def store(self, sender, recipients, data):
+        with self.lock:
+            self.count += 1
+            count = self.count
+            if self.keep:
+                self.messages.append((sender, recipients, data))
+        if self.save_dir:
+            with open(os.path.join(self.save_dir, f'{count:08d}.eml'), 'wb') as f:
+                f.write(data)
+
+    def start(self):
+        """Serve from a daemon thread; returns self"""
+        threading.Thread(target=self.serve_forever, name='smtp-sink', daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,365 @@
+import os
+import re
+import io
+import gzip
+import json
+import shutil
+import hashlib
+import mimetypes
+from flask import request, current_app, send_from_directory
+from werkzeug.http import is_resource_modified
+
+try:
+    import brotli
+except ImportError:  # Optional: only gzip variants are built without it
+    brotli = None
+
+MANIFEST_NAME = 'manifest.json'
+
+# Pages are requested by their own URL, so they keep their names; everything
+# else gets a content hash in its name and is served from /assets/
+ENTRY_EXTENSIONS = ('.html',)
+COMPRESSIBLE_EXTENSIONS = ('.html', '.js', '.css', '.json', '.svg', '.ico', '.txt')
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'public, no-cache'
+
+# (name in the manifest, suffix on disk) in order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+def minify_js(source):
+    """Drop comments, indentation and blank lines from JavaScript.
+
+    Strings, template literals and regular expression literals are copied
+    as they are. Line breaks are kept so automatic semicolon insertion
+    still sees the same statements.
+    """
+    out = []
+    i, n = 0, len(source)
+    line_start = True
+    templates = []  # Brace depth inside each open ${...}
+    last_significant = ''
+
+    while i < n:
+        char = source[i]
+
+        if char == '\n':
+            while out and out[-1] == ' ':
+                out.pop()
+            if out and not out[-1].endswith('\n'):
+                out.append('\n')
+            line_start = True
+            i += 1
+            continue
+
+        if char in ' \t\r':
+            if not line_start and out and not out[-1].endswith((' ', '\n')):
+                out.append(' ')
+            i += 1
+            continue
+
+        line_start = False
+
+        if source.startswith('//', i):
+            end = source.find('\n', i)
+            i = n if end == -1 else end
+            continue
+
+        if source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+            continue
+
+        if char in '\'"':
+            end = _string_end(source, i, char)
+            out.append(source[i:end])
+            i = end
+            last_significant = char
+            continue
+
+        if char == '`' or (char == '}' and templates and templates[-1] == 0):
+            if char == '}':
+                templates.pop()
+            end, opens = _template_end(source, i + 1)
+            out.append(source[i:end])
+            i = end
+            if opens:
+                templates.append(0)
+            last_significant = '`'
+            continue
+
+        if char == '/' and (not last_significant or last_significant in '(,=:[!&|?{};+-*%<>~^' or _ends_with_keyword(out)):
+            end = _regex_end(source, i)
+            out.append(source[i:end])
+            i = end
+            last_significant = '/'
+            continue
+
+        if templates:
+            if char == '{':
+                templates[-1] += 1
+            elif char == '}':
+                templates[-1] -= 1
+
+        out.append(char)
+        last_significant = char
+        i += 1
+
+    return ''.join(out).strip() + '\n'
+
+def _string_end(source, start, quote):
+    i = start + 1
+    while i < len(source):
+        if source[i] == '\\':
+            i += 2
+            continue
+        if source[i] == quote or source[i] == '\n':
+            return i + 1
+        i += 1
+    return i
+
+def _template_end(source, i):
+    """End of a template literal chunk, and whether it stopped at a ${"""
+    while i < len(source):
+        if source[i] == '\\':
+            i += 2
+            continue
+        if source[i] == '`':
+            return i + 1, False
+        if source.startswith('${', i):
+            return i + 2, True
+        i += 1
+    return i, False
+
+def _regex_end(source, start):
+    i, in_class = start + 1, False
+    while i < len(source) and source[i] != '\n':
+        char = source[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '/' and not in_class:
+            i += 1
+            while i < len(source) and source[i].isalpha():
+                i += 1
+            return i
+        i += 1
+    return i
+
+_KEYWORD_BEFORE_REGEX = re.compile(r'(?:^|[^\w$])(?:return|typeof|case|do|else|in|of|void|yield|await|delete|throw|new)\s*$')
+
+def _ends_with_keyword(out):
+    return bool(_KEYWORD_BEFORE_REGEX.search(''.join(out[-12:])))
+
+_HTML_COMMENT = re.compile(r'<!--(?!\[if).*?-->', re.S)
+_HTML_PRESERVE = re.compile(r'(<(pre|textarea|script)\b.*?</\2>)', re.S | re.I)
+
+def minify_html(source):
+    """Drop comments, indentation and blank lines from HTML.
+
+    The contents of <pre>, <textarea> and <script> are left alone.
+    """
+    parts = _HTML_PRESERVE.split(source)
+    out = []
+    # split() yields text, preserved block, tag name, text, ...
+    for index in range(0, len(parts), 3):
+        text = _HTML_COMMENT.sub('', parts[index])
+        out.append('\n'.join(line.strip() for line in text.splitlines() if line.strip()))
+        if index + 1 < len(parts):
+            out.append(parts[index + 1])
+    return ''.join(out).strip() + '\n'
+
+MINIFIERS = {
+    '.js': minify_js,
+    '.html': minify_html,
+}
+
+def _compress(data):
+    """Precompressed variants worth serving: {encoding: bytes}"""
+    variants = {}
+    buffer = io.BytesIO()
+    # mtime=0 keeps the output identical between builds
+    with gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=9, mtime=0) as f:
+        f.write(data)
+    variants['gzip'] = buffer.getvalue()
+    if brotli is not None:
+        variants['br'] = brotli.compress(data, quality=11)
+    # A variant that saves less than 5% is not worth the Content-Encoding
+    return {name: body for name, body in variants.items() if len(body) < len(data) * 0.95}
+
+def build_static_assets(source_folder, output_folder):
+    """Minify, fingerprint and precompress the files in ``source_folder``.
+
+    Replaces ``output_folder`` with the built files and a manifest.json
+    describing them; returns the manifest.
+    """
+    built = {}
+    for root, _, files in os.walk(source_folder):
+        for filename in sorted(files):
+            full_path = os.path.join(root, filename)
+            name = os.path.relpath(full_path, source_folder).replace(os.sep, '/')
+            with open(full_path, 'rb') as f:
+                data = f.read()
+            extension = os.path.splitext(name)[1].lower()
+            minifier = MINIFIERS.get(extension)
+            if minifier and extension not in ENTRY_EXTENSIONS:
+                data = minifier(data.decode('utf-8')).encode('utf-8')
+            built[name] = data
+
+    manifest = {'assets': {}}
+    files = {}
+
+    # Fingerprint assets first so the pages can point at their new names
+    for name, data in built.items():
+        if name.endswith(ENTRY_EXTENSIONS):
+            continue
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        stem, extension = os.path.splitext(name)
+        files[name] = (f'assets/{stem}.{digest}{extension}', digest, data)
+
+    for name, data in built.items():
+        if not name.endswith(ENTRY_EXTENSIONS):
+            continue
+        html = data.decode('utf-8')
+        for asset_name, (path, _, _) in files.items():
+            html = re.sub(
+                r'((?:src|href)=["\'])/?' + re.escape(asset_name) + r'(["\'])',
+                lambda match: f'{match.group(1)}/{path}{match.group(2)}',
+                html
+            )
+        data = minify_html(html).encode('utf-8')
+        files[name] = (name, hashlib.sha256(data).hexdigest()[:12], data)
+
+    temp_folder = output_folder.rstrip(os.sep) + '.tmp'
+    shutil.rmtree(temp_folder, ignore_errors=True)
+    for name, (path, digest, data) in sorted(files.items()):
+        variants = _compress(data) if path.endswith(COMPRESSIBLE_EXTENSIONS) else {}
+        target = os.path.join(temp_folder, path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            f.write(data)
+        for encoding, suffix in ENCODINGS:
+            if encoding in variants:
+                with open(target + suffix, 'wb') as f:
+                    f.write(variants[encoding])
+
+        manifest['assets'][name] = {
+            'path': path,
+            'hash': digest,
+            'size': len(data),
+            'encodings': {encoding: len(body) for encoding, body in variants.items()}
+        }
+
+    with open(os.path.join(temp_folder, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    # Swap the whole folder so a running server never sees half a build
+    shutil.rmtree(output_folder, ignore_errors=True)
+    os.replace(temp_folder, output_folder)
+    return manifest
+
+class _Asset:
+    __slots__ = ('bodies', 'mimetype', 'etag', 'cache_control')
+
+    def __init__(self, bodies, mimetype, etag, cache_control):
+        self.bodies = bodies  # {encoding or None: bytes}
+        self.mimetype = mimetype
+        self.etag = etag
+        self.cache_control = cache_control
+
+class StaticAssets:
+    """Serves the frontend from memory.
+
+    With a build (``python manage.py build-assets``) every file and its
+    precompressed variants are read once at startup; requests pick the
+    smallest variant the client accepts and never touch the filesystem.
+    Fingerprinted /assets/ URLs are cached for a year, pages and the
+    original file names are revalidated by ETag. Without a build the
+    source folder is listed once and files are sent as they are.
+    """
+
+    def __init__(self, source_folder, build_folder=None):
+        self.source_folder = source_folder
+        self.build_folder = build_folder
+        self.assets = {}
+        self.source_files = set()
+        self.load()
+
+    @property
+    def built(self):
+        return bool(self.assets)
+
+    def load(self):
+        """(Re)read the build, or index the source folder when there is none"""
+        self.assets = {}
+        self.source_files = set()
+
+        manifest_path = os.path.join(self.build_folder, MANIFEST_NAME) if self.build_folder else None
+        if manifest_path and os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            for name, entry in manifest['assets'].items():
+                full_path = os.path.join(self.build_folder, entry['path'])
+                bodies = {}
+                with open(full_path, 'rb') as f:
+                    bodies[None] = f.read()
+                for encoding, suffix in ENCODINGS:
+                    if encoding in entry['encodings']:
+                        with open(full_path + suffix, 'rb') as f:
+                            bodies[encoding] = f.read()
+                mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+                if entry['path'] != name:
+                    self.assets[entry['path']] = _Asset(bodies, mimetype, entry['hash'], IMMUTABLE)
+                # Old pages and bookmarks may still ask for the plain name
+                self.assets[name] = _Asset(bodies, mimetype, entry['hash'], REVALIDATE)
+            return
+
+        for root, _, files in os.walk(self.source_folder):
+            for filename in files:
+                self.source_files.add(os.path.relpath(os.path.join(root, filename), self.source_folder).replace(os.sep, '/'))
+
+    def response(self, path):
+        """Response for a frontend path; unknown paths get index.html"""
+        if self.built:
+            asset = self.assets.get(path)
+            if asset is None:
+                if path.startswith('assets/'):
+                    return current_app.response_class('Not found', status=404, mimetype='text/plain')
+                asset = self.assets.get('index.html')
+                if asset is None:
+                    return current_app.response_class('index.html not found', status=404, mimetype='text/plain')
+            return self._send(asset)
+
+        if path in self.source_files:
+            return send_from_directory(self.source_folder, path)
+        if 'index.html' in self.source_files:
+            return send_from_directory(self.source_folder, 'index.html')
+        return current_app.response_class('index.html not found', status=404, mimetype='text/plain')
+
+    def _send(self, asset):
+        encoding = None
+        for candidate, _ in ENCODINGS:
+            if candidate in asset.bodies and request.accept_encodings[candidate]:
+                encoding = candidate
+                break
+
+        # Each encoding is a different representation, so it gets its own tag
+        etag = f'{asset.etag}-{encoding}' if encoding else asset.etag
+        response = current_app.response_class(mimetype=asset.mimetype)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = asset.cache_control
+        response.vary.add('Accept-Encoding')
+
+        if not is_resource_modified(request.environ, etag=etag):
+            response.status_code = 304
+            return response
+
+        response.set_data(asset.bodies[encoding])
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        return response
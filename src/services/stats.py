@@ -0,0 +1,105 @@
+from datetime import date, timedelta
+from sqlalchemy import update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from src.models import db, Category, ApplicationStat
+from src.models.application_stat import rebuild_application_stats
+
+class StatsRollup:
+    """Maintains the application_stat rollup behind the admin dashboard.
+
+    Every method works through the current session, so counts change in the
+    same transaction as the application rows they describe (the caller
+    commits).
+    """
+
+    def record_submission(self, application):
+        """Count a newly inserted (flushed) application"""
+        self._add(self._key(application, application.status or 'Pending'), 1)
+
+    def record_submissions(self, applications):
+        """Count a batch of inserted applications, one upsert per rollup key"""
+        deltas = {}
+        for application in applications:
+            key = tuple(self._key(application, application.status or 'Pending').items())
+            deltas[key] = deltas.get(key, 0) + 1
+        for key, delta in deltas.items():
+            self._add(dict(key), delta)
+
+    def record_status_change(self, application, old_status, new_status):
+        """Move an application's count from its old status to the new one"""
+        if old_status == new_status:
+            return
+        self._add(self._key(application, old_status or 'Pending'), -1)
+        self._add(self._key(application, new_status), 1)
+
+    def record_status_changes(self, applications, new_status):
+        """``record_status_change`` for a batch of (id, status, ...) rows moving to one status.
+
+        Rows carry their old ``status``; counts are netted per rollup key so
+        each key is written once.
+        """
+        deltas = {}
+        for application in applications:
+            if application.status == new_status:
+                continue
+            for status, delta in ((application.status or 'Pending', -1), (new_status, 1)):
+                key = tuple(self._key(application, status).items())
+                deltas[key] = deltas.get(key, 0) + delta
+        for key, delta in deltas.items():
+            if delta:
+                self._add(dict(key), delta)
+
+    def rebuild(self):
+        """Recompute the rollup from scratch (backfill and repair)"""
+        rows = rebuild_application_stats(db.session.connection())
+        db.session.commit()
+        return rows
+
+    def summary(self, days=30):
+        """Dashboard statistics, read from the rollup"""
+        count = db.func.sum(ApplicationStat.count)
+
+        status_stats = db.session.query(ApplicationStat.status, count).group_by(ApplicationStat.status).all()
+        district_stats = db.session.query(ApplicationStat.district, count).group_by(ApplicationStat.district).all()
+        category_stats = db.session.query(Category.name, count).join(
+            Category, Category.id == ApplicationStat.category_id
+        ).group_by(Category.name).all()
+        daily_stats = db.session.query(ApplicationStat.day, count).filter(
+            ApplicationStat.day >= date.today() - timedelta(days=days)
+        ).group_by(ApplicationStat.day).all()
+
+        # Decremented keys stay behind as zero rows; leave them out
+        return {
+            'total_applications': sum(total for _, total in status_stats),
+            'status_distribution': {status: total for status, total in status_stats if total},
+            'district_distribution': {district: total for district, total in district_stats if total},
+            'category_distribution': {name: total for name, total in category_stats if total},
+            'daily_applications': {str(day): total for day, total in daily_stats if total}
+        }
+
+    def _key(self, application, status):
+        return {
+            'day': application.created_at.date(),
+            'category_id': application.category_id,
+            'district': application.district,
+            'division': application.division,
+            'status': status,
+        }
+
+    def _add(self, key, delta):
+        table = ApplicationStat.__table__
+
+        if db.session.get_bind().dialect.name == 'sqlite':
+            stmt = sqlite_insert(table).values(count=delta, **key).on_conflict_do_update(
+                index_elements=list(key),
+                set_={'count': table.c.count + delta}
+            )
+            db.session.execute(stmt)
+            return
+
+        updated = db.session.execute(
+            update(table).where(*[table.c[name] == value for name, value in key.items()])
+            .values(count=table.c.count + delta)
+        ).rowcount
+        if not updated:
+            db.session.add(ApplicationStat(count=delta, **key))
@@ -0,0 +1,233 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+from datetime import datetime
+from sqlalchemy import event, inspect, update, delete
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from src.models import db, Application, StoredFile, ImageHash
+
+OBJECTS_FOLDER = 'objects'
+TEMP_FOLDER = 'tmp'
+CHUNK_SIZE = 1024 * 1024
+
+def resolve_upload(upload_folder, relative_path):
+    """Absolute path of a stored upload, or None if it escapes the upload folder.
+
+    Handles both content-addressed paths (``objects/ab/cd/<sha256>.jpg``) and
+    the flat ``photos/<timestamp>_<name>`` paths written before the store.
+    """
+    if not relative_path:
+        return None
+
+    root = os.path.abspath(upload_folder)
+    full_path = os.path.abspath(os.path.join(root, relative_path))
+    if os.path.commonpath([root, full_path]) != root:
+        return None
+    return full_path
+
+def object_digest(relative_path):
+    """SHA-256 encoded in a content-addressed path, or None for legacy paths"""
+    if not relative_path or not relative_path.startswith(OBJECTS_FOLDER + '/'):
+        return None
+    digest = os.path.basename(relative_path).split('.', 1)[0]
+    return digest if len(digest) == 64 else None
+
+class StoredObject:
+    """Result of storing an upload"""
+
+    __slots__ = ('path', 'sha256', 'size', 'created')
+
+    def __init__(self, path, sha256, size, created):
+        self.path = path
+        self.sha256 = sha256
+        self.size = size
+        self.created = created
+
+class UploadStore:
+    """Content-addressed upload storage with reference counting.
+
+    Uploads are streamed to a temp file while hashing, then moved to
+    ``objects/ab/cd/<sha256>.<ext>``. Identical files are stored once; the
+    ``stored_file`` row counts how many application columns point at them.
+    ``save`` only touches the filesystem; the caller adds the reference with
+    ``add_reference`` in the transaction that writes the application row, so
+    no database lock is held while files are processed. Unreferenced
+    objects are removed by ``collect_garbage``.
+    """
+
+    def __init__(self, upload_folder):
+        self.upload_folder = upload_folder
+        self.temp_dir = os.path.join(upload_folder, TEMP_FOLDER)
+        os.makedirs(self.temp_dir, exist_ok=True)
+
+    def object_path(self, sha256, extension):
+        """Sharded relative path for a digest"""
+        return f'{OBJECTS_FOLDER}/{sha256[:2]}/{sha256[2:4]}/{sha256}.{extension}'
+
+    def resolve(self, relative_path):
+        """Absolute path of a stored upload"""
+        return resolve_upload(self.upload_folder, relative_path)
+
+    def save(self, file, extension):
+        """Store an uploaded file as-is; the reference is added separately"""
+        fd, temp_path = tempfile.mkstemp(dir=self.temp_dir, suffix='.upload')
+        try:
+            sha256 = hashlib.sha256()
+            size = 0
+            with os.fdopen(fd, 'wb') as out:
+                for chunk in iter(lambda: file.stream.read(CHUNK_SIZE), b''):
+                    sha256.update(chunk)
+                    size += len(chunk)
+                    out.write(chunk)
+            digest = sha256.hexdigest()
+
+            relative_path = self.object_path(digest, extension.lower())
+            full_path = self.resolve(relative_path)
+            created = not os.path.exists(full_path)
+            if not created:
+                # Touching the object keeps garbage collection's grace period honest
+                os.utime(full_path)
+            else:
+                # Concurrent writers of the same content replace it with identical bytes
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                os.replace(temp_path, full_path)
+
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        return StoredObject(relative_path, digest, size, created)
+
+    def add_reference(self, relative_path, sha256, size):
+        """Increment the refcount for an object (the caller commits)"""
+        table = StoredFile.__table__
+        now = datetime.utcnow()
+
+        if db.session.get_bind().dialect.name == 'sqlite':
+            stmt = sqlite_insert(table).values(
+                path=relative_path, sha256=sha256, size=size, refcount=1,
+                created_at=now, updated_at=now
+            ).on_conflict_do_update(
+                index_elements=['path'],
+                set_={'refcount': table.c.refcount + 1, 'updated_at': now}
+            )
+            db.session.execute(stmt)
+            return
+
+        updated = db.session.execute(
+            update(table).where(table.c.path == relative_path)
+            .values(refcount=table.c.refcount + 1, updated_at=now)
+        ).rowcount
+        if not updated:
+            db.session.add(StoredFile(path=relative_path, sha256=sha256, size=size, refcount=1))
+
+    def release(self, relative_path):
+        """Drop one reference to an object (the caller commits)"""
+        release_references(db.session.connection(), [relative_path])
+
+    def collect_garbage(self, grace_period=3600):
+        """Delete unreferenced objects, their derivatives and stale temp files.
+
+        Files younger than ``grace_period`` seconds are kept so uploads whose
+        application row hasn't committed yet are never removed.
+        """
+        cutoff = time.time() - grace_period
+        removed = 0
+
+        # Objects whose last reference was released; the conditional delete
+        # loses to any upload that re-referenced the object meanwhile
+        table = StoredFile.__table__
+        for (relative_path,) in db.session.query(StoredFile.path).filter(StoredFile.refcount <= 0).all():
+            deleted = db.session.execute(
+                delete(table).where(table.c.path == relative_path, table.c.refcount <= 0)
+            ).rowcount
+            if deleted:
+                db.session.execute(delete(ImageHash.__table__).where(ImageHash.__table__.c.path == relative_path))
+            db.session.commit()
+            if deleted:
+                removed += self._remove_object(relative_path, cutoff)
+
+        # Objects left behind by failed submissions
+        known = {path for (path,) in db.session.query(StoredFile.path)}
+        objects_root = self.resolve(OBJECTS_FOLDER)
+        for dirpath, _, filenames in os.walk(objects_root):
+            for name in filenames:
+                relative_path = os.path.relpath(os.path.join(dirpath, name), self.upload_folder).replace(os.sep, '/')
+                if name.count('.') == 1 and relative_path not in known:
+                    removed += self._remove_object(relative_path, cutoff)
+
+        for entry in os.scandir(self.temp_dir):
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        return removed
+
+    def _remove_object(self, relative_path, cutoff):
+        """Remove an object and every derivative sharing its digest"""
+        full_path = self.resolve(relative_path)
+        try:
+            if os.path.getmtime(full_path) >= cutoff:
+                return 0
+        except OSError:
+            return 0
+
+        base = full_path.rsplit('.', 1)[0]
+        directory = os.path.dirname(full_path)
+        removed = 0
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if path == full_path or path.startswith(base + '.'):
+                os.remove(path)
+                removed += 1
+        return removed
+
+# Application columns holding upload paths; other_documents_path is a JSON list
+FILE_COLUMNS = ('photo_path', 'signature_path', 'nid_image_path')
+
+def release_references(connection, paths):
+    """Drop one reference to each content-addressed object in ``paths``"""
+    table = StoredFile.__table__
+    now = datetime.utcnow()
+    for relative_path in paths:
+        if object_digest(relative_path):
+            connection.execute(
+                update(table).where(table.c.path == relative_path, table.c.refcount > 0)
+                .values(refcount=table.c.refcount - 1, updated_at=now)
+            )
+
+def document_paths(value):
+    """Paths in an other_documents_path JSON list"""
+    try:
+        return [document['path'] for document in json.loads(value or '[]')]
+    except (ValueError, TypeError, KeyError):
+        return []
+
+def _release_replaced(mapper, connection, target):
+    state = inspect(target)
+    released = []
+    for column in FILE_COLUMNS:
+        released.extend(state.attrs[column].history.deleted)
+    for value in state.attrs['other_documents_path'].history.deleted:
+        # Documents kept in the new list keep their reference
+        released.extend(set(document_paths(value)) - set(document_paths(target.other_documents_path)))
+    release_references(connection, [path for path in released if path])
+
+def _release_deleted(mapper, connection, target):
+    paths = [getattr(target, column) for column in FILE_COLUMNS] + document_paths(target.other_documents_path)
+    release_references(connection, [path for path in paths if path])
+
+# Replacing or deleting an application's files gives up its references, so
+# storage-gc can remove objects nothing points at any more. The matching
+# references are added by uploads.register_uploads.
+event.listen(Application, 'after_update', _release_replaced)
+event.listen(Application, 'after_delete', _release_deleted)
+
+def _keep_old_value(target, value, oldvalue, initiator):
+    return value
+
+# Load the replaced value even when the attribute was expired, so the
+# update's history has the path to release
+for _column in FILE_COLUMNS + ('other_documents_path',):
+    event.listen(getattr(Application, _column), 'set', _keep_old_value, active_history=True, retval=True)
@@ -0,0 +1,63 @@
+from .storage import UploadStore
+from .image_processing import ImageProcessor, is_image
+from .image_hash import ImageHashIndex, HASHED_FOLDERS, hash_image_file
+
+ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'pdf', 'doc', 'docx'}
+
+def allowed_file(filename):
+    return '.' in filename and \
+           filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+
+class ProcessedUpload:
+    """An upload stored on disk whose database rows are not written yet"""
+
+    __slots__ = ('path', 'sha256', 'size', 'image_hash')
+
+    def __init__(self, path, sha256, size, image_hash=None):
+        self.path = path
+        self.sha256 = sha256
+        self.size = size
+        self.image_hash = image_hash
+
+def process_upload(upload_folder, file, folder):
+    """Store an uploaded file, its derivatives and its perceptual hash.
+
+    Only reads the database, so it can run before the write transaction
+    starts; pass the result to ``register_uploads`` right before inserting
+    the application. ``file`` is a werkzeug FileStorage (or anything with
+    ``filename`` and a readable ``stream``); returns None for a missing or
+    disallowed file.
+    """
+    if not file or not allowed_file(file.filename):
+        return None
+
+    extension = file.filename.rsplit('.', 1)[1].lower()
+    processor = ImageProcessor(upload_folder)
+    image = is_image(file.filename)
+
+    # Identical files are stored once under their content hash. The
+    # original is kept byte for byte; only derivatives are normalized
+    store = UploadStore(upload_folder)
+    stored = store.save(file, extension)
+
+    # Build normalized PDF/thumbnail derivatives (already present for known content)
+    if image:
+        processor.create_derivatives(stored.path, folder, missing_only=not stored.created)
+
+    # Perceptual hash for near-duplicate image lookups (once per stored object)
+    image_hash = None
+    index = ImageHashIndex()
+    if image and folder in HASHED_FOLDERS and not index.is_indexed(stored.path):
+        image_hash = hash_image_file(store.resolve(stored.path))
+    return ProcessedUpload(stored.path, stored.sha256, stored.size, image_hash)
+
+def register_uploads(upload_folder, uploads):
+    """Add the references and hashes of processed uploads (the caller commits)"""
+    store = UploadStore(upload_folder)
+    index = ImageHashIndex()
+    for upload in uploads:
+        if upload is None:
+            continue
+        store.add_reference(upload.path, upload.sha256, upload.size)
+        if upload.image_hash is not None:
+            index.insert(upload.path, upload.image_hash)
@@ -1,8 +1,8 @@
 // Global variables
 let currentAdmin = null;
 let currentApplicationId = null;
-let currentPage = 1;
-let totalPages = 1;
+let currentCursor = '';
+let selectedApplicationIds = new Set();
 
 // API Base URL
 const API_BASE_URL = '/api';
@@ -183,7 +183,7 @@ function displayStatistics(stats) {
 // Load recent applications
 async function loadRecentApplications() {
     try {
-        const response = await fetch(`${API_BASE_URL}/applications?per_page=5`);
+        const response = await fetch(`${API_BASE_URL}/applications?cursor=&per_page=5&fields=summary`);
         const result = await response.json();
         
         if (result.success) {
@@ -303,20 +303,23 @@ function showSection(sectionName) {
     }
 }
 
-// Load applications with pagination
-async function loadApplications(page = 1) {
+// Load applications with cursor pagination ('' is the first page)
+async function loadApplications(cursor = '') {
     try {
         const status = document.getElementById('statusFilter').value;
         const category = document.getElementById('categoryFilter').value;
+        const search = document.getElementById('searchInput').value.trim();
         
-        let url = `${API_BASE_URL}/applications?page=${page}&per_page=10`;
+        let url = `${API_BASE_URL}/applications?cursor=${encodeURIComponent(cursor)}&per_page=10&include_total=1&fields=summary`;
         if (status) url += `&status=${status}`;
         if (category) url += `&category_id=${category}`;
+        if (search) url += `&q=${encodeURIComponent(search)}`;
         
         const response = await fetch(url);
         const result = await response.json();
         
         if (result.success) {
+            currentCursor = cursor;
             displayApplications(result.data);
             displayPagination(result.pagination);
         }
@@ -329,10 +332,13 @@ async function loadApplications(page = 1) {
 function displayApplications(applications) {
     const tbody = document.getElementById('applicationsTable');
     tbody.innerHTML = '';
+    document.getElementById('selectAllApplications').checked = false;
     
     applications.forEach(app => {
         const row = document.createElement('tr');
         row.innerHTML = `
+            <td><input type="checkbox" class="form-check-input application-select" value="${app.id}"
+                       ${selectedApplicationIds.has(app.id) ? 'checked' : ''} onchange="toggleApplication(${app.id}, this.checked)"></td>
             <td>${app.reference_number}</td>
             <td>${app.full_name}</td>
             <td>${app.category_name}</td>
@@ -360,39 +366,36 @@ function displayPagination(pagination) {
     const container = document.getElementById('pagination');
     container.innerHTML = '';
     
-    currentPage = pagination.page;
-    totalPages = pagination.pages;
-    
     // Previous button
     const prevLi = document.createElement('li');
     prevLi.className = `page-item ${pagination.has_prev ? '' : 'disabled'}`;
     prevLi.innerHTML = `
-        <a class="page-link" href="#" onclick="loadApplications(${pagination.page - 1})">Previous</a>
+        <a class="page-link" href="#" onclick="loadApplications('${pagination.prev_cursor || ''}')">Previous</a>
     `;
     container.appendChild(prevLi);
     
-    // Page numbers
-    for (let i = 1; i <= pagination.pages; i++) {
-        const li = document.createElement('li');
-        li.className = `page-item ${i === pagination.page ? 'active' : ''}`;
-        li.innerHTML = `
-            <a class="page-link" href="#" onclick="loadApplications(${i})">${i}</a>
+    // Total (cached on the server, so it may lag a few seconds)
+    if (pagination.total !== undefined) {
+        const totalLi = document.createElement('li');
+        totalLi.className = 'page-item disabled';
+        totalLi.innerHTML = `
+            <span class="page-link">${pagination.total} applications</span>
         `;
-        container.appendChild(li);
+        container.appendChild(totalLi);
     }
     
     // Next button
     const nextLi = document.createElement('li');
     nextLi.className = `page-item ${pagination.has_next ? '' : 'disabled'}`;
     nextLi.innerHTML = `
-        <a class="page-link" href="#" onclick="loadApplications(${pagination.page + 1})">Next</a>
+        <a class="page-link" href="#" onclick="loadApplications('${pagination.next_cursor || ''}')">Next</a>
     `;
     container.appendChild(nextLi);
 }
 
 // Search applications
 function searchApplications() {
-    loadApplications(1);
+    loadApplications('');
 }
 
 // View application details
@@ -448,10 +451,34 @@ function displayApplicationDetails(application) {
                 <p><strong>Category:</strong> ${application.category_name}</p>
                 <p><strong>Status:</strong> <span class="status-badge status-${application.status.toLowerCase().replace(' ', '-')}">${application.status}</span></p>
             </div>
+            <div class="col-12">
+                <h6>Documents</h6>
+                ${documentThumbnails(application)}
+            </div>
         </div>
     `;
 }
 
+// Thumbnails of uploaded images (small derivatives, not the originals)
+function documentThumbnails(application) {
+    const documents = [
+        { kind: 'photo', path: application.photo_path, label: 'Photo' },
+        { kind: 'signature', path: application.signature_path, label: 'Signature' },
+        { kind: 'nid_image', path: application.nid_image_path, label: 'NID' }
+    ].filter(doc => doc.path && ['png', 'jpg', 'jpeg', 'gif'].includes(doc.path.split('.').pop().toLowerCase()));
+    
+    if (documents.length === 0) {
+        return '<p class="text-muted">No documents uploaded</p>';
+    }
+    
+    return documents.map(doc => `
+        <a href="${API_BASE_URL}/applications/${application.id}/files/${doc.kind}" target="_blank" title="${doc.label}">
+            <img class="document-thumb" loading="lazy" alt="${doc.label}"
+                 src="${API_BASE_URL}/applications/${application.id}/files/${doc.kind}?variant=thumb">
+        </a>
+    `).join('');
+}
+
 // Show status update modal
 function showStatusModal(applicationId, currentStatus) {
     currentApplicationId = applicationId;
@@ -484,7 +511,7 @@ async function updateApplicationStatus() {
             modal.hide();
             
             // Reload applications
-            loadApplications(currentPage);
+            loadApplications(currentCursor);
             loadRecentApplications();
         } else {
             showAlert('Error updating status: ' + result.message, 'danger');
@@ -495,6 +522,78 @@ async function updateApplicationStatus() {
     }
 }
 
+// Track applications selected for a bulk status change (kept across pages)
+function toggleApplication(applicationId, checked) {
+    if (checked) {
+        selectedApplicationIds.add(applicationId);
+    } else {
+        selectedApplicationIds.delete(applicationId);
+    }
+    document.getElementById('selectedCount').textContent = selectedApplicationIds.size;
+}
+
+function toggleAllApplications(checked) {
+    document.querySelectorAll('.application-select').forEach(checkbox => {
+        checkbox.checked = checked;
+        toggleApplication(parseInt(checkbox.value), checked);
+    });
+}
+
+// Move the selected applications (or everything matching the filters) to one status in one request
+async function bulkUpdateStatus(mode) {
+    const newStatus = document.getElementById('bulkStatus').value;
+    const body = { status: newStatus };
+    
+    if (mode === 'selected') {
+        if (selectedApplicationIds.size === 0) {
+            showAlert('Select at least one application.', 'warning');
+            return;
+        }
+        body.ids = Array.from(selectedApplicationIds);
+    } else {
+        body.filters = {
+            status: document.getElementById('statusFilter').value,
+            category_id: document.getElementById('categoryFilter').value,
+            q: document.getElementById('searchInput').value.trim()
+        };
+        if (!Object.values(body.filters).some(value => value)) {
+            showAlert('Set a filter first; updating every application at once is not allowed.', 'warning');
+            return;
+        }
+    }
+    
+    const target = mode === 'selected' ? `${body.ids.length} selected` : 'all matching';
+    if (!confirm(`Set ${target} applications to "${newStatus}"?`)) {
+        return;
+    }
+    
+    try {
+        const response = await fetch(`${API_BASE_URL}/applications/status`, {
+            method: 'PUT',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify(body)
+        });
+        
+        const result = await response.json();
+        
+        if (result.success) {
+            const data = result.data;
+            showAlert(`Updated ${data.updated}, unchanged ${data.unchanged}, not found ${data.not_found}.`, 'success');
+            selectedApplicationIds.clear();
+            document.getElementById('selectedCount').textContent = 0;
+            loadApplications(currentCursor);
+            loadRecentApplications();
+        } else {
+            showAlert('Error updating statuses: ' + result.message, 'danger');
+        }
+    } catch (error) {
+        console.error('Error updating statuses:', error);
+        showAlert('Error updating application statuses.', 'danger');
+    }
+}
+
 // Show add category modal
 function showAddCategoryModal() {
     document.getElementById('addCategoryForm').reset();
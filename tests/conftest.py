@@ -0,0 +1,100 @@
+import os
+import sys
+import tempfile
+from datetime import date, datetime
+
+import pytest
+
+# The app reads its database location when src.main is imported, so point
+# it at a scratch database first
+_scratch = tempfile.mkdtemp(prefix='statebd-tests-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_scratch, 'test.db')}"
+os.environ['EMAIL_DELIVERY'] = 'log'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete, text
+from src.main import app as flask_app
+from src.models import db, Application, Category
+from src.models.application import new_reference_number
+from src.services import lookup_cache
+from src.services.pagination import clear_counts
+
+flask_app.config.update(
+    TESTING=True,
+    UPLOAD_FOLDER=os.path.join(_scratch, 'uploads'),
+)
+
+@pytest.fixture(scope='session')
+def app():
+    return flask_app
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def app_context(app):
+    with app.app_context():
+        yield
+        db.session.remove()
+
+@pytest.fixture(autouse=True)
+def clean_database(app):
+    """Empty every table and in-process cache after each test"""
+    yield
+    with app.app_context():
+        db.session.rollback()
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(delete(table))
+        db.session.execute(text('DELETE FROM application_name_fts'))
+        db.session.commit()
+        db.session.remove()
+    if lookup_cache._cache is not None:
+        lookup_cache._cache.clear()
+    clear_counts()
+
+@pytest.fixture
+def category(app):
+    """Id of an active category"""
+    with app.app_context():
+        category = Category(name='Livestock Support', is_active=True)
+        db.session.add(category)
+        db.session.commit()
+        return category.id
+
+@pytest.fixture
+def make_application(app, category):
+    """Insert an application and return its id; keyword arguments override fields"""
+    counter = iter(range(1, 1000000))
+
+    def make(**fields):
+        number = next(counter)
+        values = {
+            'reference_number': new_reference_number(),
+            'full_name': 'Mohammad Rahman',
+            'father_name': 'Abdul Karim',
+            'mother_name': 'Fatema Begum',
+            'nid_number': f'{1990000000000 + number}',
+            'date_of_birth': date(1990, 1, 1),
+            'occupation': 'Farmer',
+            'village': 'Char Alexander',
+            'upazila': 'Ramgati',
+            'district': 'Lakshmipur',
+            'division': 'Chattogram',
+            'family_members_count': 5,
+            'monthly_income': 8000.0,
+            'main_earner_occupation': 'Farmer',
+            'email': f'applicant{number}@example.com',
+            'mobile_number': f'0171{number:07d}',
+            'status': 'Pending',
+            'category_id': category,
+            'created_at': datetime(2025, 1, 1),
+        }
+        values.update(fields)
+        with app.app_context():
+            application = Application(**values)
+            db.session.add(application)
+            db.session.commit()
+            return application.id
+
+    return make
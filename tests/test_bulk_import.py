@@ -0,0 +1,175 @@
+import io
+import csv
+import zipfile
+
+import pytest
+from PIL import Image
+
+from src.models import db, Application, Category, Job, StoredFile
+from src.models.application import REQUIRED_FIELDS
+from src.services import ApplicationImporter
+
+COLUMNS = REQUIRED_FIELDS + ('photo',)
+
+def row(category_id, number, **overrides):
+    values = {
+        'full_name': f'Applicant {number}',
+        'father_name': 'Abdul Karim',
+        'mother_name': 'Fatema Begum',
+        'nid_number': f'{1985000000000 + number}',
+        'date_of_birth': '1985-06-15',
+        'occupation': 'Fisher',
+        'village': 'Char Alexander',
+        'upazila': 'Ramgati',
+        'district': 'Lakshmipur',
+        'division': 'Chattogram',
+        'family_members_count': '4',
+        'monthly_income': '7500',
+        'main_earner_occupation': 'Fisher',
+        'email': f'applicant{number}@example.com',
+        'mobile_number': f'0181{number:07d}',
+        'category_id': str(category_id),
+        'photo': '',
+    }
+    values.update(overrides)
+    return values
+
+def csv_file(rows, columns=COLUMNS):
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=columns, extrasaction='ignore')
+    writer.writeheader()
+    writer.writerows(rows)
+    out.seek(0)
+    return out
+
+def png_bytes(color):
+    buffer = io.BytesIO()
+    Image.new('RGB', (64, 64), color).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+def run_import(app, rows, archive=None, dry_run=False, **kwargs):
+    with app.app_context():
+        importer = ApplicationImporter(app.config['UPLOAD_FOLDER'], **kwargs)
+        return importer.run(csv_file(rows), archive=archive, dry_run=dry_run).to_dict()
+
+def test_valid_rows_are_imported_in_chunks(app, category):
+    report = run_import(app, [row(category, i) for i in range(7)], chunk_size=3)
+
+    assert report['total'] == 7
+    assert report['imported'] == 7
+    assert report['failed'] == 0
+    assert [entry['row'] for entry in report['references']] == list(range(2, 9))
+    with app.app_context():
+        applications = Application.query.order_by(Application.id).all()
+        assert [application.full_name for application in applications] == [f'Applicant {i}' for i in range(7)]
+        assert {application.status for application in applications} == {'Pending'}
+        assert len({application.reference_number for application in applications}) == 7
+        # One confirmation email per imported application
+        assert Job.query.filter_by(kind='application_confirmation').count() == 7
+
+def test_invalid_rows_are_reported_and_the_rest_imported(app, category):
+    with app.app_context():
+        inactive = Category(name='Closed Programme', is_active=False)
+        db.session.add(inactive)
+        db.session.commit()
+        inactive_id = inactive.id
+
+    rows = [
+        row(category, 1),
+        row(category, 2, date_of_birth='15/06/1985'),
+        row(category, 3, full_name=''),
+        row(inactive_id, 4),
+        row(category, 5, family_members_count='many'),
+        row(category, 6),
+    ]
+    report = run_import(app, rows)
+
+    assert report['imported'] == 2
+    assert report['failed'] == 4
+    assert {error['row']: error['message'] for error in report['errors']} == {
+        3: 'Field date_of_birth must be a date (YYYY-MM-DD)',
+        4: 'Field full_name is required',
+        5: 'Invalid category selected',
+        6: 'Field family_members_count must be a number',
+    }
+    with app.app_context():
+        assert Application.query.count() == 2
+
+def test_missing_columns_are_rejected(app, category):
+    columns = tuple(name for name in COLUMNS if name != 'mobile_number')
+
+    with app.app_context(), pytest.raises(ValueError, match='mobile_number'):
+        ApplicationImporter(app.config['UPLOAD_FOLDER']).run(csv_file([row(category, 1)], columns))
+
+def test_dry_run_writes_nothing(app, category):
+    report = run_import(app, [row(category, 1), row(category, 2, email='')], dry_run=True)
+
+    assert report['dry_run'] is True
+    assert report['imported'] == 1
+    assert report['failed'] == 1
+    with app.app_context():
+        assert Application.query.count() == 0
+        assert Job.query.count() == 0
+
+def test_archive_files_are_stored_once_and_referenced(app, category):
+    archive_bytes = io.BytesIO()
+    with zipfile.ZipFile(archive_bytes, 'w') as archive:
+        archive.writestr('scans/red.png', png_bytes('red'))
+    archive_bytes.seek(0)
+
+    rows = [row(category, 1, photo='scans/red.png'), row(category, 2, photo='red.png')]
+    with zipfile.ZipFile(archive_bytes) as archive:
+        report = run_import(app, rows, archive=archive, send_emails=False)
+
+    assert report['imported'] == 2
+    with app.app_context():
+        paths = {application.photo_path for application in Application.query}
+        assert len(paths) == 1
+        [path] = paths
+        assert path.startswith('objects/')
+        assert db.session.query(StoredFile.refcount).filter_by(path=path).scalar() == 2
+
+def test_file_missing_from_archive_is_reported(app, category):
+    archive_bytes = io.BytesIO()
+    with zipfile.ZipFile(archive_bytes, 'w') as archive:
+        archive.writestr('red.png', png_bytes('red'))
+    archive_bytes.seek(0)
+
+    with zipfile.ZipFile(archive_bytes) as archive:
+        report = run_import(app, [row(category, 1, photo='blue.png')], archive=archive)
+
+    assert report['imported'] == 0
+    assert report['errors'] == [{'row': 2, 'message': 'File blue.png not found in the archive'}]
+
+def test_file_column_without_archive_is_reported(app, category):
+    report = run_import(app, [row(category, 1, photo='red.png')])
+
+    assert report['failed'] == 1
+    assert 'no archive' in report['errors'][0]['message']
+
+def test_import_endpoint(client, app, category):
+    data = csv_file([row(category, 1), row(category, 2, nid_number='')]).getvalue().encode('utf-8')
+
+    response = client.post('/api/applications/import', data={
+        'file': (io.BytesIO(data), 'applications.csv'),
+    }, content_type='multipart/form-data')
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['data']['imported'] == 1
+    assert body['data']['failed'] == 1
+
+def test_import_endpoint_requires_a_csv(client):
+    response = client.post('/api/applications/import', data={}, content_type='multipart/form-data')
+
+    assert response.status_code == 400
+
+def test_import_endpoint_rejects_a_bad_archive(client, category):
+    data = csv_file([row(category, 1)]).getvalue().encode('utf-8')
+
+    response = client.post('/api/applications/import', data={
+        'file': (io.BytesIO(data), 'applications.csv'),
+        'archive': (io.BytesIO(b'not a zip'), 'scans.zip'),
+    }, content_type='multipart/form-data')
+
+    assert response.status_code == 400
@@ -0,0 +1,112 @@
+import json
+
+import pytest
+
+from src.models import db, Application, Job
+from src.services import BulkStatusUpdate
+
+def statuses(app):
+    with app.app_context():
+        return dict(db.session.query(Application.id, Application.status).all())
+
+def batch_jobs(app):
+    with app.app_context():
+        return [json.loads(job.payload) for job in Job.query.filter_by(kind='status_update_batch').order_by(Job.id)]
+
+def put_status(client, **body):
+    return client.put('/api/applications/status', json=body)
+
+def test_update_by_ids(client, app, make_application):
+    pending = make_application()
+    approved = make_application(status='Approved')
+
+    response = put_status(client, status='Approved', ids=[pending, approved, 999999])
+
+    assert response.status_code == 200
+    data = response.get_json()['data']
+    assert data['updated'] == 1
+    assert data['unchanged'] == 1
+    assert data['not_found'] == 1
+    assert data['results'] == [
+        {'id': pending, 'result': 'updated', 'old_status': 'Pending'},
+        {'id': approved, 'result': 'unchanged', 'old_status': 'Approved'},
+        {'id': 999999, 'result': 'not_found', 'old_status': None},
+    ]
+    assert statuses(app) == {pending: 'Approved', approved: 'Approved'}
+    # Only the changed application is notified, in one batch job
+    assert batch_jobs(app) == [{'new_status': 'Approved', 'changes': [[pending, 'Pending']]}]
+    assert len(data['job_ids']) == 1
+
+def test_update_by_filters(client, app, make_application):
+    dhaka = make_application(district='Dhaka')
+    dhaka_rejected = make_application(district='Dhaka', status='Rejected')
+    khulna = make_application(district='Khulna')
+
+    response = put_status(client, status='In Progress', filters={'district': 'Dhaka', 'status': 'Pending'})
+
+    assert response.status_code == 200
+    assert response.get_json()['data']['updated'] == 1
+    assert statuses(app) == {dhaka: 'In Progress', dhaka_rejected: 'Rejected', khulna: 'Pending'}
+
+def test_update_by_search_filter(client, app, make_application):
+    rahim = make_application(full_name='Abdur Rahim')
+    karim = make_application(full_name='Abdul Karim')
+
+    response = put_status(client, status='Rejected', filters={'q': 'Rahim'})
+
+    assert response.status_code == 200
+    assert statuses(app) == {rahim: 'Rejected', karim: 'Pending'}
+
+def test_update_is_visible_to_later_reads(client, make_application):
+    application_id = make_application()
+    reference = client.get('/api/applications', query_string={'per_page': 1}).get_json()['data'][0]['reference_number']
+    # Warm the lookup cache
+    assert client.get(f'/api/applications/{reference}').get_json()['data']['status'] == 'Pending'
+
+    put_status(client, status='Approved', ids=[application_id])
+
+    assert client.get(f'/api/applications/{reference}').get_json()['data']['status'] == 'Approved'
+
+@pytest.mark.parametrize('body, message', [
+    ({'status': 'Approved'}, 'Give either ids or a filter'),
+    ({'status': 'Done', 'ids': [1]}, 'Invalid status'),
+    ({'status': 'Approved', 'ids': '1,2'}, 'ids must be a list of integers'),
+    ({'status': 'Approved', 'ids': [1, 'two']}, 'ids must be a list of integers'),
+    ({'status': 'Approved', 'ids': [True]}, 'ids must be a list of integers'),
+    ({'status': 'Approved', 'filters': ['status']}, 'filters must be an object'),
+    ({'status': 'Approved', 'filters': {'nid_number': '123'}}, 'Unknown filters: nid_number'),
+    ({'status': 'Approved', 'filters': {}}, 'Give at least one filter'),
+    ({'status': 'Approved', 'filters': {'status': '  ', 'district': None}}, 'Give at least one filter'),
+])
+def test_invalid_requests_are_rejected(client, app, make_application, body, message):
+    application_id = make_application()
+
+    response = put_status(client, **body)
+
+    assert response.status_code == 400
+    assert message in response.get_json()['message']
+    assert statuses(app) == {application_id: 'Pending'}
+    assert batch_jobs(app) == []
+
+def test_too_many_targets_are_rejected(app, make_application):
+    ids = [make_application() for _ in range(3)]
+
+    with app.app_context():
+        update = BulkStatusUpdate(max_applications=2)
+        with pytest.raises(ValueError, match='At most 2'):
+            update.apply('Approved', ids=ids)
+        with pytest.raises(ValueError, match='narrow it down'):
+            update.apply('Approved', query=Application.query)
+        db.session.rollback()
+
+    assert set(statuses(app).values()) == {'Pending'}
+
+def test_large_updates_are_notified_in_batches(app, make_application):
+    ids = [make_application() for _ in range(5)]
+    with app.app_context():
+        summary = BulkStatusUpdate(batch_size=2).apply('Approved', ids=ids)
+        db.session.commit()
+
+    assert summary['updated'] == 5
+    assert len(summary['job_ids']) == 3
+    assert [len(job['changes']) for job in batch_jobs(app)] == [2, 2, 1]
@@ -0,0 +1,139 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models import db, Job
+from src.services.job_queue import JobQueue, JobWorker, JOB_HANDLERS
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Register a ``test_job`` handler that records payloads and fails on request"""
+    received = []
+
+    def handler(payload):
+        received.append(payload)
+        if payload.get('fail'):
+            raise RuntimeError('handler failed')
+
+    monkeypatch.setitem(JOB_HANDLERS, 'test_job', handler)
+    return received
+
+def enqueue(app, payload=None, **kwargs):
+    with app.app_context():
+        job = JobQueue().enqueue('test_job', payload, **kwargs)
+        db.session.commit()
+        return job.id
+
+def load(app, job_id):
+    with app.app_context():
+        job = db.session.get(Job, job_id)
+        db.session.expunge(job)
+        return job
+
+def test_enqueue_rejects_unknown_kind(app_context):
+    with pytest.raises(ValueError):
+        JobQueue().enqueue('no_such_job')
+
+def test_claim_next_claims_a_job_once(app, app_context, calls):
+    job_id = enqueue(app)
+    queue = JobQueue()
+
+    job = queue.claim_next('worker-a')
+    assert job.id == job_id
+    assert job.status == 'running'
+    assert job.attempts == 1
+    assert job.locked_by == 'worker-a'
+
+    assert queue.claim_next('worker-b') is None
+
+def test_claim_next_skips_jobs_not_yet_due(app, app_context, calls):
+    enqueue(app, run_at=datetime.utcnow() + timedelta(minutes=5))
+
+    assert JobQueue().claim_next('worker-a') is None
+
+def test_claim_next_takes_the_oldest_due_job_first(app, app_context, calls):
+    later = enqueue(app, run_at=datetime.utcnow() - timedelta(seconds=10))
+    earlier = enqueue(app, run_at=datetime.utcnow() - timedelta(seconds=60))
+    queue = JobQueue()
+
+    assert queue.claim_next('worker-a').id == earlier
+    assert queue.claim_next('worker-a').id == later
+
+def test_failed_job_is_retried_after_backoff(app, app_context, calls):
+    job_id = enqueue(app)
+    queue = JobQueue(retry_base_delay=30)
+    job = queue.claim_next('worker-a')
+
+    before = datetime.utcnow()
+    queue.mark_failed(job, 'boom')
+
+    job = db.session.get(Job, job_id)
+    assert job.status == 'queued'
+    assert job.last_error == 'boom'
+    assert job.locked_by is None
+    assert job.finished_at is None
+    # 30 s give or take the 20% jitter
+    delay = (job.run_at - before).total_seconds()
+    assert 23 <= delay <= 37
+
+def test_job_out_of_attempts_fails(app, app_context, calls):
+    job_id = enqueue(app, max_attempts=1)
+    queue = JobQueue()
+    job = queue.claim_next('worker-a')
+
+    queue.mark_failed(job, 'boom')
+
+    job = db.session.get(Job, job_id)
+    assert job.status == 'failed'
+    assert job.finished_at is not None
+
+def test_retry_delay_doubles_up_to_the_cap(monkeypatch):
+    monkeypatch.setattr(random, 'uniform', lambda low, high: 1.0)
+    queue = JobQueue(retry_base_delay=30, max_retry_delay=3600)
+
+    assert [queue.retry_delay(attempts) for attempts in (1, 2, 3, 4)] == [30, 60, 120, 240]
+    assert queue.retry_delay(20) == 3600
+
+def test_requeue_stale_returns_or_fails_abandoned_jobs(app, app_context, calls):
+    retryable = enqueue(app)
+    exhausted = enqueue(app, max_attempts=1)
+    queue = JobQueue()
+    for _ in range(2):
+        job = queue.claim_next('crashed-worker')
+        job.locked_at = datetime.utcnow() - timedelta(hours=1)
+    db.session.commit()
+
+    assert queue.requeue_stale(stale_after=600) == 2
+
+    job = db.session.get(Job, retryable)
+    assert job.status == 'queued'
+    assert job.locked_by is None
+    job = db.session.get(Job, exhausted)
+    assert job.status == 'failed'
+    assert job.finished_at is not None
+    assert 'crashed-worker' in job.last_error
+
+def test_requeue_stale_leaves_recent_jobs_alone(app, app_context, calls):
+    job_id = enqueue(app)
+    queue = JobQueue()
+    queue.claim_next('worker-a')
+
+    assert queue.requeue_stale(stale_after=600) == 0
+    assert db.session.get(Job, job_id).status == 'running'
+
+def test_worker_runs_jobs_and_requeues_failures(app, calls):
+    done = enqueue(app, {'n': 1})
+    failing = enqueue(app, {'n': 2, 'fail': True})
+
+    processed = JobWorker(app, worker_id='worker-a').run(drain=True)
+
+    # The failed job waits out its backoff, so the drain stops after one pass
+    assert processed == 2
+    assert calls == [{'n': 1}, {'n': 2, 'fail': True}]
+    assert load(app, done).status == 'done'
+    job = load(app, failing)
+    assert job.status == 'queued'
+    assert job.attempts == 1
+    assert 'handler failed' in job.last_error
+    assert job.run_at > datetime.utcnow()
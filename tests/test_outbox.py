@@ -0,0 +1,164 @@
+import socket
+import time
+from datetime import datetime
+from email.message import EmailMessage
+
+import pytest
+
+from src.models import db, OutboundEmail
+from src.services.mail_delivery import Outbox, OutboxWorker, RateLimiter, SMTPConnectionPool
+from src.services.smtp_sink import SMTPSink
+
+@pytest.fixture
+def sink():
+    server = SMTPSink(port=0, reject_domain='invalid.test').start()
+    yield server
+    server.stop()
+
+def pool_for(port, size=2):
+    return SMTPConnectionPool('127.0.0.1', port, size=size, timeout=5)
+
+def closed_port():
+    """A local port nothing listens on"""
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def enqueue(app, recipients, max_attempts=8):
+    with app.app_context():
+        outbox = Outbox()
+        ids = []
+        for recipient in recipients:
+            msg = EmailMessage()
+            msg['From'] = 'noreply@statebd.org'
+            msg['To'] = recipient
+            msg['Subject'] = f'Hello {recipient}'
+            msg.set_content('Your application was received.')
+            ids.append(outbox.enqueue(msg, max_attempts=max_attempts))
+        db.session.commit()
+        return [email.id for email in ids]
+
+def load(app, ids):
+    with app.app_context():
+        emails = OutboundEmail.query.filter(OutboundEmail.id.in_(ids)).order_by(OutboundEmail.id).all()
+        db.session.expunge_all()
+        return emails
+
+def test_worker_delivers_queued_messages_through_the_sink(app, sink):
+    ids = enqueue(app, [f'applicant{i}@example.com' for i in range(10)])
+
+    pool = pool_for(sink.port)
+    sent = OutboxWorker(app, pool=pool, rate=0).run(drain=True)
+
+    assert sent == 10
+    assert sink.count == 10
+    assert {recipients[0] for _, recipients, _ in sink.messages} == {f'applicant{i}@example.com' for i in range(10)}
+    # Sessions are reused rather than opened per message
+    assert pool.connects <= pool.size
+    for email in load(app, ids):
+        assert email.status == 'sent'
+        assert email.sent_at is not None
+        assert email.attempts == 1
+        assert email.locked_by is None
+
+def test_permanent_rejection_is_dead_lettered(app, sink):
+    good, bad = enqueue(app, ['applicant@example.com', 'nobody@invalid.test'])
+
+    sent = OutboxWorker(app, pool=pool_for(sink.port), rate=0).run(drain=True)
+
+    assert sent == 1
+    emails = {email.id: email for email in load(app, [good, bad])}
+    assert emails[good].status == 'sent'
+    assert emails[bad].status == 'dead'
+    assert emails[bad].attempts == 1
+    assert '550' in emails[bad].last_error
+
+def test_transient_failure_is_retried_with_backoff(app):
+    [email_id] = enqueue(app, ['applicant@example.com'])
+
+    before = datetime.utcnow()
+    sent = OutboxWorker(app, pool=pool_for(closed_port()), rate=0).run(drain=True)
+
+    assert sent == 0
+    [email] = load(app, [email_id])
+    assert email.status == 'queued'
+    assert email.attempts == 1
+    assert email.last_error
+    # First retry waits the base delay (60 s) give or take the jitter
+    delay = (email.next_attempt_at - before).total_seconds()
+    assert 45 <= delay <= 75
+
+def test_message_out_of_attempts_is_dead_lettered_and_can_be_retried(app, sink):
+    [email_id] = enqueue(app, ['applicant@example.com'], max_attempts=1)
+
+    OutboxWorker(app, pool=pool_for(closed_port()), rate=0).run(drain=True)
+    [email] = load(app, [email_id])
+    assert email.status == 'dead'
+
+    with app.app_context():
+        assert Outbox().retry_dead([email_id]) == 1
+
+    sent = OutboxWorker(app, pool=pool_for(sink.port), rate=0).run(drain=True)
+    assert sent == 1
+    [email] = load(app, [email_id])
+    assert email.status == 'sent'
+    assert email.attempts == 1
+
+def test_claim_takes_each_message_once(app):
+    enqueue(app, [f'applicant{i}@example.com' for i in range(5)])
+
+    with app.app_context():
+        outbox = Outbox()
+        first = outbox.claim('worker-a', limit=3)
+        second = outbox.claim('worker-b', limit=10)
+        third = outbox.claim('worker-c', limit=10)
+
+        assert len(first) == 3
+        assert len(second) == 2
+        assert third == []
+        assert not {email.id for email in first} & {email.id for email in second}
+        assert all(email.status == 'sending' for email in first + second)
+
+def test_requeue_stale_returns_abandoned_messages(app):
+    [email_id] = enqueue(app, ['applicant@example.com'])
+
+    with app.app_context():
+        outbox = Outbox()
+        [email] = outbox.claim('crashed-worker')
+        email.locked_at = datetime(2000, 1, 1)
+        db.session.commit()
+
+        assert outbox.requeue_stale(stale_after=600) == 1
+        email = db.session.get(OutboundEmail, email_id)
+        assert email.status == 'queued'
+        assert email.locked_by is None
+
+def test_rate_limiter_spaces_sends():
+    limiter = RateLimiter(rate=20, burst=1)
+
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    elapsed = time.monotonic() - start
+
+    # The first token is free, the other five arrive every 50 ms
+    assert elapsed >= 0.2
+
+def test_rate_limiter_disabled_without_rate():
+    limiter = RateLimiter(rate=0)
+
+    start = time.monotonic()
+    for _ in range(1000):
+        limiter.acquire()
+    assert time.monotonic() - start < 0.1
+
+def test_worker_honours_rate_limit(app, sink):
+    enqueue(app, [f'applicant{i}@example.com' for i in range(8)])
+
+    start = time.monotonic()
+    sent = OutboxWorker(app, pool=pool_for(sink.port), rate=4).run(drain=True)
+    elapsed = time.monotonic() - start
+
+    # A burst of four, then four more at four per second
+    assert sent == 8
+    assert elapsed >= 0.75
@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models import Application
+from src.services.pagination import encode_cursor, decode_cursor
+
+COLUMNS = [Application.created_at, Application.id]
+
+@pytest.fixture
+def applications(make_application):
+    """25 applications, newest last; every third shares its neighbour's timestamp"""
+    start = datetime(2025, 1, 1, 9, 0)
+    ids = []
+    for i in range(25):
+        created_at = start + timedelta(minutes=i - i % 3)
+        district = 'Dhaka' if i % 2 else 'Khulna'
+        ids.append(make_application(created_at=created_at, district=district))
+    return ids
+
+def listing_order(client, **params):
+    """Ids of the page-number listing, which every cursor walk must match"""
+    response = client.get('/api/applications', query_string=dict(params, per_page=100))
+    return [item['id'] for item in response.get_json()['data']]
+
+def walk(client, **params):
+    """Follow next_cursor from the first page; returns the pages of ids"""
+    pages = []
+    cursor = ''
+    while cursor is not None:
+        response = client.get('/api/applications', query_string=dict(params, cursor=cursor))
+        assert response.status_code == 200
+        body = response.get_json()
+        pages.append([item['id'] for item in body['data']])
+        cursor = body['pagination']['next_cursor']
+    return pages
+
+def test_cursor_round_trip():
+    token = encode_cursor([datetime(2025, 1, 1, 9, 30), 42], 'next', 'newest', (('status', 'Pending'),))
+
+    values, direction = decode_cursor(token, COLUMNS, 'newest', (('status', 'Pending'),))
+
+    assert values == [datetime(2025, 1, 1, 9, 30), 42]
+    assert direction == 'next'
+
+@pytest.mark.parametrize('ordering, filters', [
+    ('relevance', (('status', 'Pending'),)),
+    ('newest', (('status', 'Approved'),)),
+    ('newest', ()),
+])
+def test_cursor_rejects_other_ordering_or_filters(ordering, filters):
+    token = encode_cursor([datetime(2025, 1, 1), 42], 'next', 'newest', (('status', 'Pending'),))
+
+    with pytest.raises(ValueError):
+        decode_cursor(token, COLUMNS, ordering, filters)
+
+@pytest.mark.parametrize('token', ['not-a-cursor', encode_cursor([1, 2, 3], 'next'), encode_cursor([None, 1], 'sideways')])
+def test_cursor_rejects_malformed_tokens(token):
+    with pytest.raises(ValueError):
+        decode_cursor(token, COLUMNS)
+
+def test_cursor_walk_matches_listing_order(client, applications):
+    pages = walk(client, per_page=10)
+
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert [application_id for page in pages for application_id in page] == listing_order(client)
+    assert sorted(listing_order(client)) == sorted(applications)
+
+def test_cursor_walk_with_filters(client, applications):
+    pages = walk(client, per_page=4, district='Dhaka')
+
+    walked = [application_id for page in pages for application_id in page]
+    assert walked == listing_order(client, district='Dhaka')
+    assert len(walked) == 12
+
+def test_prev_cursor_returns_previous_page(client, applications):
+    first = client.get('/api/applications', query_string={'cursor': '', 'per_page': 10}).get_json()
+    second = client.get('/api/applications', query_string={
+        'cursor': first['pagination']['next_cursor'], 'per_page': 10
+    }).get_json()
+    assert first['pagination']['has_prev'] is False
+    assert second['pagination']['has_prev'] is True
+
+    back = client.get('/api/applications', query_string={
+        'cursor': second['pagination']['prev_cursor'], 'per_page': 10
+    }).get_json()
+
+    assert [item['id'] for item in back['data']] == [item['id'] for item in first['data']]
+    assert back['pagination']['has_prev'] is False
+    assert back['pagination']['has_next'] is True
+
+def test_cursor_with_other_filters_is_rejected(client, applications):
+    first = client.get('/api/applications', query_string={'cursor': '', 'per_page': 5, 'district': 'Dhaka'}).get_json()
+    cursor = first['pagination']['next_cursor']
+
+    response = client.get('/api/applications', query_string={'cursor': cursor, 'per_page': 5, 'district': 'Khulna'})
+
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+def test_garbage_cursor_is_rejected(client, applications):
+    response = client.get('/api/applications', query_string={'cursor': '!!!', 'per_page': 5})
+
+    assert response.status_code == 400
+
+def test_include_total_counts_the_filtered_rows(client, applications):
+    body = client.get('/api/applications', query_string={
+        'cursor': '', 'per_page': 5, 'district': 'Khulna', 'include_total': '1'
+    }).get_json()
+
+    assert body['pagination']['total'] == 13